@@ -0,0 +1,2 @@
+# coding=utf-8
+'''Benchmarks for ladybug-geojson. Run them from the repository root.'''
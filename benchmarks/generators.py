@@ -0,0 +1,96 @@
+# coding=utf-8
+'''Seeded generators of synthetic GeoJSON strings for the benchmarks.'''
+import json
+import math
+import random
+
+def _position(rnd: random.Random):
+    return [round(rnd.uniform(-179, 179), 7), round(rnd.uniform(-85, 85), 7)]
+
+def _ring(cx: float, 
+    cy: float, 
+    radius: float, 
+    count: int) -> list:
+    '''Closed circular ring around a center.'''
+    step = 2 * math.pi / count
+    ring = [[cx + radius * math.cos(i * step), cy + radius * math.sin(i * step)]
+        for i in range(count)]
+    return ring + [ring[0]]
+
+def points(count: int, 
+    seed: int=0) -> str:
+    ''' MultiPoint with count points '''
+    rnd = random.Random(seed)
+    return json.dumps({ 'type': 'MultiPoint',
+        'coordinates': [_position(rnd) for _ in range(count)] })
+
+def linestring(count: int, 
+    seed: int=0) -> str:
+    ''' LineString with count vertices (a random walk) '''
+    rnd = random.Random(seed)
+    x, y, coords = 0.0, 0.0, []
+    for _ in range(count):
+        x += rnd.uniform(-0.001, 0.001)
+        y += rnd.uniform(-0.001, 0.001)
+        coords.append([x, y])
+    return json.dumps({ 'type': 'LineString', 'coordinates': coords })
+
+def polygon_with_holes(count: int, 
+    seed: int=0) -> str:
+    ''' Polygon with count square holes, one in each cell of a grid '''
+    rnd = random.Random(seed)
+    side = max(1, int(math.ceil(math.sqrt(count))))
+    boundary = [[0, 0], [side, 0], [side, side], [0, side], [0, 0]]
+    holes = []
+    for i in range(count):
+        # holes do not touch the sides of their cell
+        x = i % side + round(rnd.uniform(0.1, 0.4), 7)
+        y = i // side + round(rnd.uniform(0.1, 0.4), 7)
+        holes.append([[x, y], [x, y + 0.5], [x + 0.5, y + 0.5], 
+            [x + 0.5, y], [x, y]])
+    return json.dumps({ 'type': 'Polygon', 
+        'coordinates': [boundary] + holes })
+
+def multipolygon(count: int, 
+    seed: int=0, 
+    vertices: int=16) -> str:
+    ''' MultiPolygon with count polygons '''
+    rnd = random.Random(seed)
+    polygons = []
+    for _ in range(count):
+        cx, cy = _position(rnd)
+        polygons.append([_ring(cx, cy, 0.001, vertices)])
+    return json.dumps({ 'type': 'MultiPolygon', 'coordinates': polygons })
+
+def geometry_collection(count: int, 
+    seed: int=0) -> str:
+    ''' GeometryCollection with count geometries of mixed types '''
+    rnd = random.Random(seed)
+    geometries = []
+    for i in range(count):
+        cx, cy = _position(rnd)
+        if i % 3 == 0:
+            geometries.append({ 'type': 'Point', 'coordinates': [cx, cy] })
+        elif i % 3 == 1:
+            geometries.append({ 'type': 'LineString', 
+                'coordinates': [[cx, cy], [cx + 0.001, cy + 0.001]] })
+        else:
+            geometries.append({ 'type': 'Polygon', 
+                'coordinates': [_ring(cx, cy, 0.001, 8)] })
+    return json.dumps({ 'type': 'GeometryCollection', 
+        'geometries': geometries })
+
+def feature_collection(count: int, 
+    seed: int=0, 
+    vertices: int=8) -> str:
+    ''' FeatureCollection with count building-like polygon features '''
+    rnd = random.Random(seed)
+    features = []
+    for i in range(count):
+        cx, cy = _position(rnd)
+        features.append({ 'type': 'Feature', 'id': i,
+            'geometry': { 'type': 'Polygon', 
+                'coordinates': [_ring(cx, cy, 0.0002, vertices)] },
+            'properties': { 'name': f'building {i}', 
+                'height': round(rnd.uniform(3, 60), 2) } })
+    return json.dumps({ 'type': 'FeatureCollection', 'features': features })
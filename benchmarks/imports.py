@@ -0,0 +1,59 @@
+# coding=utf-8
+'''Import time of the package modules.
+Each module is imported in a new interpreter. The time is the best of
+the repeats and it includes the dependencies loaded by the module.
+
+Usage:
+    python -m benchmarks.imports
+'''
+import subprocess
+import sys
+
+MODULES = [
+    'ladybug_geojson',
+    'ladybug_geojson.slippy.map',
+    'ladybug_geojson.slippy.index',
+    'ladybug_geojson.slippy.tiler',
+    'ladybug_geojson.convert.config',
+    'ladybug_geojson.convert.to_geometry',
+    'ladybug_geojson.convert.from_geometry',
+    'ladybug_geojson.convert.geojson',
+    'ladybug_geojson.ladybug_feature',
+]
+
+HEAVY = ['jsonschema', 'ladybug_geometry']
+
+_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [_ for _ in {heavy!r} if _ in sys.modules]
+print(elapsed, ','.join(heavy))
+'''
+
+def measure(module: str,
+    repeat: int=5) -> dict:
+    ''' Measure the import time of a module in a new interpreter '''
+    times, heavy = [], ''
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c',
+            _SCRIPT.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        heavy = out[1] if len(out) > 1 else ''
+    return { 'module': module, 'seconds': min(times),
+        'loaded': heavy.split(',') if heavy else [] }
+
+def run(repeat: int=5) -> list:
+    ''' Run the benchmark and return a list of result dictionaries '''
+    res = []
+    for module in MODULES:
+        r = measure(module, repeat)
+        res.append(r)
+        print(f'{module:<40} {r["seconds"] * 1000:>9.1f}ms '
+            f'{", ".join(r["loaded"])}', flush=True)
+    return res
+
+if __name__ == '__main__':
+    run()
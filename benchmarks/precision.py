@@ -0,0 +1,50 @@
+# coding=utf-8
+'''Size and time of the GeoJSON export against coordinate precision.
+
+Usage:
+    python -m benchmarks.precision
+'''
+import random
+import time
+
+try:
+    from ladybug_geometry.geometry2d.pointvector import Point2D
+    from ladybug_geometry.geometry2d.arc import Arc2D
+except ImportError as e:
+    raise ImportError(
+        f'Failed to import ladybug_geometry.\n{e}')
+
+from ladybug_geojson.convert.from_geometry import from_arc_2d
+
+PRECISIONS = [None, 9, 6, 3, 1]
+
+def _arcs(count: int, 
+    seed: int=0):
+    rnd = random.Random(seed)
+    return [Arc2D(Point2D(rnd.uniform(-180, 180), rnd.uniform(-90, 90)), 
+        rnd.uniform(0.001, 10)) for _ in range(count)]
+
+def run(count: int=2000, 
+    divisions: int=32):
+    ''' Run the benchmark and return a list of result dictionaries '''
+    arcs = _arcs(count)
+    res = []
+    for precision in PRECISIONS:
+        start = time.perf_counter()
+        out = [from_arc_2d(arc, divisions, 
+            precision=precision) for arc in arcs]
+        elapsed = time.perf_counter() - start
+        res.append({
+            'precision': precision,
+            'bytes': sum(len(_) for _ in out),
+            'seconds': elapsed
+        })
+    return res
+
+if __name__ == '__main__':
+    results = run()
+    base = results[0]['bytes']
+    print(f'{"precision":>10} {"bytes":>12} {"ratio":>7} {"seconds":>9}')
+    for r in results:
+        print(f'{str(r["precision"]):>10} {r["bytes"]:>12} '
+            f'{r["bytes"] / base:>7.2f} {r["seconds"]:>9.4f}')
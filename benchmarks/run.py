@@ -0,0 +1,164 @@
+# coding=utf-8
+'''Benchmark harness for the converters, the validator and the export.
+
+Each case runs on synthetic inputs of the given sizes. Inputs are created
+with a fixed seed before timing. Time is the best of the repeats and peak
+memory is measured in a separate run with tracemalloc.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 10000 100000 1000000 --repeat 3
+    python -m benchmarks.run --filter to_face3d --json results.json
+'''
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.convert import to_geometry
+from ladybug_geojson.convert.geojson import from_geojson
+from ladybug_geojson.convert.from_geometry import from_features
+from ladybug_geojson.convert.writer import FeatureCollectionWriter
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson._validator import ( _Validator,
+    GeojSONTypes )
+from . import generators
+
+VALIDATION = Options(validation=True)
+NO_VALIDATION = Options(validation=False)
+
+def _converter(name: str,
+    generator,
+    options: Options):
+    func = getattr(to_geometry, name)
+    def setup(size):
+        return (generator(size),)
+    def run(json_string):
+        return func(json_string, options)
+    return setup, run
+
+def _cases():
+    '''Dictionary of benchmark name > (setup(size), run(*inputs))'''
+    cases = {}
+    converters = [
+        ('to_vector2d', generators.points),
+        ('to_point2d', generators.points),
+        ('to_vector3d', generators.points),
+        ('to_point3d', generators.points),
+        ('to_linesegment2d', generators.linestring),
+        ('to_linesegment3d', generators.linestring),
+        ('to_polyline2d', generators.linestring),
+        ('to_polyline3d', generators.linestring),
+        ('to_polygon2d', generators.polygon_with_holes),
+        ('to_face3d', generators.polygon_with_holes),
+        ('to_mesh2d', generators.multipolygon),
+        ('to_mesh3d', generators.multipolygon),
+        ('to_collection_2d', generators.geometry_collection),
+        ('to_collection_3d', generators.geometry_collection),
+    ]
+    for name, generator in converters:
+        for label, options in (('validation', VALIDATION),
+            ('no_validation', NO_VALIDATION)):
+            cases[f'{name}[{label}]'] = _converter(name, generator, options)
+
+    cases['to_face3d[multipolygon]'] = _converter('to_face3d',
+        generators.multipolygon, NO_VALIDATION)
+
+    for label, options in (('validation', VALIDATION),
+        ('no_validation', NO_VALIDATION)):
+        cases[f'LadybugFeature.from_featurecollection[{label}]'] = (
+            lambda size: (generators.feature_collection(size),),
+            lambda js, options=options:
+                LadybugFeature.from_featurecollection(js, options))
+
+    # from_geojson always validates the input with the GeoJSON schema
+    cases['from_geojson'] = (
+        lambda size: (generators.feature_collection(size),),
+        lambda js: from_geojson(js))
+
+    cases['_Validator[FeatureCollection]'] = (
+        lambda size: (generators.feature_collection(size),),
+        lambda js: _Validator(js, [GeojSONTypes.FEATURE_COLLECTION]))
+
+    def _features(size):
+        js = generators.feature_collection(size)
+        return (LadybugFeature.from_featurecollection(js, NO_VALIDATION),)
+
+    cases['from_features'] = (_features,
+        lambda fts: from_features(fts))
+    cases['from_features[validation]'] = (_features,
+        lambda fts: from_features(fts, validation=True))
+
+    def _write(fts):
+        with FeatureCollectionWriter(io.StringIO()) as writer:
+            for ft in fts:
+                writer.write_feature(ft)
+    cases['FeatureCollectionWriter'] = (_features, _write)
+    return cases
+
+def measure(setup,
+    run,
+    size: int,
+    repeat: int=3) -> dict:
+    ''' Measure the best time and the peak memory of a benchmark case '''
+    inputs = setup(size)
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(*inputs)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run(*inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return { 'size': size, 'seconds': min(times), 'peak_bytes': peak }
+
+def run(sizes=(1000, 10000),
+    repeat: int=3,
+    filter: str=None) -> list:
+    ''' Run the benchmarks and return a list of result dictionaries '''
+    results = []
+    for name, (setup, func) in _cases().items():
+        if filter and filter not in name:
+            continue
+        for size in sizes:
+            res = measure(setup, func, size, repeat)
+            res['name'] = name
+            results.append(res)
+            print(f'{name:<52} {size:>9} {res["seconds"]:>10.4f}s '
+                f'{res["peak_bytes"] / 2 ** 20:>10.2f}MB', flush=True)
+    return results
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+        help='number of items of the synthetic inputs')
+    parser.add_argument('--repeat', type=int, default=3,
+        help='number of timed runs for each case')
+    parser.add_argument('--filter', default=None,
+        help='run only the cases that contain this text')
+    parser.add_argument('--json', default=None,
+        help='path of a JSON file for the results')
+    args = parser.parse_args(args)
+
+    print(f'{"benchmark":<52} {"size":>9} {"time":>11} {"peak":>12}')
+    results = run(args.sizes, args.repeat, args.filter)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({ 'python': sys.version,
+                'platform': platform.platform(),
+                'results': results }, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# coding=utf-8
+'''Ladybug GeoJSON. Converters between GeoJSON and Ladybug geometries.
+
+The converters are loaded on first use, so importing the package (or the
+slippy map modules) does not load ladybug_geometry or jsonschema.
+
+    import ladybug_geojson
+    faces = ladybug_geojson.to_face3d(json_string)
+'''
+import importlib
+
+# public name > module (relative to the package)
+_LAZY_API = {
+    'Options': 'convert.config',
+    'LadybugFeature': 'ladybug_feature',
+    'FeatureCollectionWriter': 'convert.writer',
+    'from_file': 'convert.geojson',
+    'from_geojson': 'convert.geojson',
+    'from_topojson': 'convert.topojson',
+}
+_LAZY_API.update({ _: 'convert.to_geometry' for _ in (
+    'to_collection_2d', 'to_collection_3d',
+    'to_vector2d', 'to_point2d', 'to_linesegment2d', 'to_polyline2d',
+    'to_polygon2d', 'to_mesh2d',
+    'to_vector3d', 'to_point3d', 'to_linesegment3d', 'to_polyline3d',
+    'to_face3d', 'to_mesh3d') })
+_LAZY_API.update({ _: 'convert.from_geometry' for _ in (
+    'from_point2d', 'from_linesegment2d', 'from_polyline2d',
+    'from_polygon2d', 'from_mesh2d', 'from_arc_2d',
+    'from_point3d', 'from_linesegment3d', 'from_polyline3d',
+    'from_face3d', 'from_polyface3d', 'from_mesh3d',
+    'from_geometries', 'from_features') })
+
+__all__ = sorted(_LAZY_API)
+
+def __getattr__(name: str):
+    module = _LAZY_API.get(name)
+    if module is None:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,6 @@
+# coding=utf-8
+from ladybug_geojson.cli import main
+import sys
+
+if __name__ == '__main__':
+    sys.exit(main())
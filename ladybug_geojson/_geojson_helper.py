@@ -6,6 +6,9 @@ from ._validator import ( _Validator,
     GeojSONTypes)
 from typing import Any, List, Optional, Union
 from .convert.config import Options
+from .instrumentation import ( _stage,
+    _count,
+    _count_geometry )
 
 '''____________RFC 7946 KEYWORDS____________'''
 
@@ -49,6 +52,8 @@ def get_data_from_geojson_type(json_string: str,
         return None, None, err
 
     arr = obj.get(keyword.value)
+    if keyword == RFC7946.COORDINATES:
+        _count_geometry(sel, arr)
     return arr, sel, None
 
 
@@ -75,20 +80,25 @@ def _run_validation(json_string: str,
     sel = None # schema used
     # complete and slow validation with GeoJSON schema
     if validation:
+        _count('validation.schema')
         validator = _Validator(json=json_string, 
             target=target)
         if not validator.selection:
+            _count('validation.errors')
             return None, None, validator.error
         sel = validator.selection
 
-    obj = json.loads(json_string)
+    with _stage('json.loads'):
+        obj = json.loads(json_string)
 
     # fast validation
     if not validation:
+        _count('validation.fast')
         tp = obj.get(RFC7946.TYPE.value)
         if tp:
             sel = GeojSONTypes(tp)
         else:
+            _count('validation.errors')
             return None, None, 'Geojson type not found.'
 
     return obj, sel, None
\ No newline at end of file
@@ -100,4 +100,119 @@ def _to_face(arr: List[float],
     
     return Face3D(boundary=boundary, 
         holes=holes,
-        plane=plane)
\ No newline at end of file
+        plane=plane)
+
+'''____________SIMPLIFICATION____________'''
+
+def _simplify_line(arr: List[List[float]], 
+    tolerance: float,
+    anchors: Optional[List[int]]=None) -> List[List[float]]:
+    '''Douglas-Peucker simplification of a GeoJSON coordinate array.
+    It works on raw coordinates (X and Y) before any Ladybug object is created.
+
+    Args:
+    - arr: list of coordinates. Eg. [[x, y], [x, y], ...]
+    - tolerance: max distance between the original line and the simplified one.
+    - anchors: indices of the coordinates that must be kept.
+    '''
+    count = len(arr)
+    if not tolerance or count < 3:
+        return arr
+
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    for i in anchors or []:
+        keep[i] = True
+
+    kept = [i for i, k in enumerate(keep) if k]
+    stack = list(zip(kept[:-1], kept[1:]))
+    sq_tol = tolerance * tolerance
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        x1, y1 = arr[first][0], arr[first][1]
+        dx, dy = arr[last][0] - x1, arr[last][1] - y1
+        den = dx * dx + dy * dy
+
+        sq_max, index = sq_tol, None
+        for i in range(first + 1, last):
+            px, py = arr[i][0] - x1, arr[i][1] - y1
+            if den:
+                t = (px * dx + py * dy) / den
+                t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                px, py = px - t * dx, py - t * dy
+            sq_dist = px * px + py * py
+            if sq_dist > sq_max:
+                sq_max, index = sq_dist, i
+
+        if index is not None:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [pt for pt, k in zip(arr, keep) if k]
+
+def _simplify_polygons(arr: List[List[List[List[float]]]], 
+    tolerance: float) -> List[List[List[List[float]]]]:
+    '''Douglas-Peucker simplification of GeoJSON polygons.
+    Vertices where rings meet are kept, so shared edges are simplified 
+    in the same way for every ring that uses them.
+
+    Args:
+    - arr: list of polygon coordinates. Eg. MultiPolygon coordinates.
+    - tolerance: max distance between the original rings and the simplified ones.
+    '''
+    if not tolerance:
+        return arr
+
+    def _key(pt):
+        return (pt[0], pt[1])
+
+    # rings without the closing coordinate
+    rings = [r[:-1] for polygon in arr for r in polygon]
+
+    vertex_rings, edge_rings = {}, {}
+    for i, ring in enumerate(rings):
+        keys = [_key(_) for _ in ring]
+        for j, k in enumerate(keys):
+            vertex_rings.setdefault(k, set()).add(i)
+            edge = tuple(sorted((k, keys[j - 1])))
+            edge_rings.setdefault(edge, set()).add(i)
+
+    res, i = [], 0
+    for polygon in arr:
+        out = []
+        for ring in polygon:
+            pts = rings[i]
+            i += 1
+            keys = [_key(_) for _ in pts]
+            count = len(keys)
+
+            # a vertex used by other rings is a node of the topology
+            # if its edges are not shared by the same rings
+            anchors = []
+            for j, k in enumerate(keys):
+                owners = vertex_rings[k]
+                if len(owners) < 2:
+                    continue
+                prev_edge = edge_rings[tuple(sorted((k, keys[j - 1])))]
+                next_edge = edge_rings[tuple(sorted((k, 
+                    keys[(j + 1) % count])))]
+                if not (prev_edge == next_edge == owners):
+                    anchors.append(j)
+
+            if anchors and anchors[0] != 0 and \
+                len(vertex_rings[keys[0]]) > 1:
+                # a shared edge can not be split by the closing point
+                start = anchors[0]
+                pts = pts[start:] + pts[:start]
+                anchors = [(_ - start) % count for _ in anchors]
+
+            simplified = _simplify_line(pts + [pts[0]], 
+                tolerance, anchors)
+            out.append(simplified if len(simplified) > 3 else ring)
+        res.append(out)
+
+    return res
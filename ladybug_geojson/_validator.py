@@ -3,9 +3,7 @@ import json
 from enum import ( Enum, unique )
 from pathlib import Path
 from typing import List
-from jsonschema import ( validate, 
-    ValidationError, 
-    SchemaError )
+from .instrumentation import _stage, _instrument
 
 @unique
 class GeojSONTypes(Enum):
@@ -52,11 +50,13 @@ class _Validator:
         ''' Error '''
         return self._error
 
+    @_instrument('validator')
     def _validation(self, 
         data: str, 
         target: List[GeojSONTypes]):
         # get geojson type
-        obj = json.loads(data)
+        with _stage('validator.json.loads'):
+            obj = json.loads(data)
         self._error = None
         
         # type key not found
@@ -75,10 +75,16 @@ class _Validator:
 
         # get geojson schema
         valid_schema = json.loads(self._read_schema(tp))
+
+        # imported here because jsonschema is slow to import
+        from jsonschema import ( validate, 
+            ValidationError, 
+            SchemaError )
         
         try:
-            validate(instance=obj, 
-                schema=valid_schema)
+            with _stage('validator.jsonschema'):
+                validate(instance=obj, 
+                    schema=valid_schema)
             
         except SchemaError as e:
             self._error = f'Geojson schema is not valid: {e}'
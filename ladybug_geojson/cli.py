@@ -0,0 +1,364 @@
+# coding=utf-8
+'''Command line interface to convert GeoJSON files into Ladybug geometries.
+
+Features are read as a stream from GeoJSON or GeoJSONL files (one Feature
+per line) and converted in chunks, optionally by several processes. The
+output has one record per feature in input order: a line with the JSON
+of LadybugFeature.to_dict or a pickled LadybugFeature.
+
+Usage:
+    ladybug-geojson buildings.geojson -o buildings.jsonl
+    ladybug-geojson ./data --workers 4 --format pickle -o out.pickle
+    ladybug-geojson roads.geojsonl --bbox 11.0 46.0 11.2 46.1 \\
+        --where "highway=primary" -o roads.jsonl
+'''
+import argparse
+import json
+import mmap
+import pickle
+import sys
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional
+from .convert.conditions import _parse_where, _match
+from .slippy.index import feature_bbox
+
+GEOJSON_SUFFIXES = ('.geojson', '.json')
+GEOJSONL_SUFFIXES = ('.geojsonl', '.geojsonseq', '.jsonl', '.ndjson')
+VALIDATE_MODES = ('full', 'fast', 'off')
+FORMATS = ('json', 'pickle')
+
+'''____________INPUT____________'''
+
+def _input_files(paths: List[str]) -> List[Path]:
+    '''Files from paths. Directories are searched recursively.'''
+    suffixes = GEOJSON_SUFFIXES + GEOJSONL_SUFFIXES
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(_ for _ in p.rglob('*')
+                if _.suffix.lower() in suffixes))
+        elif p.exists():
+            files.append(p)
+        else:
+            raise FileNotFoundError(f'{p} not found.')
+    return files
+
+def _read_features(path: Path) -> Iterator:
+    '''Yield the features of a file. GeoJSONL lines and the features of a
+    FeatureCollection are yielded as strings without parsing them. The
+    FeatureCollection is scanned in a memory map, so the whole file is
+    never decoded at once. A bare geometry is yielded as a Feature.'''
+    if path.suffix.lower() in GEOJSONL_SUFFIXES:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                # GeoJSON text sequences start with a record separator
+                line = line.strip().lstrip('\x1e')
+                if line:
+                    yield line
+        return
+
+    # imported here to keep the start of the command fast
+    from .convert.feature_index import iter_feature_spans
+
+    if not path.stat().st_size:
+        return
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                spans = iter_feature_spans(data)
+            except ValueError:
+                # a bare Feature or geometry
+                obj = json.loads(data[:])
+            else:
+                for begin, end in spans:
+                    yield data[begin:end].decode('utf-8')
+                return
+
+    tp = obj.get('type')
+    if tp == 'FeatureCollection':
+        yield from obj.get('features') or []
+    elif tp == 'Feature':
+        yield obj
+    else:
+        yield { 'type': 'Feature', 'geometry': obj, 'properties': {} }
+
+def _chunks(items: Iterator,
+    size: int) -> Iterator[list]:
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+'''____________FILTERS____________'''
+
+def _where_argument(text: str) -> tuple:
+    '''Condition of the --where argument. See conditions._parse_where.'''
+    try:
+        return _parse_where(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _intersects(bbox: Optional[tuple],
+    other: tuple) -> bool:
+    if not bbox:
+        return False
+    return bbox[0] <= other[2] and bbox[2] >= other[0] and \
+        bbox[1] <= other[3] and bbox[3] >= other[1]
+
+# GeoJSON geometry type > (nesting levels above the positions,
+# min number of positions of the innermost lists)
+_NESTING = {
+    'Point': (0, 0),
+    'MultiPoint': (1, 0),
+    'LineString': (1, 2),
+    'MultiLineString': (2, 2),
+    'Polygon': (2, 4),
+    'MultiPolygon': (3, 4)
+}
+
+def _is_position(value) -> bool:
+    return isinstance(value, list) and 2 <= len(value) <= 3 and \
+        all(type(_) in (int, float) for _ in value)
+
+def _check_geometry(geometry: dict) -> bool:
+    '''Fast check of a GeoJSON geometry without the schema: a supported
+    type and coordinates nested as positions of 2 or 3 numbers, with
+    at least 2 positions for lines and 4 for rings.'''
+    depth, size = _NESTING.get(geometry.get('type'), (None, 0))
+    if depth is None:
+        return False
+
+    def _check(value, level):
+        if level == depth:
+            return _is_position(value)
+        if not isinstance(value, list) or \
+            (level == depth - 1 and len(value) < size):
+            return False
+        return all(_check(_, level + 1) for _ in value)
+
+    return _check(geometry.get('coordinates'), 0)
+
+'''____________CONVERSION____________'''
+
+def _convert_chunk(args: tuple) -> tuple:
+    '''Convert a chunk of features. It runs in the worker processes.
+
+    Return:
+        a tuple with (records, read, invalid, skipped)
+    '''
+    items, validate, bbox, where, fmt = args
+
+    # imported here to keep the start of the command fast
+    from .convert.config import Options
+    from .ladybug_feature import LadybugFeature
+    options = Options(validation=validate == 'full')
+
+    records, invalid, skipped = [], 0, 0
+    for item in items:
+        try:
+            ft = json.loads(item) if isinstance(item, str) else item
+            if bbox and not _intersects(feature_bbox(ft), bbox):
+                skipped += 1
+                continue
+            if where and not _match(ft.get('properties'), where):
+                skipped += 1
+                continue
+            geo = ft.get('geometry')
+            if validate == 'fast' and geo and not _check_geometry(geo):
+                invalid += 1
+                continue
+            feature = LadybugFeature(item if isinstance(item, str)
+                else json.dumps(ft), options)
+        except Exception:
+            invalid += 1
+            continue
+
+        if feature.geometry is None and validate != 'off':
+            invalid += 1
+            continue
+
+        if fmt == 'pickle':
+            records.append(pickle.dumps(feature,
+                protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            records.append(json.dumps(feature.to_dict()).encode() + b'\n')
+
+    return records, len(items), invalid, skipped
+
+def _ordered_map(func,
+    jobs: Iterator,
+    workers: int) -> Iterator:
+    '''Map jobs in order. With several workers only a few jobs
+    are pending at the same time to keep the memory bounded.'''
+    if workers < 2:
+        for job in jobs:
+            yield func(job)
+        return
+
+    # imported here because multiprocessing is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(func, job))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _peak_rss() -> Optional[int]:
+    '''Peak resident memory in bytes of the process and its children.'''
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def convert(inputs: List[str],
+    output,
+    fmt: str='json',
+    workers: int=1,
+    chunk_size: int=1000,
+    validate: str='fast',
+    bbox: Optional[tuple]=None,
+    where: Optional[List[tuple]]=None,
+    progress=None) -> dict:
+    ''' Convert GeoJSON files into a stream of Ladybug features.
+
+    Args:
+    - inputs: list of files or directories.
+    - output: binary file object to use for the records.
+    - fmt: json or pickle.
+    - workers: number of processes.
+    - chunk_size: number of features for each job.
+    - validate: full for GeoJSON schema validation, fast to check the
+            geometry types and the nesting of the coordinates, off to
+            skip the checks and keep the features without geometry.
+    - bbox: tuple with (west, south, east, north). Features outside are skipped.
+    - where: list of conditions from conditions._parse_where. Features
+            that do not match all of them are skipped.
+    - progress: function called with the summary after each chunk.
+
+    Return:
+        a summary dictionary
+    '''
+    if fmt not in FORMATS:
+        raise ValueError(f'format must be one of {FORMATS}.')
+    if validate not in VALIDATE_MODES:
+        raise ValueError(f'validate must be one of {VALIDATE_MODES}.')
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be greater than 0.')
+
+    start = time.perf_counter()
+    files = _input_files(inputs)
+    summary = { 'files': len(files), 'bytes': sum(_.stat().st_size
+        for _ in files), 'read': 0, 'written': 0,
+        'invalid': 0, 'skipped': 0 }
+
+    def _jobs():
+        for fp in files:
+            for chunk in _chunks(_read_features(fp), chunk_size):
+                yield chunk, validate, bbox, where, fmt
+
+    for records, read, invalid, skipped in _ordered_map(_convert_chunk,
+        _jobs(), workers):
+        for record in records:
+            output.write(record)
+        summary['read'] += read
+        summary['written'] += len(records)
+        summary['invalid'] += invalid
+        summary['skipped'] += skipped
+        if progress:
+            progress(summary)
+
+    seconds = time.perf_counter() - start
+    summary['seconds'] = seconds
+    summary['features_per_second'] = summary['read'] / seconds \
+        if seconds else 0.0
+    summary['mb_per_second'] = summary['bytes'] / 2 ** 20 / seconds \
+        if seconds else 0.0
+    summary['peak_rss'] = _peak_rss()
+    return summary
+
+'''____________COMMAND____________'''
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ladybug-geojson',
+        description='Convert GeoJSON and GeoJSONL files or directories '
+        'into serialized Ladybug features.')
+    parser.add_argument('inputs', nargs='+',
+        help='GeoJSON or GeoJSONL files or directories')
+    parser.add_argument('-o', '--output', default='-',
+        help='output file. Default is the standard output')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='json',
+        help='json writes one LadybugFeature.to_dict per line, pickle '
+        'writes one pickled LadybugFeature after the other')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+        help='number of processes')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+        help='number of features for each job')
+    parser.add_argument('--validate', choices=VALIDATE_MODES, default='fast',
+        help='full uses the GeoJSON schema, fast checks the geometry '
+        'types and the nesting of the coordinates, off skips the checks '
+        'and keeps the features without a geometry')
+    parser.add_argument('--bbox', type=float, nargs=4,
+        metavar=('WEST', 'SOUTH', 'EAST', 'NORTH'),
+        help='skip the features outside of this bounding box')
+    parser.add_argument('--where', type=_where_argument, action='append',
+        help='property condition like key=value, key!=value or key>value. '
+        'Nested keys use dots. It can be used more than once')
+    parser.add_argument('-q', '--quiet', action='store_true',
+        help='do not print progress and summary')
+    return parser
+
+def _print_summary(summary: dict):
+    rss = summary['peak_rss']
+    rss = f'{rss / 2 ** 20:.1f} MB' if rss else 'n/a'
+    print(f'features: {summary["read"]} read, {summary["written"]} written, '
+        f'{summary["skipped"]} skipped, {summary["invalid"]} invalid\n'
+        f'time: {summary["seconds"]:.2f} s, '
+        f'{summary["features_per_second"]:.1f} features/s, '
+        f'{summary["mb_per_second"]:.2f} MB/s, peak RSS {rss}',
+        file=sys.stderr)
+
+def main(args: Optional[List[str]]=None) -> int:
+    ''' Entry point of the ladybug-geojson command '''
+    args = _parser().parse_args(args)
+
+    def _progress(summary):
+        print(f'\r{summary["read"]} features', end='',
+            file=sys.stderr, flush=True)
+
+    if args.output == '-':
+        output = sys.stdout.buffer
+    else:
+        output = open(args.output, 'wb')
+    try:
+        summary = convert(args.inputs, output,
+            fmt=args.format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            validate=args.validate,
+            bbox=tuple(args.bbox) if args.bbox else None,
+            where=args.where,
+            progress=None if args.quiet else _progress)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        else:
+            output.flush()
+
+    if not args.quiet:
+        print(file=sys.stderr)
+        _print_summary(summary)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
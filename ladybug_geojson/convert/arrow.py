@@ -0,0 +1,385 @@
+# coding=utf-8
+'''Arrow IPC and GeoParquet import and export of LadybugFeatures.
+
+pyarrow is optional and it is imported only by these functions.
+
+The geometry column uses a GeoArrow native encoding with interleaved
+x, y, z coordinates (geoarrow.point, geoarrow.linestring, ...) when all
+features have the same geometry type, otherwise ISO WKB (geoarrow.wkb).
+Coordinates move between Arrow and Python as contiguous float64 buffers.
+GeoParquet files always use WKB as required by GeoParquet 1.0.
+
+Properties become columns. Dictionaries, lists and values that Arrow
+cannot store in a column (like mixed types or very large integers) are
+stored as JSON strings and decoded on read. Missing keys are nulls of
+the columns marked as optional, and features without properties are
+marked in a boolean column, so the properties are read back unchanged.
+
+Usage:
+    write_arrow(features, 'buildings.arrow')
+    features = read_arrow('buildings.arrow')
+    write_geoparquet(features, 'buildings.parquet')
+    features = read_geoparquet('buildings.parquet')
+'''
+import json
+from array import array
+from pathlib import Path
+from typing import List, Optional, Union
+from .config import Options
+from .._validator import GeojSONTypes
+from .wkb import ( _vertices, _rings,
+    _geometry_type, _wkb, _from_wkb, _build )
+
+GEOMETRY_COLUMN = 'geometry'
+JSON_COLUMN_KEY = b'ladybug_geojson:json'
+OPTIONAL_COLUMN_KEY = b'ladybug_geojson:optional'
+PROPERTIES_COLUMN = 'ladybug_geojson:properties'
+PROPERTIES_COLUMN_KEY = b'ladybug_geojson:properties'
+EXTENSION_NAME_KEY = b'ARROW:extension:name'
+EXTENSION_METADATA_KEY = b'ARROW:extension:metadata'
+
+# GeoJSON type > (GeoArrow extension, nesting levels above the coordinates)
+_NATIVE = {
+    GeojSONTypes.POINT: ('geoarrow.point', 0),
+    GeojSONTypes.LINESTRING: ('geoarrow.linestring', 1),
+    GeojSONTypes.POLYGON: ('geoarrow.polygon', 2),
+    GeojSONTypes.MULTIPOINT: ('geoarrow.multipoint', 1),
+    GeojSONTypes.MULTILINESTRING: ('geoarrow.multilinestring', 2),
+    GeojSONTypes.MULTIPOLYGON: ('geoarrow.multipolygon', 3)
+}
+_NATIVE_TYPES = { v[0]: k for k, v in _NATIVE.items() }
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            f'Failed to import pyarrow.\n{e}')
+    return pyarrow
+
+'''____________LADYBUG GEOMETRY TO COORDINATES____________'''
+
+def _nested_points(geometry,
+    tp: GeojSONTypes):
+    '''Nested lists of Point3D of a geometry for its GeoJSON type.'''
+    if tp == GeojSONTypes.POINT:
+        return geometry
+    if tp == GeojSONTypes.LINESTRING:
+        return _vertices(geometry)
+    if tp == GeojSONTypes.POLYGON:
+        return _rings(geometry)
+    if tp == GeojSONTypes.MULTIPOINT:
+        return list(geometry)
+    if tp == GeojSONTypes.MULTILINESTRING:
+        return [_vertices(_) for _ in geometry]
+    faces = geometry.faces if hasattr(geometry, 'faces') else geometry
+    return [_rings(_) for _ in faces]
+
+'''____________ARROW ARRAYS____________'''
+
+def _native_array(geometries: list,
+    tp: GeojSONTypes):
+    '''GeoArrow array with interleaved xyz coordinates.'''
+    pa = _pyarrow()
+    _, depth = _NATIVE[tp]
+    coords = array('d')
+    offsets = [array('i', [0]) for _ in range(depth)]
+    nulls = [_ is None for _ in geometries]
+
+    def _add(item, level):
+        if level == depth:
+            coords.extend((item.x, item.y, item.z))
+            return
+        for sub in item:
+            _add(sub, level + 1)
+        offsets[level].append(len(offsets[level + 1]) - 1 \
+            if level + 1 < depth else len(coords) // 3)
+
+    for geo in geometries:
+        if geo is None:
+            if depth:
+                offsets[0].append(offsets[0][-1])
+            else:
+                coords.extend((0.0, 0.0, 0.0))
+            continue
+        _add(_nested_points(geo, tp), 0)
+
+    mask = pa.array(nulls, pa.bool_()) if any(nulls) else None
+    values = pa.Array.from_buffers(pa.float64(), len(coords),
+        [None, pa.py_buffer(coords)])
+    point_type = pa.list_(pa.field('xyz', pa.float64(), False), 3)
+    arr = pa.FixedSizeListArray.from_arrays(values, type=point_type,
+        mask=mask if depth == 0 else None)
+    for level in reversed(range(depth)):
+        offs = pa.Array.from_buffers(pa.int32(), len(offsets[level]),
+            [None, pa.py_buffer(offsets[level])])
+        arr = pa.ListArray.from_arrays(offs, arr,
+            mask=mask if level == 0 else None)
+    return arr
+
+def _native_coordinates(arr,
+    depth: int) -> list:
+    '''Nested coordinate lists of a GeoArrow native array. Coordinates
+    are read from the float64 buffer and offsets from the int32 buffers.'''
+    pa = _pyarrow()
+    if isinstance(arr, pa.ChunkedArray):
+        res = []
+        for chunk in arr.chunks:
+            res.extend(_native_coordinates(chunk, depth))
+        return res
+
+    levels = []
+    point = arr
+    for _ in range(depth):
+        levels.append(memoryview(point.buffers()[1]).cast('i')[
+            point.offset:point.offset + len(point) + 1])
+        point = point.values
+    dim = point.type.list_size
+    values = point.values
+    start = (point.offset * dim + values.offset) * 8
+    flat = memoryview(values.buffers()[1])[start:start + 8 * len(point)
+        * dim].cast('d').tolist()
+
+    def _items(level, begin, end):
+        if level == depth:
+            return [flat[i * dim:i * dim + dim] for i in range(begin, end)]
+        offs = levels[level]
+        return [_items(level + 1, offs[i], offs[i + 1])
+            for i in range(begin, end)]
+
+    return _items(0, 0, len(arr))
+
+def _geometry_array(geometries: list,
+    encoding: Optional[str]=None) -> tuple:
+    '''GeoArrow array and field metadata of a list of geometries.
+
+    Args:
+    - geometries: list of Ladybug geometries.
+    - encoding: wkb, native or None to use native when possible.
+    '''
+    pa = _pyarrow()
+    types = set(_geometry_type(_) for _ in geometries)
+    types.discard(None)
+    tp = types.pop() if len(types) == 1 else None
+
+    if encoding not in (None, 'wkb', 'native'):
+        raise ValueError('encoding must be wkb, native or None.')
+    if encoding == 'native' and tp not in _NATIVE:
+        raise ValueError('native encoding needs geometries of one type.')
+
+    if encoding != 'wkb' and tp in _NATIVE:
+        name = _NATIVE[tp][0]
+        arr = _native_array(geometries, tp)
+    else:
+        name = 'geoarrow.wkb'
+        arr = pa.array([None if _ is None else bytes(_wkb(_))
+            for _ in geometries], pa.binary())
+    metadata = { EXTENSION_NAME_KEY: name.encode(),
+        EXTENSION_METADATA_KEY: b'{}' }
+    return arr, metadata
+
+'''____________TABLES____________'''
+
+def to_arrow_table(features: List,
+    encoding: Optional[str]=None):
+    ''' Arrow Table of LadybugFeatures.
+
+    Args:
+    - features: list of LadybugFeature.
+    - encoding: geometry encoding. wkb, native or None to use the native
+            GeoArrow encoding when all geometries have the same type.
+
+    Return:
+        a pyarrow.Table with a geometry column and a column for each property
+    '''
+    pa = _pyarrow()
+    arr, metadata = _geometry_array([_.geometry for _ in features], encoding)
+    fields = [pa.field(GEOMETRY_COLUMN, arr.type, metadata=metadata)]
+    columns = [arr]
+
+    properties = [_.properties for _ in features]
+    keys = list(dict.fromkeys(k for p in properties if p for k in p))
+    for key in keys:
+        present = [bool(p) and key in p for p in properties]
+        values = [p[key] if ok else None for p, ok in zip(properties, present)]
+        optional = not all(present)
+        # nested values are not stored as structs, which add the missing
+        # keys, and nulls of optional columns would be missing keys
+        as_json = any(isinstance(_, (dict, list)) for _ in values) or \
+            (optional and any(v is None and ok
+                for v, ok in zip(values, present)))
+        col = None
+        if not as_json:
+            try:
+                col = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError,
+                pa.ArrowNotImplementedError, OverflowError):
+                pass
+        metadata = {}
+        if col is None:
+            col = pa.array([json.dumps(v) if ok else None
+                for v, ok in zip(values, present)], pa.string())
+            metadata[JSON_COLUMN_KEY] = b'1'
+        if optional:
+            metadata[OPTIONAL_COLUMN_KEY] = b'1'
+        fields.append(pa.field(key, col.type, metadata=metadata or None))
+        columns.append(col)
+
+    if any(_ is None for _ in properties):
+        fields.append(pa.field(PROPERTIES_COLUMN, pa.bool_(),
+            metadata={ PROPERTIES_COLUMN_KEY: b'1' }))
+        columns.append(pa.array([_ is not None for _ in properties],
+            pa.bool_()))
+
+    return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+def _geometry_column(table) -> str:
+    geo = (table.schema.metadata or {}).get(b'geo')
+    if geo:
+        return json.loads(geo).get('primary_column', GEOMETRY_COLUMN)
+    for field in table.schema:
+        name = (field.metadata or {}).get(EXTENSION_NAME_KEY, b'')
+        if name.startswith(b'geoarrow.'):
+            return field.name
+    return GEOMETRY_COLUMN
+
+def from_arrow_table(table,
+    options: Optional[Options]=Options.options_factory(),
+    geometry_column: Optional[str]=None) -> List:
+    ''' LadybugFeatures of an Arrow Table.
+    The geometry column can use WKB or a GeoArrow native encoding with
+    interleaved coordinates. Other columns become properties.
+
+    Args:
+    - table: pyarrow.Table.
+    - options: Options object to use for mapping.
+    - geometry_column: name of the geometry column. Default is the
+            GeoParquet primary column, the first GeoArrow column or geometry.
+
+    Return:
+        a list of LadybugFeature
+    '''
+    # imported here to load ladybug_geometry only when it is used
+    from ..ladybug_feature import LadybugFeature
+    pa = _pyarrow()
+
+    name = geometry_column or _geometry_column(table)
+    field = table.schema.field(name)
+    column = table.column(name)
+    extension = (field.metadata or {}).get(EXTENSION_NAME_KEY, b'').decode()
+
+    if extension in _NATIVE_TYPES:
+        tp = _NATIVE_TYPES[extension]
+        coordinates = _native_coordinates(column, _NATIVE[tp][1])
+        valid = column.is_valid().to_pylist()
+        geometries = [_build(tp, c, options) if ok else None
+            for c, ok in zip(coordinates, valid)]
+    elif pa.types.is_binary(field.type) or \
+        pa.types.is_large_binary(field.type):
+        geometries = []
+        for wkb in column.to_pylist():
+            if wkb is None:
+                geometries.append(None)
+                continue
+            tp, coordinates, _ = _from_wkb(wkb)
+            geometries.append(_build(tp, coordinates, options))
+    else:
+        raise ValueError(f'{name} is not a WKB or GeoArrow native column.')
+
+    others = [_ for _ in table.schema if _.name != name]
+    columns, has_properties = {}, None
+    for f in others:
+        metadata = f.metadata or {}
+        values = table.column(f.name).to_pylist()
+        if metadata.get(PROPERTIES_COLUMN_KEY):
+            has_properties = values
+            continue
+        # nulls of optional columns are missing keys
+        present = [_ is not None for _ in values] \
+            if metadata.get(OPTIONAL_COLUMN_KEY) else None
+        if metadata.get(JSON_COLUMN_KEY):
+            values = [None if _ is None else json.loads(_) for _ in values]
+        columns[f.name] = values, present
+
+    features = []
+    for i, geo in enumerate(geometries):
+        if has_properties is not None and not has_properties[i]:
+            props = None
+        else:
+            props = { k: v[i] for k, (v, present) in columns.items()
+                if present is None or present[i] }
+        features.append(LadybugFeature.from_geometry(geo, props, options))
+    return features
+
+'''____________FILES____________'''
+
+def write_arrow(features: List,
+    filepath: Union[str, Path],
+    encoding: Optional[str]=None) -> Path:
+    ''' Write LadybugFeatures into an Arrow IPC file.
+
+    Args:
+    - features: list of LadybugFeature.
+    - filepath: path of the Arrow file.
+    - encoding: geometry encoding. wkb, native or None to use the native
+            GeoArrow encoding when all geometries have the same type.
+    '''
+    pa = _pyarrow()
+    table = to_arrow_table(features, encoding)
+    with pa.OSFile(str(filepath), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return Path(filepath)
+
+def read_arrow(filepath: Union[str, Path],
+    options: Optional[Options]=Options.options_factory()) -> List:
+    ''' LadybugFeatures of an Arrow IPC file. The file is memory mapped.
+
+    Args:
+    - filepath: path of the Arrow file.
+    - options: Options object to use for mapping.
+    '''
+    pa = _pyarrow()
+    with pa.memory_map(str(filepath), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        return from_arrow_table(table, options)
+
+def write_geoparquet(features: List,
+    filepath: Union[str, Path]) -> Path:
+    ''' Write LadybugFeatures into a GeoParquet file with WKB geometries.
+
+    Args:
+    - features: list of LadybugFeature.
+    - filepath: path of the Parquet file.
+    '''
+    _pyarrow()
+    import pyarrow.parquet as pq
+    from ..slippy.index import feature_bbox
+
+    table = to_arrow_table(features, 'wkb')
+    types = sorted(set(f'{_.value} Z' for _ in
+        map(_geometry_type, [_.geometry for _ in features]) if _))
+    boxes = [_ for _ in map(feature_bbox, features) if _]
+    column = { 'encoding': 'WKB', 'geometry_types': types }
+    if boxes:
+        column['bbox'] = [min(_[0] for _ in boxes), min(_[1] for _ in boxes),
+            max(_[2] for _ in boxes), max(_[3] for _ in boxes)]
+    geo = { 'version': '1.0.0', 'primary_column': GEOMETRY_COLUMN,
+        'columns': { GEOMETRY_COLUMN: column } }
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'geo'] = json.dumps(geo).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), str(filepath))
+    return Path(filepath)
+
+def read_geoparquet(filepath: Union[str, Path],
+    options: Optional[Options]=Options.options_factory()) -> List:
+    ''' LadybugFeatures of a GeoParquet file.
+
+    Args:
+    - filepath: path of the Parquet file.
+    - options: Options object to use for mapping.
+    '''
+    _pyarrow()
+    import pyarrow.parquet as pq
+    return from_arrow_table(pq.read_table(str(filepath), memory_map=True),
+        options)
@@ -0,0 +1,57 @@
+# coding=utf-8
+'''Property conditions of the GEOJSON features.
+
+Conditions are key=value, key!=value, key>value, key>=value, key<value or
+key<=value texts. Nested keys are separated by dots and values are parsed
+as JSON if possible. They filter the features of the command line and the
+queries of the FeatureStore.
+'''
+import json
+import re
+from typing import List, Optional
+
+_WHERE = re.compile(r'^\s*([^\s=!<>]+)\s*(==|=|!=|>=|<=|>|<)\s*(.*?)\s*$')
+
+def _parse_where(text: str) -> tuple:
+    '''Condition (keys, operator, value) from a key=value text.
+    Nested keys are separated by dots. Values are parsed as JSON
+    if possible, otherwise they are strings.'''
+    match = _WHERE.match(text)
+    if not match:
+        raise ValueError(
+            f'{text} is not a valid condition. Use key=value, key!=value, '
+            'key>value, key>=value, key<value or key<=value.')
+    key, op, value = match.groups()
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return key.split('.'), op, value
+
+def _match(properties: Optional[dict],
+    conditions: List[tuple]) -> bool:
+    '''True if the properties satisfy all conditions.'''
+    for keys, op, value in conditions:
+        current = properties
+        for key in keys:
+            if not isinstance(current, dict) or key not in current:
+                return False
+            current = current[key]
+        try:
+            if op in ('=', '=='):
+                ok = current == value
+            elif op == '!=':
+                ok = current != value
+            elif op == '>':
+                ok = current > value
+            elif op == '>=':
+                ok = current >= value
+            elif op == '<':
+                ok = current < value
+            else:
+                ok = current <= value
+        except TypeError:
+            return False
+        if not ok:
+            return False
+    return True
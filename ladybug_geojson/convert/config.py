@@ -13,6 +13,8 @@ class Options:
     - validation: set it to false to skip GeoJSON validation.
     - fill_polygon: set it to true to create faces instead of polygon.
     - tolerance: number to use as tolerance for the polyface operatation.
+    - simplify: distance used to simplify lines and polygon rings before 
+            creating the geometries (Douglas-Peucker). 0 to disable it.
     Properties:
         * settings
     '''
@@ -24,14 +26,16 @@ class Options:
         merge_faces: bool=False,
         validation: bool=True,
         fill_polygon: bool=False,
-        tolerance: bool=0.001):
+        tolerance: bool=0.001,
+        simplify: float=0.0):
         self._settings = {
             'z': z,
             'merge_faces': merge_faces,
             'interpolated': interpolated,
             'validation': validation,
             'fill_polygon': fill_polygon,
-            'tolerance': tolerance
+            'tolerance': tolerance,
+            'simplify': simplify
         }
     
     @classmethod
@@ -52,8 +56,9 @@ class Options:
     
     def copy_from_dict(self, 
         other:dict):
-        ''' Merge current settings with another dictionary '''
-        self._settings = {**other, **self._settings}
+        ''' Merge current settings with another dictionary.
+        Values of the other dictionary win. '''
+        self._settings = {**self._settings, **other}
     
     @property
     def settings(self):
@@ -0,0 +1,391 @@
+# coding=utf-8
+'''Binary cache of converted Ladybug features.
+
+The cache stores the geometries of LadybugFeatures as flat buffers, so a
+FeatureCache maps the file in memory and opens it without reading it.
+The geometry and the properties of a feature are created only when the
+feature is requested, and no GeoJSON parsing or validation is needed.
+
+File layout (little endian). Each section starts at a multiple of 8 bytes:
+- header: magic (8 bytes), version (uint32), 4 bytes of padding, number of
+    features, parts, rings, vertices and indices and size of the
+    properties in bytes (6 uint64).
+- feature kinds (uint8 for each feature): NONE, POLYFACE, LIST or the kind
+    of the single part of the feature.
+- feature parts (uint64, features + 1): offsets of the parts of each feature.
+- part kinds (uint8 for each part): POINT, SEGMENT, POLYLINE,
+    INTERPOLATED_POLYLINE, FACE or VERTICES.
+- part rings (uint64, parts + 1): offsets of the rings of each part.
+    A FACE has a first ring with plane origin, normal and x axis, then
+    the boundary and the holes. The other parts have one ring.
+- ring vertices (uint64, rings + 1): offsets of the vertices of each ring.
+- coordinates (float64, 3 for each vertex): x, y, z of the vertices.
+- feature indices (uint64, features + 1): offsets of the indices of each
+    feature. Only POLYFACE features have indices.
+- indices (uint64): a POLYFACE has a single VERTICES part with the
+    vertices of the Polyface3D, and these indices: the number of faces,
+    for each face the number of loops and for each loop its number of
+    vertex indices followed by them, then the number of edges followed
+    by the two vertex indices and the type of each edge.
+- property offsets (uint64, features + 1): offsets of the properties.
+- properties: JSON of the properties of each feature.
+
+Usage:
+    write_feature_cache(features, 'buildings.lbgj')
+    with FeatureCache('buildings.lbgj') as cache:
+        feature = cache[1000]
+'''
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+from .config import Options
+
+MAGIC = b'LBGJBIN\x00'
+VERSION = 2
+
+_HEADER = struct.Struct('<8sI4xQQQQQQ')
+
+# part kinds
+POINT = 1
+SEGMENT = 2
+POLYLINE = 3
+INTERPOLATED_POLYLINE = 4
+FACE = 5
+# vertices of a POLYFACE, only in POLYFACE features
+VERTICES = 8
+# feature kinds, with the part kinds for single geometries
+NONE = 0
+POLYFACE = 6
+LIST = 7
+
+_LITTLE = sys.byteorder == 'little'
+
+def _padding(size: int) -> bytes:
+    return b'\x00' * (-size % 8)
+
+def _to_bytes(arr: array) -> bytes:
+    if not _LITTLE and arr.itemsize > 1:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+'''____________WRITER____________'''
+
+class _Buffers:
+    '''Flat buffers of the geometries.'''
+    __slots__ = ('feature_kinds', 'feature_parts', 'part_kinds',
+        'part_rings', 'ring_vertices', 'coords',
+        'feature_indices', 'indices',
+        'property_offsets', 'properties')
+
+    def __init__(self):
+        self.feature_kinds = array('B')
+        self.feature_parts = array('Q', [0])
+        self.part_kinds = array('B')
+        self.part_rings = array('Q', [0])
+        self.ring_vertices = array('Q', [0])
+        self.coords = array('d')
+        self.feature_indices = array('Q', [0])
+        self.indices = array('Q')
+        self.property_offsets = array('Q', [0])
+        self.properties = bytearray()
+
+    def add_ring(self,
+        points):
+        coords = self.coords
+        for pt in points:
+            coords.extend((pt.x, pt.y, pt.z))
+        self.ring_vertices.append(len(coords) // 3)
+
+    def add_part(self,
+        geometry):
+        # imported here to load ladybug_geometry only when it is used
+        from ladybug_geometry.geometry3d.pointvector import Point3D
+        from ladybug_geometry.geometry3d.line import LineSegment3D
+        from ladybug_geometry.geometry3d.polyline import Polyline3D
+        from ladybug_geometry.geometry3d.face import Face3D
+
+        if isinstance(geometry, Point3D):
+            kind = POINT
+            self.add_ring([geometry])
+        elif isinstance(geometry, LineSegment3D):
+            kind = SEGMENT
+            self.add_ring([geometry.p1, geometry.p2])
+        elif isinstance(geometry, Polyline3D):
+            kind = INTERPOLATED_POLYLINE if geometry.interpolated \
+                else POLYLINE
+            self.add_ring(geometry.vertices)
+        elif isinstance(geometry, Face3D):
+            kind = FACE
+            plane = geometry.plane
+            self.add_ring([plane.o, plane.n, plane.x])
+            self.add_ring(geometry.boundary)
+            for hole in geometry.holes or []:
+                self.add_ring(hole)
+        else:
+            raise TypeError(f'{type(geometry).__name__} is not supported.')
+        self.part_kinds.append(kind)
+        self.part_rings.append(len(self.ring_vertices) - 1)
+        return kind
+
+    def add_polyface(self,
+        polyface):
+        self.add_ring(polyface.vertices)
+        self.part_kinds.append(VERTICES)
+        self.part_rings.append(len(self.ring_vertices) - 1)
+
+        indices = self.indices
+        indices.append(len(polyface.face_indices))
+        for face in polyface.face_indices:
+            indices.append(len(face))
+            for loop in face:
+                indices.append(len(loop))
+                indices.extend(loop)
+        indices.append(len(polyface.edge_indices))
+        for (a, b), tp in zip(polyface.edge_indices, polyface.edge_types):
+            indices.extend((a, b, tp))
+
+    def add_feature(self,
+        feature):
+        # imported here to load ladybug_geometry only when it is used
+        from ladybug_geometry.geometry3d.polyface import Polyface3D
+
+        geo = feature.geometry
+        if geo is None:
+            kind = NONE
+        elif isinstance(geo, (list, tuple)):
+            kind = LIST
+            for _ in geo:
+                self.add_part(_)
+        elif isinstance(geo, Polyface3D):
+            kind = POLYFACE
+            self.add_polyface(geo)
+        else:
+            kind = self.add_part(geo)
+        self.feature_kinds.append(kind)
+        self.feature_parts.append(len(self.part_kinds))
+        self.feature_indices.append(len(self.indices))
+
+        self.properties.extend(json.dumps(feature.properties).encode('utf-8'))
+        self.property_offsets.append(len(self.properties))
+
+def write_feature_cache(features: List,
+    filepath: Union[str, Path]) -> Path:
+    ''' Write LadybugFeatures into a binary cache file.
+
+    Args:
+    - features: list of LadybugFeature.
+    - filepath: path of the cache file.
+
+    Return:
+        the path of the cache file
+    '''
+    buffers = _Buffers()
+    for ft in features:
+        buffers.add_feature(ft)
+
+    fp = Path(filepath)
+    with open(fp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(buffers.feature_kinds),
+            len(buffers.part_kinds), len(buffers.ring_vertices) - 1,
+            len(buffers.coords) // 3, len(buffers.indices),
+            len(buffers.properties)))
+        for arr in (buffers.feature_kinds, buffers.feature_parts,
+            buffers.part_kinds, buffers.part_rings,
+            buffers.ring_vertices, buffers.coords,
+            buffers.feature_indices, buffers.indices,
+            buffers.property_offsets):
+            data = _to_bytes(arr)
+            f.write(data)
+            f.write(_padding(len(data)))
+        f.write(bytes(buffers.properties))
+    return fp
+
+'''____________READER____________'''
+
+class FeatureCache:
+    '''LadybugFeatures of a binary cache file.
+    Features are created when they are requested.
+
+    Args:
+    - filepath: path of the cache file.
+    - options: Options object stored with the LadybugFeatures.
+    '''
+    __slots__ = ('_file', '_data', '_views', '_count',
+        '_feature_kinds', '_feature_parts', '_part_kinds',
+        '_part_rings', '_ring_vertices', '_coords',
+        '_feature_indices', '_indices', '_property_offsets', '_properties', '_options')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        options: Optional[Options]=Options.options_factory()):
+        self._options = options
+        self._views = []
+        self._file = open(filepath, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+            magic, version, features, parts, rings, vertices, indices, \
+                props = _HEADER.unpack_from(self._data, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{filepath} is not a valid feature cache.')
+            self._count = features
+
+            pos = _HEADER.size
+            def _section(typecode, count):
+                nonlocal pos
+                size = count * array(typecode).itemsize
+                view = memoryview(self._data)[pos:pos + size]
+                pos += size + (-size % 8)
+                self._views.append(view)
+                if typecode == 'B':
+                    return view
+                if _LITTLE:
+                    view = view.cast(typecode)
+                    self._views.append(view)
+                    return view
+                arr = array(typecode, view.tobytes())
+                arr.byteswap()
+                return arr
+
+            self._feature_kinds = _section('B', features)
+            self._feature_parts = _section('Q', features + 1)
+            self._part_kinds = _section('B', parts)
+            self._part_rings = _section('Q', parts + 1)
+            self._ring_vertices = _section('Q', rings + 1)
+            self._coords = _section('d', vertices * 3)
+            self._feature_indices = _section('Q', features + 1)
+            self._indices = _section('Q', indices)
+            self._property_offsets = _section('Q', features + 1)
+            self._properties = pos
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self,
+        n: int):
+        return self.get(n)
+
+    def __iter__(self) -> Iterator:
+        for n in range(self._count):
+            yield self.get(n)
+
+    def _check(self,
+        n: int) -> int:
+        if n < 0:
+            n += self._count
+        if not 0 <= n < self._count:
+            raise IndexError('feature index out of range.')
+        return n
+
+    def _ring(self,
+        r: int) -> list:
+        # imported here to load ladybug_geometry only when it is used
+        from ladybug_geometry.geometry3d.pointvector import Point3D
+        c = self._coords[self._ring_vertices[r] * 3:
+            self._ring_vertices[r + 1] * 3].tolist()
+        return [Point3D(c[i], c[i + 1], c[i + 2])
+            for i in range(0, len(c), 3)]
+
+    def _part(self,
+        p: int):
+        # imported here to load ladybug_geometry only when it is used
+        from ladybug_geometry.geometry3d.pointvector import Vector3D
+        from ladybug_geometry.geometry3d.line import LineSegment3D
+        from ladybug_geometry.geometry3d.polyline import Polyline3D
+        from ladybug_geometry.geometry3d.plane import Plane
+        from ladybug_geometry.geometry3d.face import Face3D
+
+        kind = self._part_kinds[p]
+        rings = [self._ring(_) for _ in range(self._part_rings[p],
+            self._part_rings[p + 1])]
+        if kind == POINT:
+            return rings[0][0]
+        if kind == SEGMENT:
+            return LineSegment3D.from_end_points(*rings[0])
+        if kind == POLYLINE:
+            return Polyline3D(rings[0])
+        if kind == INTERPOLATED_POLYLINE:
+            return Polyline3D(rings[0], interpolated=True)
+        if kind == FACE:
+            o, n, x = rings[0]
+            # the stored plane skips the plane fit and the orientation check
+            plane = Plane(Vector3D(n.x, n.y, n.z), o,
+                Vector3D(x.x, x.y, x.z))
+            return Face3D(rings[1], plane, rings[2:] or None,
+                enforce_right_hand=False)
+        raise ValueError(f'Unknown geometry kind {kind}.')
+
+    def _polyface(self,
+        n: int):
+        # imported here to load ladybug_geometry only when it is used
+        from ladybug_geometry.geometry3d.polyface import Polyface3D
+
+        vertices = self._ring(self._part_rings[self._feature_parts[n]])
+        it = iter(self._indices[self._feature_indices[n]:
+            self._feature_indices[n + 1]].tolist())
+        faces = []
+        for _ in range(next(it)):
+            faces.append([[next(it) for _ in range(next(it))]
+                for _ in range(next(it))])
+        edges, types = [], []
+        for _ in range(next(it)):
+            edges.append((next(it), next(it)))
+            types.append(next(it))
+        # the stored edges skip the edge search of the constructor
+        return Polyface3D(vertices, faces,
+            { 'edge_indices': edges, 'edge_types': types })
+
+    def geometry(self,
+        n: int):
+        ''' Ladybug geometry of a feature '''
+        n = self._check(n)
+        kind = self._feature_kinds[n]
+        if kind == NONE:
+            return None
+        if kind == POLYFACE:
+            return self._polyface(n)
+        parts = [self._part(_) for _ in range(self._feature_parts[n],
+            self._feature_parts[n + 1])]
+        if kind == LIST:
+            return parts
+        return parts[0]
+
+    def properties(self,
+        n: int) -> Optional[dict]:
+        ''' Properties of a feature '''
+        n = self._check(n)
+        start = self._properties + self._property_offsets[n]
+        end = self._properties + self._property_offsets[n + 1]
+        return json.loads(self._data[start:end])
+
+    def get(self,
+        n: int):
+        ''' LadybugFeature of a feature '''
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+        return LadybugFeature.from_geometry(self.geometry(n),
+            self.properties(n), self._options)
+
+    def close(self):
+        ''' Close the file '''
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        for attr in ('_data', '_file'):
+            obj = getattr(self, attr, None)
+            if obj is not None:
+                obj.close()
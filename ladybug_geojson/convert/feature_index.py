@@ -0,0 +1,429 @@
+# coding=utf-8
+'''Byte offset index for random access into large GEOJSON FeatureCollection files.
+
+The index is built once and saved in a sidecar file. Then a FeatureFile
+maps the GeoJSON file in memory and decodes only the requested features.
+
+Index file layout (little endian):
+- header: magic (8 bytes), version (uint32), size of the GeoJSON file
+    (uint64), modification time of the GeoJSON file in ns (int64),
+    number of features (uint64).
+- one record for each feature: start and end byte offsets (2 uint64)
+    and bbox west, south, east, north (4 float64, NaN if empty).
+- the ids of the features as a JSON array.
+
+A whole file can also be converted by several processes with
+read_features_parallel. The file is split into byte ranges of whole
+features and each range is decoded in a separate process.
+
+Usage:
+    index_features('buildings.geojson')
+    with FeatureFile('buildings.geojson') as ff:
+        feature = ff.get(1000)
+        feature = ff.get_by_id('way/123')
+
+    features = read_features_parallel('buildings.geojson', workers=8)
+
+    with open('buildings.geojson', 'rb') as f:
+        data = f.read()
+    for start, end in iter_feature_spans(data):
+        feature = json.loads(data[start:end])
+'''
+import json
+import math
+import mmap
+import os
+import re
+import struct
+from collections import deque
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from .config import Options
+
+INDEX_SUFFIX = '.idx'
+MAGIC = b'LBGJFIX\x00'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIQqQ')
+_RECORD = struct.Struct('<QQdddd')
+
+# JSON string with escapes
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOP_TOKENS = re.compile(_STRING + rb'|[{}\[\]]')
+_FEATURES_ARRAY = re.compile(rb'\s*:\s*\[')
+# skip everything up to the next relevant character. Strings are
+# skipped as a whole because they can contain braces
+_ARRAY_SKIP = re.compile(rb'[^{\]"]*(?:' + _STRING + rb'[^{\]"]*)*')
+_FEATURE_SKIP = re.compile(rb'[^{}"]*(?:' + _STRING + rb'[^{}"]*)*')
+
+_OPEN_BRACE = ord('{')
+_CLOSE_BRACE = ord('}')
+_CLOSE_BRACKET = ord(']')
+_OPEN = (ord('{'), ord('['))
+_CLOSE = (ord('}'), ord(']'))
+
+'''____________SCANNER____________'''
+
+def _features_array_start(data) -> int:
+    '''Offset after the [ of the features array of the root object.'''
+    depth = 0
+    for m in _TOP_TOKENS.finditer(data):
+        tok = data[m.start()]
+        if tok in _OPEN:
+            depth += 1
+        elif tok in _CLOSE:
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and m.group() == b'"features"':
+            arr = _FEATURES_ARRAY.match(data, m.end())
+            if arr:
+                return arr.end()
+    raise ValueError('FeatureCollection features not found.')
+
+def _feature_spans(data,
+    start: Optional[int]=None) -> Iterator[Tuple[int, int]]:
+    '''Yield the (start, end) byte offsets of the features of a
+    FeatureCollection. The regular expressions skip numbers, brackets
+    and strings, so only the braces are visited in Python.
+
+    Args:
+    - data: bytes or mmap of the GeoJSON file.
+    - start: offset after the [ of the features array. It is found
+            if it is None.
+    '''
+    pos = _features_array_start(data) if start is None else start
+    size = len(data)
+    while True:
+        pos = _ARRAY_SKIP.match(data, pos).end()
+        if pos >= size:
+            raise ValueError('FeatureCollection features are not closed.')
+        tok = data[pos]
+        if tok == _CLOSE_BRACKET:
+            return
+        if tok != _OPEN_BRACE:
+            raise ValueError(f'Invalid JSON string at byte {pos}.')
+
+        begin, depth = pos, 0
+        while True:
+            tok = data[pos]
+            if tok == _OPEN_BRACE:
+                depth += 1
+            elif tok == _CLOSE_BRACE:
+                depth -= 1
+                if depth == 0:
+                    break
+            else:
+                raise ValueError(f'Invalid JSON string at byte {pos}.')
+            pos = _FEATURE_SKIP.match(data, pos + 1).end()
+            if pos >= size:
+                raise ValueError('Feature is not closed.')
+        pos += 1
+        yield begin, pos
+
+def iter_feature_spans(data) -> Iterator[Tuple[int, int]]:
+    ''' Iterator of the (start, end) byte offsets of the features of a
+    GEOJSON FeatureCollection. The features are not decoded.
+
+    Args:
+    - data: bytes or memory map of the GeoJSON file.
+
+    Return:
+        an iterator of (start, end) tuples. A ValueError is raised at
+        once if data has no features array.
+    '''
+    return _feature_spans(data, _features_array_start(data))
+
+def _feature_id(feature: dict,
+    id_property: Optional[str]=None):
+    if id_property:
+        return (feature.get('properties') or {}).get(id_property)
+    return feature.get('id')
+
+'''____________INDEX____________'''
+
+def _index_path(filepath: Union[str, Path],
+    index_path: Optional[Union[str, Path]]) -> Path:
+    if index_path:
+        return Path(index_path)
+    fp = Path(filepath)
+    return fp.with_name(fp.name + INDEX_SUFFIX)
+
+def index_features(filepath: Union[str, Path],
+    index_path: Optional[Union[str, Path]]=None,
+    id_property: Optional[str]=None) -> Path:
+    ''' Build the index of a GEOJSON FeatureCollection file.
+    Each feature is decoded once to get id and bbox. Only one feature
+    is in memory at a time.
+
+    Args:
+    - filepath: path of the GeoJSON file.
+    - index_path: path of the index file. Default is the GeoJSON path
+            with .idx suffix.
+    - id_property: name of the property to use as id. Default is the
+            id member of the feature.
+
+    Return:
+        the path of the index file
+    '''
+    # imported here to avoid a circular import
+    from ..slippy.index import feature_bbox
+
+    fp = Path(filepath)
+    out = _index_path(fp, index_path)
+    stat = fp.stat()
+    nan = float('nan')
+
+    ids = []
+    with open(fp, 'rb') as f, open(out, 'wb') as idx:
+        idx.write(_HEADER.pack(MAGIC, VERSION, stat.st_size,
+            stat.st_mtime_ns, 0))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _feature_spans(data):
+                ft = json.loads(data[start:end])
+                bbox = feature_bbox(ft) or (nan, nan, nan, nan)
+                idx.write(_RECORD.pack(start, end, *bbox))
+                ids.append(_feature_id(ft, id_property))
+        idx.write(json.dumps(ids).encode('utf-8'))
+        idx.seek(0)
+        idx.write(_HEADER.pack(MAGIC, VERSION, stat.st_size,
+            stat.st_mtime_ns, len(ids)))
+    return out
+
+class FeatureFile:
+    '''Random access to the features of an indexed GEOJSON FeatureCollection.
+    The GeoJSON file and the index are mapped in memory, so opening
+    the file does not read it.
+
+    Args:
+    - filepath: path of the GeoJSON file.
+    - index_path: path of the index file. Default is the GeoJSON path
+            with .idx suffix. The index is built if it does not exist.
+    - options: Options object to use for the LadybugFeatures.
+    Properties:
+        * ids
+    '''
+    __slots__ = ('_file', '_data', '_index_file', '_index',
+        '_count', '_ids', '_positions', '_options')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        index_path: Optional[Union[str, Path]]=None,
+        options: Optional[Options]=Options.options_factory()):
+        fp = Path(filepath)
+        index_path = _index_path(fp, index_path)
+        if not index_path.exists():
+            index_features(fp, index_path)
+
+        self._options = options
+        self._ids = None
+        self._positions = None
+        self._file = open(fp, 'rb')
+        self._index_file = open(index_path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+            self._index = mmap.mmap(self._index_file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+            magic, version, size, mtime, count = \
+                _HEADER.unpack_from(self._index, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{index_path} is not a valid index.')
+            stat = fp.stat()
+            if size != stat.st_size or mtime != stat.st_mtime_ns:
+                raise ValueError(f'{index_path} is out of date. '
+                    'Build it again with index_features.')
+            self._count = count
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _record(self,
+        n: int) -> tuple:
+        if n < 0:
+            n += self._count
+        if not 0 <= n < self._count:
+            raise IndexError('feature index out of range.')
+        return _RECORD.unpack_from(self._index,
+            _HEADER.size + n * _RECORD.size)
+
+    @property
+    def ids(self) -> List:
+        ''' List with the id of each feature '''
+        if self._ids is None:
+            start = _HEADER.size + self._count * _RECORD.size
+            self._ids = json.loads(self._index[start:])
+        return self._ids
+
+    def span(self,
+        n: int) -> Tuple[int, int]:
+        ''' Start and end byte offsets of a feature '''
+        return self._record(n)[:2]
+
+    def bbox(self,
+        n: int) -> Optional[tuple]:
+        ''' Bounding box (west, south, east, north) of a feature '''
+        bbox = self._record(n)[2:]
+        return None if math.isnan(bbox[0]) else bbox
+
+    def get_json(self,
+        n: int) -> str:
+        ''' GeoJSON string of a feature '''
+        start, end = self.span(n)
+        return self._data[start:end].decode('utf-8')
+
+    def get(self,
+        n: int):
+        ''' LadybugFeature of a feature '''
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+        return LadybugFeature(self.get_json(n), self._options)
+
+    def position(self,
+        id: Union[str, int]) -> Optional[int]:
+        ''' Position of the first feature with an id or None '''
+        if self._positions is None:
+            positions = {}
+            for i, _ in enumerate(self.ids):
+                if _ is not None and _ not in positions:
+                    positions[_] = i
+            self._positions = positions
+        return self._positions.get(id)
+
+    def get_by_id(self,
+        id: Union[str, int]):
+        ''' LadybugFeature of the first feature with an id or None '''
+        n = self.position(id)
+        return None if n is None else self.get(n)
+
+    def query(self,
+        bbox: tuple) -> List[int]:
+        ''' Positions of the features that intersect a bounding box.
+
+        Args:
+        - bbox: tuple with (west, south, east, north).
+        '''
+        west, south, east, north = bbox
+        res = []
+        for i, rec in enumerate(_RECORD.iter_unpack(self._index[
+            _HEADER.size:_HEADER.size + self._count * _RECORD.size])):
+            # NaN comparisons are false so empty features are skipped
+            if rec[2] <= east and rec[4] >= west and \
+                rec[3] <= north and rec[5] >= south:
+                res.append(i)
+        return res
+
+    def close(self):
+        ''' Close the files '''
+        for attr in ('_data', '_index', '_file', '_index_file'):
+            obj = getattr(self, attr, None)
+            if obj is not None:
+                obj.close()
+
+'''____________PARALLEL READER____________'''
+
+def _spans(filepath: Path) -> Iterator[Tuple[int, int]]:
+    '''Feature spans from the index if it is valid, otherwise
+    from a scan of the file.'''
+    ff = None
+    index_path = _index_path(filepath, None)
+    if index_path.exists():
+        try:
+            ff = FeatureFile(filepath, index_path)
+        except ValueError:
+            ff = None
+    if ff is not None:
+        with ff:
+            for n in range(len(ff)):
+                yield ff.span(n)
+        return
+
+    with open(filepath, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        yield from _feature_spans(data)
+
+def _ranges(filepath: Path,
+    chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    '''Byte ranges of whole features of about chunk_bytes.'''
+    start = end = None
+    for a, b in _spans(filepath):
+        if start is None:
+            start = a
+        end = b
+        if end - start >= chunk_bytes:
+            yield start, end
+            start = None
+    if start is not None:
+        yield start, end
+
+def _read_range(args: tuple) -> list:
+    '''LadybugFeatures of a byte range. It runs in the worker processes.'''
+    filepath, start, end, options = args
+
+    # imported here to load ladybug_geometry only when it is used
+    from ..ladybug_feature import LadybugFeature
+
+    res = []
+    with open(filepath, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for a, b in _feature_spans(data, start):
+            res.append(LadybugFeature(data[a:b].decode('utf-8'), options))
+            if b >= end:
+                break
+    return res
+
+def read_features_parallel(filepath: Union[str, Path],
+    options: Optional[Options]=Options.options_factory(),
+    workers: Optional[int]=None,
+    chunk_bytes: Optional[int]=None) -> list:
+    ''' Convert a GEOJSON FeatureCollection file into LadybugFeatures
+    with several processes.
+    The feature boundaries are found with the index of the file if it
+    exists, otherwise with a scan. Ranges are sent to the workers while
+    the scan goes on, with at most 2 ranges pending for each worker, and
+    the results are merged in file order.
+
+    Args:
+    - filepath: path of the GeoJSON file.
+    - options: Options object to use for the LadybugFeatures.
+    - workers: number of processes. Default is the number of CPUs.
+    - chunk_bytes: size of the byte ranges. Default is the file size
+            divided by 4 times the workers, with at least 1 MB.
+
+    Return:
+        a list of LadybugFeature
+    '''
+    fp = Path(filepath)
+    workers = workers or os.cpu_count() or 1
+    if not chunk_bytes:
+        chunk_bytes = max(fp.stat().st_size // (4 * workers), 2 ** 20)
+
+    jobs = ((str(fp), a, b, options) for a, b in _ranges(fp, chunk_bytes))
+    res = []
+    if workers < 2:
+        for job in jobs:
+            res.extend(_read_range(job))
+        return res
+
+    # imported here because multiprocessing is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # only a few ranges are pending, so the scan does not run far
+        # ahead of the workers
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(_read_range, job))
+            if len(pending) >= 2 * workers:
+                res.extend(pending.popleft().result())
+        while pending:
+            res.extend(pending.popleft().result())
+    return res
@@ -0,0 +1,268 @@
+# coding=utf-8
+'''Local SQLite store of GEOJSON features with an R*Tree spatial index.
+
+A FeatureCollection is loaded once in batched transactions. Geometries
+are stored as WKB blobs, properties as JSON and bounding boxes in an
+R*Tree, so small spatial and attribute queries do not parse the GeoJSON
+again. Only the rows that match a query are converted into LadybugFeatures,
+when they are iterated.
+
+Tables:
+- features: id, fid (feature id), west, south, east, north, geometry (WKB)
+    and properties (JSON).
+- features_rtree: R*Tree of the bounding boxes of the features.
+
+Usage:
+    with FeatureStore('city.sqlite') as store:
+        store.load('city.geojson')
+        for feature in store.query(bbox=(11.0, 46.0, 11.1, 46.1),
+            where=['building=house', 'height>10']):
+            ...
+'''
+import json
+import mmap
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+from .conditions import _parse_where
+from .config import Options
+from .wkb import _geojson_wkb, _from_wkb, _build
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS features (
+    id INTEGER PRIMARY KEY,
+    fid,
+    west REAL, south REAL, east REAL, north REAL,
+    geometry BLOB,
+    properties TEXT
+);
+CREATE INDEX IF NOT EXISTS features_fid ON features (fid);
+CREATE VIRTUAL TABLE IF NOT EXISTS features_rtree
+    USING rtree(id, west, east, south, north);
+'''
+
+_INSERT = 'INSERT INTO features VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+_INSERT_RTREE = 'INSERT INTO features_rtree VALUES (?, ?, ?, ?, ?)'
+
+# SQL operators of the conditions of conditions._parse_where
+_OPERATORS = { '=': '=', '==': '=', '!=': '!=',
+    '>': '>', '>=': '>=', '<': '<', '<=': '<=' }
+
+def _read_file(filepath: Union[str, Path]) -> Iterator[dict]:
+    '''Yield the features of a FeatureCollection file one at a time.
+    An empty file is not valid: it is often a truncated file, and it
+    would remove all features from an incremental update.'''
+    # imported here to avoid a circular import
+    from .feature_index import _feature_spans
+
+    if not Path(filepath).stat().st_size:
+        raise ValueError(f'{filepath} is empty.')
+    with open(filepath, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _feature_spans(data):
+                yield json.loads(data[start:end])
+
+def _row(feature: dict,
+    id_property: Optional[str]) -> Optional[tuple]:
+    '''Values of a feature for the features table without id.
+    None if the geometry is not valid.'''
+    # imported here to avoid a circular import
+    from .feature_index import _feature_id
+    from ..slippy.index import feature_bbox
+
+    geo = feature.get('geometry')
+    try:
+        blob = bytes(_geojson_wkb(geo)) if geo else None
+        bbox = feature_bbox(feature) if geo else None
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
+    bbox = bbox or (None, None, None, None)
+    return (_feature_id(feature, id_property), *bbox, blob,
+        json.dumps(feature.get('properties')))
+
+def _json_path(keys: List[str]) -> str:
+    return '$' + ''.join('."' + _.replace('"', '\\"') + '"' for _ in keys)
+
+def _where_sql(conditions: List) -> tuple:
+    '''SQL and parameters of property conditions. Conditions are
+    key=value strings or tuples from conditions._parse_where.'''
+    sql, params = [], []
+    for cond in conditions:
+        keys, op, value = _parse_where(cond) if isinstance(cond, str) \
+            else cond
+        path = _json_path(keys)
+        op = _OPERATORS[op]
+        if value is None and op in ('=', '!='):
+            sql.append(f"json_type(properties, ?) {op} 'null'")
+            params.append(path)
+            continue
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value, separators=(',', ':'))
+        sql.append(f'json_extract(properties, ?) {op} ?')
+        params.extend((path, value))
+    return sql, params
+
+class FeatureStore:
+    '''SQLite store of GEOJSON features. The file is created if it
+    does not exist.
+
+    Args:
+    - filepath: path of the SQLite file. Use :memory: for a store
+            in memory.
+    - options: Options object to use for the LadybugFeatures.
+    '''
+    __slots__ = ('_connection', '_options')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        options: Optional[Options]=Options.options_factory()):
+        self._options = options
+        self._connection = sqlite3.connect(str(filepath))
+        try:
+            self._connection.executescript(_SCHEMA)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT count(*) FROM features').fetchone()[0]
+
+    def __iter__(self) -> Iterator:
+        return self.query()
+
+    def load(self,
+        source: Union[str, Path, Iterable[dict]],
+        batch_size: int=10000,
+        id_property: Optional[str]=None) -> int:
+        ''' Add the features of a FeatureCollection.
+        Each batch of features is added in a single transaction.
+        Features with a geometry that is not valid are skipped.
+
+        Args:
+        - source: path of a FeatureCollection file or GeoJSON Feature
+                dictionaries. The file is read one feature at a time.
+        - batch_size: number of features for each transaction.
+        - id_property: name of the property to use as id. Default is the
+                id member of the feature.
+
+        Return:
+            the number of added features
+        '''
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than 0.')
+        features = _read_file(source) if isinstance(source, (str, Path)) \
+            else iter(source)
+        con = self._connection
+        next_id = con.execute(
+            'SELECT coalesce(max(id), 0) + 1 FROM features').fetchone()[0]
+
+        added = 0
+        while True:
+            batch = list(islice(features, batch_size))
+            if not batch:
+                break
+            rows = []
+            for ft in batch:
+                row = _row(ft, id_property)
+                if row is not None:
+                    rows.append((next_id, *row))
+                    next_id += 1
+            with con:
+                con.executemany(_INSERT, rows)
+                con.executemany(_INSERT_RTREE, [(r[0], r[2], r[4], r[3],
+                    r[5]) for r in rows if r[2] is not None])
+            added += len(rows)
+        return added
+
+    def _select(self,
+        columns: str,
+        bbox: Optional[tuple],
+        where: Optional[List],
+        limit: Optional[int]=None) -> sqlite3.Cursor:
+        sql, params = [], []
+        if bbox:
+            west, south, east, north = bbox
+            # the R*Tree stores rounded 32 bit boxes, so the exact
+            # boxes of the candidates are checked too
+            sql.append('id IN (SELECT id FROM features_rtree WHERE '
+                'west <= ? AND east >= ? AND south <= ? AND north >= ?)')
+            sql.append('west <= ? AND east >= ? AND south <= ? AND north >= ?')
+            params.extend((east, west, north, south) * 2)
+        if where:
+            conds, values = _where_sql(where)
+            sql.extend(conds)
+            params.extend(values)
+
+        query = f'SELECT {columns} FROM features'
+        if sql:
+            query += ' WHERE ' + ' AND '.join(sql)
+        query += ' ORDER BY id'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return self._connection.execute(query, params)
+
+    def _feature(self,
+        blob: Optional[bytes],
+        properties: str):
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+        geo = None
+        if blob is not None:
+            tp, coordinates, _ = _from_wkb(blob)
+            geo = _build(tp, coordinates, self._options)
+        return LadybugFeature.from_geometry(geo, json.loads(properties),
+            self._options)
+
+    def query(self,
+        bbox: Optional[tuple]=None,
+        where: Optional[List]=None,
+        limit: Optional[int]=None) -> Iterator:
+        ''' Yield the LadybugFeatures that match a query.
+        Features are converted when they are iterated.
+
+        Args:
+        - bbox: tuple with (west, south, east, north). Only the features
+                that intersect it are returned.
+        - where: list of property conditions like key=value, key!=value or
+                key>value. Nested keys use dots. Values are parsed as JSON
+                if possible.
+        - limit: maximum number of features.
+        '''
+        for blob, properties in self._select('geometry, properties',
+            bbox, where, limit):
+            yield self._feature(blob, properties)
+
+    def count(self,
+        bbox: Optional[tuple]=None,
+        where: Optional[List]=None) -> int:
+        ''' Number of features that match a query. See query. '''
+        return self._select('count(*)', bbox, where).fetchone()[0]
+
+    def ids(self,
+        bbox: Optional[tuple]=None,
+        where: Optional[List]=None) -> List:
+        ''' Ids of the features that match a query. See query. '''
+        return [_[0] for _ in self._select('fid', bbox, where)]
+
+    def get(self,
+        id: Union[str, int]):
+        ''' LadybugFeature of the first feature with an id or None '''
+        row = self._connection.execute('SELECT geometry, properties '
+            'FROM features WHERE fid = ? ORDER BY id LIMIT 1',
+            (id,)).fetchone()
+        return None if row is None else self._feature(*row)
+
+    def close(self):
+        ''' Close the database '''
+        con = getattr(self, '_connection', None)
+        if con is not None:
+            con.close()
@@ -1,20 +1,299 @@
 # coding=utf-8
 '''Functions to create GEOJSON geometry strings from Ladybug geometries.'''
 import json
-from typing import Optional
+import math
+from typing import List, Optional, Union
 from .._validator import ( _Validator, 
     GeojSONTypes )
+from ..ladybug_feature import LadybugFeature
 try:
     from ladybug_geometry.geometry2d.pointvector import Vector2D, Point2D
     from ladybug_geometry.geometry2d.arc import Arc2D
+    from ladybug_geometry.geometry2d.line import LineSegment2D
     from ladybug_geometry.geometry2d.polyline import Polyline2D
+    from ladybug_geometry.geometry2d.polygon import Polygon2D
+    from ladybug_geometry.geometry2d.mesh import Mesh2D
+    from ladybug_geometry.geometry3d.pointvector import Vector3D, Point3D
+    from ladybug_geometry.geometry3d.line import LineSegment3D
+    from ladybug_geometry.geometry3d.polyline import Polyline3D
+    from ladybug_geometry.geometry3d.mesh import Mesh3D
+    from ladybug_geometry.geometry3d.face import Face3D
+    from ladybug_geometry.geometry3d.polyface import Polyface3D
 except ImportError as e:
     raise ImportError(
         f'Failed to import ladybug_geometry.\n{e}')
 
-def from_arc_2d(arc: Arc2D, 
+POINT_TYPES = (Vector2D, Vector3D)
+LINE_TYPES = (LineSegment2D, LineSegment3D,
+    Polyline2D, Polyline3D)
+POLYGON_TYPES = (Polygon2D, Face3D)
+MULTIPOLYGON_TYPES = (Polyface3D, Mesh2D, Mesh3D)
+
+'''____________PRIVATE COORDINATE BUILDERS____________'''
+
+def _to_array(pt, 
+    precision: Optional[int]=None) -> list:
+    '''Coordinate array of a Ladybug point rounded to precision digits.'''
+    arr = pt.to_array()
+    if precision is None:
+        return list(arr)
+    # adding 0.0 avoids -0.0 in the output
+    return [round(_, precision) + 0.0 for _ in arr]
+
+def _to_ring(vertices,
+    precision: Optional[int]=None) -> list:
+    '''Closed GEOJSON ring from a list of Ladybug points.'''
+    ring = [_to_array(_, precision) for _ in vertices]
+    if ring and ring[0] != ring[-1]:
+        ring.append(ring[0])
+    return ring
+
+def _line_coordinates(line: Union[LineSegment2D, LineSegment3D,
+    Polyline2D, Polyline3D],
+    precision: Optional[int]=None) -> list:
+    if isinstance(line, (LineSegment2D, LineSegment3D)):
+        return [_to_array(line.p1, precision),
+            _to_array(line.p2, precision)]
+    return [_to_array(_, precision) for _ in line.vertices]
+
+def _polygon_coordinates(polygon: Union[Polygon2D, Face3D],
+    precision: Optional[int]=None) -> list:
+    if isinstance(polygon, Face3D):
+        rings = [_to_ring(polygon.boundary, precision)]
+        if polygon.has_holes:
+            rings.extend(_to_ring(_, precision) for _ in polygon.holes)
+        return rings
+    return [_to_ring(polygon.vertices, precision)]
+
+def _multipolygon_coordinates(geometry: Union[Polyface3D, Mesh2D, Mesh3D],
+    precision: Optional[int]=None) -> list:
+    if isinstance(geometry, Polyface3D):
+        return [_polygon_coordinates(_, precision) for _ in geometry.faces]
+    return [[_to_ring(_, precision)] for _ in geometry.face_vertices]
+
+def _arc_divisions(arc: Arc2D,
+    tolerance: float) -> int:
+    '''Number of divisions to keep the chords of the arc within tolerance.'''
+    minimum = 3 if arc.is_circle else 1
+    if tolerance <= 0:
+        raise ValueError('tolerance must be greater than 0.')
+    # max angle of a chord with sagitta equal to tolerance
+    ratio = min(tolerance / arc.r, 1.0)
+    max_angle = 2 * math.acos(1 - ratio)
+    return max(minimum, math.ceil(arc.angle / max_angle))
+
+def _arc_vertices(arc: Arc2D,
+    divisions: int,
+    precision: Optional[int]=None) -> list:
+    '''Coordinate arrays of the arc divided in evenly-spaced segments.
+        The points are computed at once from the arc angles.
+    '''
+    cx, cy, r = arc.c.x, arc.c.y, arc.r
+    step = arc.angle / divisions
+    angles = [arc.a1 + step * i for i in range(divisions + 1)]
+    vertices = [[cx + r * math.cos(_), cy + r * math.sin(_)] for _ in angles]
+    if precision is not None:
+        vertices = [[round(x, precision) + 0.0, round(y, precision) + 0.0]
+            for x, y in vertices]
+    return vertices
+
+def _arc_to_dict(arc: Arc2D,
+    divisions: Optional[int]=20,
+    precision: Optional[int]=None,
+    tolerance: Optional[float]=None) -> dict:
+    if tolerance is not None:
+        divisions = _arc_divisions(arc, tolerance)
+    vertices = _arc_vertices(arc, divisions, precision)
+
+    if arc.is_circle:
+        # close the ring with the first vertices
+        vertices[-1] = vertices[0]
+        return { 'type': GeojSONTypes.POLYGON.value,
+            'coordinates': [vertices] }
+
+    return { 'type': GeojSONTypes.LINESTRING.value,
+        'coordinates': vertices }
+
+MULTI_TYPES = {
+    GeojSONTypes.POINT.value: GeojSONTypes.MULTIPOINT.value,
+    GeojSONTypes.LINESTRING.value: GeojSONTypes.MULTILINESTRING.value,
+    GeojSONTypes.POLYGON.value: GeojSONTypes.MULTIPOLYGON.value
+}
+
+def _geometry_to_dict(geometry,
+    precision: Optional[int]=None,
     divisions: Optional[int]=20,
+    tolerance: Optional[float]=None) -> dict:
+    '''GEOJSON geometry dictionary from a Ladybug geometry.
+    Mapping is
+    - Point2D, Point3D > Point
+    - LineSegment2D, LineSegment3D, Polyline2D, Polyline3D > LineString
+    - Polygon2D, Face3D > Polygon
+    - Polyface3D, Mesh2D, Mesh3D > MultiPolygon
+    - Closed Arc2D > Polygon
+    - Open Arc2D > LineString
+    - List of points > MultiPoint
+    - List of lines > MultiLineString
+    - List of polygons > MultiPolygon
+    - Mixed list > GeometryCollection
+    '''
+    if isinstance(geometry, POINT_TYPES):
+        return { 'type': GeojSONTypes.POINT.value,
+            'coordinates': _to_array(geometry, precision) }
+    if isinstance(geometry, LINE_TYPES):
+        return { 'type': GeojSONTypes.LINESTRING.value,
+            'coordinates': _line_coordinates(geometry, precision) }
+    if isinstance(geometry, POLYGON_TYPES):
+        return { 'type': GeojSONTypes.POLYGON.value,
+            'coordinates': _polygon_coordinates(geometry, precision) }
+    if isinstance(geometry, MULTIPOLYGON_TYPES):
+        return { 'type': GeojSONTypes.MULTIPOLYGON.value,
+            'coordinates': _multipolygon_coordinates(geometry, precision) }
+    if isinstance(geometry, Arc2D):
+        return _arc_to_dict(geometry, divisions, precision, tolerance)
+    if isinstance(geometry, (list, tuple)):
+        items = [_geometry_to_dict(_, precision, divisions, tolerance)
+            for _ in geometry]
+        types = set(_.get('type') for _ in items)
+        if len(types) == 1:
+            tp = types.pop()
+            if tp in MULTI_TYPES:
+                return { 'type': MULTI_TYPES[tp],
+                    'coordinates': [_.get('coordinates') for _ in items] }
+        return { 'type': GeojSONTypes.GEOMETRYCOLLECTION.value,
+            'geometries': items }
+    raise TypeError(f'{type(geometry).__name__} can not be ' +
+        'converted to GEOJSON.')
+
+def _feature_to_dict(geometry,
+    properties: Optional[dict]=None,
+    id: Optional[Union[str, int]]=None,
+    precision: Optional[int]=None) -> dict:
+    '''GEOJSON Feature dictionary from a Ladybug geometry and properties.'''
+    out = { 'type': GeojSONTypes.FEATURE.value }
+    if id is not None:
+        out['id'] = id
+    out['geometry'] = _geometry_to_dict(geometry, precision) \
+        if geometry is not None else None
+    out['properties'] = properties
+    return out
+
+def _serialize(out: dict,
+    target: List[GeojSONTypes],
     validation: Optional[bool]=False) -> str:
+    '''Dump the GEOJSON dictionary and validate it if required.
+        If validation is active and there is an error it returns the error
+    '''
+    json_string = json.dumps(out)
+
+    if validation:
+        validator = _Validator(json=json_string,
+            target=target)
+        if validator.error:
+            return validator.error
+
+    return json_string
+
+'''____________2D GEOMETRY TRANSLATORS____________'''
+
+def from_point2d(point: Union[Point2D, List[Point2D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON Point or MultiPoint string from Ladybug Point2D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Point2D > Point
+    - List[Point2D] > MultiPoint
+
+    Args:
+    - point: ladybug Point2D or list of Point2D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(point, precision),
+        target=[GeojSONTypes.POINT, GeojSONTypes.MULTIPOINT],
+        validation=validation)
+
+def from_linesegment2d(line: Union[LineSegment2D, List[LineSegment2D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON LineString or MultiLineString string from Ladybug LineSegment2D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - LineSegment2D > LineString
+    - List[LineSegment2D] > MultiLineString
+
+    Args:
+    - line: ladybug LineSegment2D or list of LineSegment2D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(line, precision),
+        target=[GeojSONTypes.LINESTRING, GeojSONTypes.MULTILINESTRING],
+        validation=validation)
+
+def from_polyline2d(polyline: Union[Polyline2D, List[Polyline2D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON LineString or MultiLineString string from Ladybug Polyline2D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Polyline2D > LineString
+    - List[Polyline2D] > MultiLineString
+
+    Args:
+    - polyline: ladybug Polyline2D or list of Polyline2D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(polyline, precision),
+        target=[GeojSONTypes.LINESTRING, GeojSONTypes.MULTILINESTRING],
+        validation=validation)
+
+def from_polygon2d(polygon: Union[Polygon2D, List[Polygon2D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON Polygon or MultiPolygon string from Ladybug Polygon2D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Polygon2D > Polygon
+    - List[Polygon2D] > MultiPolygon
+
+    Args:
+    - polygon: ladybug Polygon2D or list of Polygon2D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(polygon, precision),
+        target=[GeojSONTypes.POLYGON, GeojSONTypes.MULTIPOLYGON],
+        validation=validation)
+
+def from_mesh2d(mesh: Mesh2D,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON MultiPolygon string from Ladybug Mesh2D.
+        Each face of the mesh is a polygon.
+        If validation is active and there is an error it returns the error
+
+    Args:
+    - mesh: ladybug Mesh2D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(mesh, precision),
+        target=[GeojSONTypes.MULTIPOLYGON],
+        validation=validation)
+
+def from_arc_2d(arc: Arc2D, 
+    divisions: Optional[int]=20,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None,
+    tolerance: Optional[float]=None) -> str:
     '''GEOJSON Polygon or LineString string from Ladybug Arc2D.
         If validation is active and there is an error it returns the error
     Mapping is
@@ -25,31 +304,207 @@ def from_arc_2d(arc: Arc2D,
     - arc: ladybug Arc2D
     - divisions: number of divisions to use with polyline
     - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    - tolerance: max distance between the arc and the polyline chords.
+            If it is set the divisions are computed from the arc radius.
     '''
-    poly = arc.to_polyline(divisions)
-    vertices = [pt.to_array() for pt in poly.vertices]
-    
-    out = {}
-    if arc.is_circle:
-        # append the first vertices
-        vertices.append(vertices[0])
-
-        out = {
-            "type": "Polygon", 
-            "coordinates": [vertices]
-        }
-    else:
-        out = {
-            "type": "LineString", 
-            "coordinates": vertices
-        }
-    json_string = json.dumps(out)
+    return _serialize(_arc_to_dict(arc, divisions, precision, tolerance),
+        target=[GeojSONTypes.LINESTRING, GeojSONTypes.POLYGON],
+        validation=validation)
 
-    if validation:
-        validator = _Validator(json=json_string,
-            target=[GeojSONTypes.LINESTRING, 
-            GeojSONTypes.POLYGON])
-        if validator.error:
-            return validator.error
+'''____________3D GEOMETRY TRANSLATORS____________'''
+
+def from_point3d(point: Union[Point3D, List[Point3D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON Point or MultiPoint string from Ladybug Point3D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Point3D > Point
+    - List[Point3D] > MultiPoint
+
+    Args:
+    - point: ladybug Point3D or list of Point3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(point, precision),
+        target=[GeojSONTypes.POINT, GeojSONTypes.MULTIPOINT],
+        validation=validation)
+
+def from_linesegment3d(line: Union[LineSegment3D, List[LineSegment3D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON LineString or MultiLineString string from Ladybug LineSegment3D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - LineSegment3D > LineString
+    - List[LineSegment3D] > MultiLineString
+
+    Args:
+    - line: ladybug LineSegment3D or list of LineSegment3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(line, precision),
+        target=[GeojSONTypes.LINESTRING, GeojSONTypes.MULTILINESTRING],
+        validation=validation)
+
+def from_polyline3d(polyline: Union[Polyline3D, LineSegment3D,
+    List[Polyline3D], List[LineSegment3D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON LineString or MultiLineString string from Ladybug Polyline3D.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Polyline3D or LineSegment3D > LineString
+    - List[Polyline3D] or List[LineSegment3D] > MultiLineString
+
+    Args:
+    - polyline: ladybug Polyline3D or list of Polyline3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(polyline, precision),
+        target=[GeojSONTypes.LINESTRING, GeojSONTypes.MULTILINESTRING],
+        validation=validation)
+
+def from_face3d(face: Union[Face3D, List[Face3D]],
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON Polygon or MultiPolygon string from Ladybug Face3D.
+        Holes of the face are written as interior rings.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Face3D > Polygon
+    - List[Face3D] > MultiPolygon
+
+    Args:
+    - face: ladybug Face3D or list of Face3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(face, precision),
+        target=[GeojSONTypes.POLYGON, GeojSONTypes.MULTIPOLYGON],
+        validation=validation)
+
+def from_polyface3d(polyface: Polyface3D,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON MultiPolygon string from Ladybug Polyface3D.
+        Each face of the polyface is a polygon.
+        If validation is active and there is an error it returns the error
+
+    Args:
+    - polyface: ladybug Polyface3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(polyface, precision),
+        target=[GeojSONTypes.MULTIPOLYGON],
+        validation=validation)
+
+def from_mesh3d(mesh: Mesh3D,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None) -> str:
+    '''GEOJSON MultiPolygon string from Ladybug Mesh3D.
+        Each face of the mesh is a polygon.
+        If validation is active and there is an error it returns the error
+
+    Args:
+    - mesh: ladybug Mesh3D
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    '''
+    return _serialize(_geometry_to_dict(mesh, precision),
+        target=[GeojSONTypes.MULTIPOLYGON],
+        validation=validation)
+
+'''____________COLLECTION TRANSLATORS____________'''
+
+def from_geometries(geometries: List,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None,
+    divisions: Optional[int]=20,
+    tolerance: Optional[float]=None) -> str:
+    '''GEOJSON GeometryCollection string from a list of Ladybug geometries.
+        The collection is validated and serialized only once.
+        If validation is active and there is an error it returns the error
+    Mapping is
+    - Point2D, Point3D > Point
+    - LineSegment2D, LineSegment3D, Polyline2D, Polyline3D > LineString
+    - Polygon2D, Face3D > Polygon
+    - Polyface3D, Mesh2D, Mesh3D > MultiPolygon
+    - Closed Arc2D > Polygon
+    - Open Arc2D > LineString
+    - List of geometries > Multi geometry or GeometryCollection
+
+    Args:
+    - geometries: list of ladybug geometries
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    - divisions: number of divisions to use with arcs
+    - tolerance: max distance between arcs and their polyline chords.
+            If it is set the divisions are computed from the arc radius.
+    '''
+    out = {
+        'type': GeojSONTypes.GEOMETRYCOLLECTION.value,
+        'geometries': [_geometry_to_dict(_, precision, divisions, tolerance)
+            for _ in geometries]
+    }
+    return _serialize(out,
+        target=[GeojSONTypes.GEOMETRYCOLLECTION],
+        validation=validation)
+
+def from_features(features: List,
+    properties: Optional[List[dict]]=None,
+    validation: Optional[bool]=False,
+    precision: Optional[int]=None,
+    divisions: Optional[int]=20,
+    tolerance: Optional[float]=None) -> str:
+    '''GEOJSON FeatureCollection string from a list of Ladybug geometries
+        or LadybugFeature. The collection is validated and serialized only once.
+        If validation is active and there is an error it returns the error
+
+    Args:
+    - features: list of ladybug geometries or LadybugFeature
+    - properties: list of property dictionaries. One for each geometry.
+            Properties of LadybugFeature are used if it is None.
+    - validation: optional validation using GEOJSON schema
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    - divisions: number of divisions to use with arcs
+    - tolerance: max distance between arcs and their polyline chords.
+            If it is set the divisions are computed from the arc radius.
+    '''
+    if properties is not None and len(properties) != len(features):
+        raise ValueError('properties must have one item for each feature.')
+
+    items = []
+    for i, ft in enumerate(features):
+        prop = properties[i] if properties is not None else None
+        if isinstance(ft, LadybugFeature):
+            if properties is None:
+                prop = ft.properties
+            ft = ft.geometry
+        item = { 'type': GeojSONTypes.FEATURE.value,
+            'geometry': _geometry_to_dict(ft, precision, divisions,
+                tolerance) if ft is not None else None,
+            'properties': prop }
+        items.append(item)
 
-    return json_string
\ No newline at end of file
+    out = {
+        'type': GeojSONTypes.FEATURE_COLLECTION.value,
+        'features': items
+    }
+    return _serialize(out,
+        target=[GeojSONTypes.FEATURE_COLLECTION],
+        validation=validation)
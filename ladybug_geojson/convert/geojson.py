@@ -170,8 +170,9 @@ def from_geojson(json_string: str,
     item = json.dumps(obj)
 
     # skip validation for childs
-    child_options = Options(validation=False)
+    child_options = Options()
     child_options.copy_from_dict(options.settings)
+    child_options.set('validation', False)
 
     # GoeJSON has oneOf so following is Ok
     if sel in [GeojSONTypes.FEATURE]:
@@ -0,0 +1,268 @@
+# coding=utf-8
+'''Incremental conversion of GEOJSON features keyed by id and content hash.
+
+A manifest (SQLite file) keeps, for each feature id, the SHA-1 of the
+canonical JSON of the feature and of the conversion options, and the
+converted LadybugFeature: its Ladybug geometry as WKB and its properties
+as JSON. An update hashes every feature of the new data,
+converts only the added and changed features and removes the features
+that are not in the data anymore, so the conversion time is
+proportional to the changes.
+
+The hashes also include the VERSION of the manifest and the versions of
+ladybug-geojson and ladybug-geometry, so all features are converted
+again after an upgrade.
+
+Usage:
+    with IncrementalConverter('parcels.manifest') as converter:
+        report = converter.update('parcels.geojson')
+        print(report['added'], report['changed'], report['removed'])
+        feature = converter.get('parcel/123')
+'''
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+from .config import Options
+from .wkb import _wkb, _from_wkb, _build
+from ..instrumentation import _stage
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS manifest (
+    fid PRIMARY KEY,
+    hash TEXT NOT NULL,
+    geometry BLOB,
+    properties TEXT
+);
+'''
+
+# version of the manifest. Change it when the stored features change.
+# Manifests of other versions are emptied when they are opened
+VERSION = 2
+
+# prefix of the keys of features without id
+HASH_KEY_PREFIX = 'sha1:'
+
+# packages that change the converted features
+_PACKAGES = ('ladybug-geojson', 'ladybug-geometry')
+
+def _canonical(value) -> bytes:
+    '''Canonical JSON: sorted keys, no spaces, UTF-8.'''
+    return json.dumps(value, sort_keys=True, separators=(',', ':'),
+        ensure_ascii=False).encode('utf-8')
+
+def _package_version(name: str) -> Optional[str]:
+    '''Version of an installed package or None.'''
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        try:
+            # backport for Python 3.7
+            from importlib_metadata import version, PackageNotFoundError
+        except ImportError:
+            version = None
+    if version is not None:
+        try:
+            return version(name)
+        except PackageNotFoundError:
+            return None
+
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution(name).version
+    except Exception:
+        return None
+
+def _versions() -> dict:
+    '''Versions of the manifest and of the installed packages.
+    Packages that are not installed have no version.'''
+    res = { 'manifest': VERSION }
+    for name in _PACKAGES:
+        res[name] = _package_version(name)
+    return res
+
+class IncrementalConverter:
+    '''Convert GEOJSON features into LadybugFeatures incrementally.
+    The manifest file is created if it does not exist.
+
+    Features are keyed by their id. Features without id are keyed by
+    their content hash, so a change appears as a removed and an added
+    feature. If several features have the same id the last one is kept.
+
+    Args:
+    - filepath: path of the manifest file.
+    - options: Options object to use for mapping. A change of the
+            options or of the package versions changes the hash of
+            all features.
+    - id_property: name of the property to use as id. Default is the
+            id member of the feature.
+    '''
+    __slots__ = ('_connection', '_options', '_options_key',
+        '_id_property')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        options: Optional[Options]=Options.options_factory(),
+        id_property: Optional[str]=None):
+        # a copy, so later changes of the options can not differ
+        # from the options of the hashes
+        child_options = Options()
+        child_options.copy_from_dict(options.settings)
+        self._options = child_options
+        self._options_key = _canonical({ 'options': options.settings,
+            'versions': _versions() })
+        self._id_property = id_property
+        self._connection = sqlite3.connect(str(filepath))
+        try:
+            con = self._connection
+            if con.execute('PRAGMA user_version').fetchone()[0] != VERSION:
+                # the features of other versions are converted again
+                with con:
+                    con.execute('DROP TABLE IF EXISTS manifest')
+                    con.execute(f'PRAGMA user_version = {VERSION}')
+            con.executescript(_SCHEMA)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT count(*) FROM manifest').fetchone()[0]
+
+    def __iter__(self) -> Iterator:
+        return self.features()
+
+    def _hash(self,
+        feature: dict) -> str:
+        sha = hashlib.sha1(self._options_key)
+        sha.update(_canonical(feature))
+        return sha.hexdigest()
+
+    def _convert(self,
+        feature: dict) -> tuple:
+        '''WKB of the Ladybug geometry and JSON of the properties.'''
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+        ft = LadybugFeature(json.dumps(feature), self._options)
+        geo = ft.geometry
+        return (bytes(_wkb(geo)) if geo is not None else None,
+            json.dumps(ft.properties))
+
+    def _feature(self,
+        blob: Optional[bytes],
+        properties: str):
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+        geo = None
+        if blob is not None:
+            tp, coordinates, _ = _from_wkb(blob)
+            geo = _build(tp, coordinates, self._options)
+        return LadybugFeature.from_geometry(geo, json.loads(properties),
+            self._options)
+
+    def update(self,
+        source: Union[str, Path, Iterable[dict]],
+        batch_size: int=10000) -> dict:
+        ''' Update the manifest with the current features.
+        Only added and changed features are converted. The update is a
+        single transaction, so the manifest is not changed if it fails.
+
+        Args:
+        - source: path of a FeatureCollection file or GeoJSON Feature
+                dictionaries. The file is read one feature at a time.
+        - batch_size: number of converted features for each insert.
+
+        Return:
+            a dictionary with the ids of the added, changed and removed
+            features, the number of unchanged features and the seconds
+        '''
+        # imported here to avoid a circular import
+        from .feature_index import _feature_id
+        from .feature_store import _read_file
+
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than 0.')
+        start = time.perf_counter()
+        features = _read_file(source) if isinstance(source, (str, Path)) \
+            else iter(source)
+        con = self._connection
+        with _stage('incremental.manifest'):
+            known = dict(con.execute('SELECT fid, hash FROM manifest'))
+
+        added, changed, seen = [], [], set()
+        rows = []
+
+        def _flush():
+            con.executemany('INSERT OR REPLACE INTO manifest '
+                'VALUES (?, ?, ?, ?)', rows)
+            rows.clear()
+
+        # a single transaction: if a feature can not be read or converted
+        # the manifest is not changed
+        with con:
+            for ft in features:
+                with _stage('incremental.hash'):
+                    digest = self._hash(ft)
+                fid = _feature_id(ft, self._id_property)
+                if fid is None:
+                    fid = HASH_KEY_PREFIX + digest
+                seen.add(fid)
+                previous = known.get(fid)
+                if previous == digest:
+                    continue
+                (changed if previous is not None else added).append(fid)
+                known[fid] = digest
+                with _stage('incremental.convert'):
+                    rows.append((fid, digest, *self._convert(ft)))
+                if len(rows) >= batch_size:
+                    _flush()
+            if rows:
+                _flush()
+
+            removed = [_ for _ in known if _ not in seen]
+            con.executemany('DELETE FROM manifest WHERE fid = ?',
+                ((_,) for _ in removed))
+
+        # repeated ids can be added and changed in the same update
+        added_ids = set(added)
+        changed = list(dict.fromkeys(_ for _ in changed
+            if _ not in added_ids))
+        return {
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'unchanged': len(seen) - len(added) - len(changed),
+            'seconds': time.perf_counter() - start
+        }
+
+    def ids(self) -> List:
+        ''' Ids of the features in the manifest '''
+        return [_[0] for _ in self._connection.execute(
+            'SELECT fid FROM manifest ORDER BY rowid')]
+
+    def features(self) -> Iterator:
+        ''' Yield the LadybugFeatures of the manifest '''
+        for row in self._connection.execute(
+            'SELECT geometry, properties FROM manifest ORDER BY rowid'):
+            yield self._feature(*row)
+
+    def get(self,
+        id: Union[str, int]):
+        ''' LadybugFeature with an id or None '''
+        row = self._connection.execute('SELECT geometry, properties '
+            'FROM manifest WHERE fid = ?', (id,)).fetchone()
+        return None if row is None else self._feature(*row)
+
+    def close(self):
+        ''' Close the manifest '''
+        con = getattr(self, '_connection', None)
+        if con is not None:
+            con.close()
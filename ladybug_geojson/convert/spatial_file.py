@@ -0,0 +1,424 @@
+# coding=utf-8
+'''Binary feature file with a packed Hilbert R-tree.
+
+The file has a header, a static packed Hilbert R-tree of the feature
+bounding boxes and the size prefixed features sorted by the Hilbert value
+of their bounding box centers. A bbox query walks the tree from the root
+and seeks directly to the matching features, so only the visited nodes
+and the matching features are read from the file.
+
+It is a format of this package and other tools can not read it: a
+feature is the WKB of its Ladybug geometry followed by the JSON of its
+properties.
+
+File layout (little endian):
+- header: magic (8 bytes), version (uint32), node size (uint16), 2 bytes of
+    padding, number of features (uint64) and extent west, south, east,
+    north (4 float64).
+- index: nodes of the R-tree from the root to the leaves. A node is
+    west, south, east, north (4 float64) and an offset (uint64): the
+    first child node of the inner nodes and the feature offset from the
+    start of the features of the leaves.
+- features: size of the WKB and the JSON (uint32), size of the WKB
+    (uint32), WKB of the geometry and JSON of the properties.
+
+The writer streams the features into a temporary file and writes the
+index and the sorted features when it is closed.
+
+Usage:
+    with SpatialFileWriter('buildings.lbsf') as writer:
+        for feature in features:
+            writer.write_feature(feature)
+
+    with SpatialFile('buildings.lbsf') as sf:
+        for feature in sf.query((11.0, 46.0, 11.1, 46.1)):
+            ...
+'''
+import json
+import math
+import mmap
+import shutil
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from .config import Options
+from .wkb import _wkb, _from_wkb, _build
+
+MAGIC = b'LBGJSPF\x00'
+VERSION = 2
+NODE_SIZE = 16
+
+_HEADER = struct.Struct('<8sIH2xQ4d')
+_NODE = struct.Struct('<4dQ')
+_FEATURE = struct.Struct('<II')
+
+_HILBERT_MAX = (1 << 16) - 1
+# bounding box of features without geometry. It intersects nothing
+_EMPTY = (math.inf, math.inf, -math.inf, -math.inf)
+
+'''____________PACKED HILBERT R-TREE____________'''
+
+def _hilbert(x: int,
+    y: int) -> int:
+    '''Hilbert curve value of a position on a 16 bit grid.'''
+    a = x ^ y
+    b = 0xFFFF ^ a
+    c = 0xFFFF ^ (x | y)
+    d = x & (y ^ 0xFFFF)
+
+    A = a | (b >> 1)
+    B = (a >> 1) ^ a
+    C = ((c >> 1) ^ (b & (d >> 1))) ^ c
+    D = ((a & (c >> 1)) ^ (d >> 1)) ^ d
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 2)) ^ (b & (b >> 2))
+    B = (a & (b >> 2)) ^ (b & ((a ^ b) >> 2))
+    C ^= (a & (c >> 2)) ^ (b & (d >> 2))
+    D ^= (b & (c >> 2)) ^ ((a ^ b) & (d >> 2))
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 4)) ^ (b & (b >> 4))
+    B = (a & (b >> 4)) ^ (b & ((a ^ b) >> 4))
+    C ^= (a & (c >> 4)) ^ (b & (d >> 4))
+    D ^= (b & (c >> 4)) ^ ((a ^ b) & (d >> 4))
+
+    a, b, c, d = A, B, C, D
+    C ^= (a & (c >> 8)) ^ (b & (d >> 8))
+    D ^= (b & (c >> 8)) ^ ((a ^ b) & (d >> 8))
+
+    a = C ^ (C >> 1)
+    b = D ^ (D >> 1)
+    i0 = x ^ y
+    i1 = b | (0xFFFF ^ (i0 | a))
+
+    def _spread(v):
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        return (v | (v << 1)) & 0x55555555
+
+    return (_spread(i1) << 1) | _spread(i0)
+
+def _level_bounds(count: int,
+    node_size: int) -> List[Tuple[int, int]]:
+    '''Start and end node of each level of the tree, from the leaves
+    to the root. The root is the first node.'''
+    n = count
+    sizes = [n]
+    while n > 1:
+        n = math.ceil(n / node_size)
+        sizes.append(n)
+    end = sum(sizes)
+    bounds = []
+    for size in sizes:
+        bounds.append((end - size, end))
+        end -= size
+    return bounds
+
+def _build_tree(boxes: List[tuple],
+    offsets: List[int],
+    node_size: int) -> List[tuple]:
+    '''Nodes of a packed R-tree of sorted leaf boxes.'''
+    if not boxes:
+        return []
+    bounds = _level_bounds(len(boxes), node_size)
+    nodes = [None] * bounds[0][1]
+    start, _ = bounds[0]
+    for i, (box, offset) in enumerate(zip(boxes, offsets)):
+        nodes[start + i] = (*box, offset)
+
+    for (child_start, child_end), (start, _) in zip(bounds, bounds[1:]):
+        for n, first in enumerate(range(child_start, child_end, node_size)):
+            children = nodes[first:min(first + node_size, child_end)]
+            nodes[start + n] = (min(_[0] for _ in children),
+                min(_[1] for _ in children), max(_[2] for _ in children),
+                max(_[3] for _ in children), first)
+    return nodes
+
+'''____________WRITER____________'''
+
+class SpatialFileWriter:
+    '''Write a spatial file feature by feature.
+    Features are streamed into a temporary file next to the output, so
+    only their bounding boxes are kept in memory. The index and the
+    sorted features are written when the writer is closed.
+
+    Usage:
+        with SpatialFileWriter('out.lbsf') as writer:
+            for face in faces:
+                writer.write(face, {'name': 'face'})
+
+    Args:
+    - filepath: path of the output file.
+    - node_size: number of children of the nodes of the R-tree.
+    Properties:
+        * count
+        * closed
+    '''
+    __slots__ = ('_filepath', '_node_size', '_temp', '_boxes',
+        '_offsets', '_count', '_closed')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        node_size: int=NODE_SIZE):
+        if node_size < 2:
+            raise ValueError('node_size must be greater than 1.')
+        self._filepath = Path(filepath)
+        self._node_size = node_size
+        self._temp = tempfile.TemporaryFile(dir=self._filepath.parent)
+        self._boxes = array('d')
+        self._offsets = array('Q', [0])
+        self._count = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def count(self):
+        ''' Number of features written '''
+        return self._count
+
+    @property
+    def closed(self):
+        ''' True if the file is closed '''
+        return self._closed
+
+    def write(self,
+        geometry,
+        properties: Optional[dict]=None):
+        ''' Write a Ladybug geometry as a feature.
+
+        Args:
+        - geometry: Ladybug geometry, list of Ladybug geometries or None.
+        - properties: dictionary with the feature properties.
+        '''
+        # imported here to avoid a circular import
+        from ..slippy.index import _ladybug_bbox
+
+        if self._closed:
+            raise ValueError('Spatial file is closed.')
+        blob = bytes(_wkb(geometry)) if geometry is not None else b''
+        props = json.dumps(properties).encode('utf-8')
+        size = len(blob) + len(props)
+        self._temp.write(_FEATURE.pack(size, len(blob)))
+        self._temp.write(blob)
+        self._temp.write(props)
+        self._offsets.append(self._offsets[-1] + _FEATURE.size + size)
+        self._boxes.extend(_ladybug_bbox(geometry) or _EMPTY)
+        self._count += 1
+
+    def write_feature(self,
+        feature):
+        ''' Write a LadybugFeature.
+
+        Args:
+        - feature: LadybugFeature to write.
+        '''
+        self.write(feature.geometry, feature.properties)
+
+    def _sorted(self) -> Tuple[List[int], tuple]:
+        '''Features sorted by the Hilbert value of their box centers
+        and the extent of all boxes.'''
+        boxes = [tuple(self._boxes[i:i + 4])
+            for i in range(0, len(self._boxes), 4)]
+        valid = [_ for _ in boxes if _[0] <= _[2]]
+        if not valid:
+            return list(range(len(boxes))), (0.0, 0.0, 0.0, 0.0)
+        extent = (min(_[0] for _ in valid), min(_[1] for _ in valid),
+            max(_[2] for _ in valid), max(_[3] for _ in valid))
+        width = extent[2] - extent[0]
+        height = extent[3] - extent[1]
+
+        def _value(i):
+            west, south, east, north = boxes[i]
+            if west > east:
+                return 0
+            x = int(_HILBERT_MAX * ((west + east) / 2 - extent[0]) / width) \
+                if width else 0
+            y = int(_HILBERT_MAX * ((south + north) / 2 - extent[1]) /
+                height) if height else 0
+            return _hilbert(x, y)
+
+        return sorted(range(len(boxes)), key=_value), extent
+
+    def close(self):
+        ''' Write the index and the features and close the file '''
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            order, extent = self._sorted()
+            boxes, offsets, position = [], [], 0
+            for i in order:
+                boxes.append(tuple(self._boxes[i * 4:i * 4 + 4]))
+                offsets.append(position)
+                position += self._offsets[i + 1] - self._offsets[i]
+            nodes = _build_tree(boxes, offsets, self._node_size)
+
+            with open(self._filepath, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, self._node_size,
+                    self._count, *extent))
+                for node in nodes:
+                    f.write(_NODE.pack(*node))
+                if not self._count:
+                    return
+                self._temp.flush()
+                if order == sorted(order):
+                    self._temp.seek(0)
+                    shutil.copyfileobj(self._temp, f)
+                    return
+                with mmap.mmap(self._temp.fileno(), 0,
+                    access=mmap.ACCESS_READ) as data:
+                    for i in order:
+                        f.write(data[self._offsets[i]:self._offsets[i + 1]])
+        finally:
+            self._temp.close()
+
+def write_spatial_file(features: List,
+    filepath: Union[str, Path],
+    node_size: int=NODE_SIZE) -> Path:
+    ''' Write LadybugFeatures into a spatial file.
+
+    Args:
+    - features: list of LadybugFeature.
+    - filepath: path of the spatial file.
+    - node_size: number of children of the nodes of the R-tree.
+
+    Return:
+        the path of the spatial file
+    '''
+    with SpatialFileWriter(filepath, node_size) as writer:
+        for ft in features:
+            writer.write_feature(ft)
+    return Path(filepath)
+
+'''____________READER____________'''
+
+class SpatialFile:
+    '''LadybugFeatures of a spatial file. The file is mapped in memory
+    and features are created when they are requested.
+
+    Args:
+    - filepath: path of the spatial file.
+    - options: Options object to use for the LadybugFeatures.
+    Properties:
+        * extent
+    '''
+    __slots__ = ('_file', '_data', '_count', '_node_size',
+        '_extent', '_levels', '_features', '_options')
+
+    def __init__(self,
+        filepath: Union[str, Path],
+        options: Optional[Options]=Options.options_factory()):
+        self._options = options
+        self._file = open(filepath, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0,
+                access=mmap.ACCESS_READ)
+            magic, version, node_size, count, *extent = \
+                _HEADER.unpack_from(self._data, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{filepath} is not a valid spatial file.')
+            self._count = count
+            self._node_size = node_size
+            self._extent = tuple(extent)
+            self._levels = _level_bounds(count, node_size) if count else []
+            nodes = self._levels[0][1] if count else 0
+            self._features = _HEADER.size + nodes * _NODE.size
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self) -> Iterator:
+        ''' Features in the order of the file '''
+        pos = self._features
+        for _ in range(self._count):
+            size, _ = _FEATURE.unpack_from(self._data, pos)
+            yield self._feature(pos - self._features)
+            pos += _FEATURE.size + size
+
+    @property
+    def extent(self) -> tuple:
+        ''' Bounding box (west, south, east, north) of all features '''
+        return self._extent
+
+    def _feature(self,
+        offset: int):
+        # imported here to load ladybug_geometry only when it is used
+        from ..ladybug_feature import LadybugFeature
+
+        pos = self._features + offset
+        size, geometry_size = _FEATURE.unpack_from(self._data, pos)
+        start = pos + _FEATURE.size
+        geo = None
+        if geometry_size:
+            tp, coordinates, _ = _from_wkb(self._data, start)
+            geo = _build(tp, coordinates, self._options)
+        properties = json.loads(self._data[start + geometry_size:
+            start + size])
+        return LadybugFeature.from_geometry(geo, properties, self._options)
+
+    def search(self,
+        bbox: tuple) -> List[int]:
+        ''' Offsets of the features that intersect a bounding box.
+        Only the nodes of the R-tree that intersect it are read.
+
+        Args:
+        - bbox: tuple with (west, south, east, north).
+        '''
+        if not self._count:
+            return []
+        west, south, east, north = bbox
+        leaves = self._levels[0][0]
+        res = []
+        # node index and level from the root
+        queue = [(0, len(self._levels) - 1)]
+        while queue:
+            first, level = queue.pop()
+            end = min(first + self._node_size, self._levels[level][1])
+            for n in range(first, end):
+                w, s, e, no, offset = _NODE.unpack_from(self._data,
+                    _HEADER.size + n * _NODE.size)
+                if w > east or e < west or s > north or no < south:
+                    continue
+                if n >= leaves:
+                    res.append(offset)
+                else:
+                    queue.append((offset, level - 1))
+        res.sort()
+        return res
+
+    def query(self,
+        bbox: tuple) -> Iterator:
+        ''' Yield the LadybugFeatures that intersect a bounding box in
+        the order of the file. Features are converted when they are
+        iterated.
+
+        Args:
+        - bbox: tuple with (west, south, east, north).
+        '''
+        for offset in self.search(bbox):
+            yield self._feature(offset)
+
+    def close(self):
+        ''' Close the file '''
+        for attr in ('_data', '_file'):
+            obj = getattr(self, attr, None)
+            if obj is not None:
+                obj.close()
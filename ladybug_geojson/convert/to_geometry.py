@@ -1,16 +1,19 @@
 # coding=utf-8
 '''Functions to create Ladybug geometries from GEOJSON geometry strings.'''
-import json
 from .._validator import GeojSONTypes
 from .._geometry_helper import ( _add_z_coordinate, 
     _get_line_2d,
     _get_line_3d, 
     _get_line_or_polyline_2d,
     _get_line_or_polyline_3d,
-    _to_polygon_2d, _to_face )
+    _to_polygon_2d, _to_face,
+    _simplify_line, _simplify_polygons )
 from .._geojson_helper import ( get_data_from_geojson_type,
     RFC7946)
 from .config import Options
+from ..instrumentation import ( _count_geometry,
+    _instrument,
+    _stage )
 from typing import List, Optional, Union
 
 try:
@@ -30,8 +33,118 @@ except ImportError as e:
         f'Failed to import ladybug_geometry.\n{e}')
 
 
+'''____________COORDINATE BUILDERS____________'''
+
+def _points_2d(arr: list,
+    options: Options) -> List[Point2D]:
+    return [Point2D.from_array(_) for _ in arr]
+
+def _points_3d(arr: list,
+    options: Options) -> List[Point3D]:
+    z = options.get('z')
+    return [Point3D.from_array(_add_z_coordinate(_, z)) for _ in arr]
+
+def _polylines_2d(arr: list,
+    options: Options) -> List[Union[Polyline2D, LineSegment2D]]:
+    interpolated = options.get('interpolated')
+    simplify = options.get('simplify')
+    return [_get_line_or_polyline_2d(_simplify_line(_, simplify),
+        interpolated=interpolated) for _ in arr]
+
+def _polylines_3d(arr: list,
+    options: Options) -> List[Union[Polyline3D, LineSegment3D]]:
+    interpolated = options.get('interpolated')
+    simplify = options.get('simplify')
+    z = options.get('z')
+    return [_get_line_or_polyline_3d(_simplify_line(_, simplify),
+        interpolated=interpolated, z=z) for _ in arr]
+
+def _polygons_2d(arr: list,
+    options: Options) -> List[Polygon2D]:
+    arr = _simplify_polygons(arr, options.get('simplify'))
+    return [_to_polygon_2d(_) for _ in arr]
+
+def _faces_3d(arr: list,
+    options: Options) -> List[Face3D]:
+    arr = _simplify_polygons(arr, options.get('simplify'))
+    z = options.get('z')
+    with _stage('Face3D'):
+        return [_to_face(_, z) for _ in arr]
+
+def _merge_faces(faces: List[Face3D],
+    options: Options) -> Union[Polyface3D, List[Face3D]]:
+    # try merge
+    if options.get('merge_faces'):
+        try:
+            with _stage('Polyface3D.from_faces'):
+                return Polyface3D.from_faces(faces,
+                    options.get('tolerance'))
+        except:
+            pass
+    return faces
+
+def _merged_faces_3d(arr: list,
+    options: Options) -> List[Union[Face3D, Polyface3D]]:
+    faces = _merge_faces(_faces_3d(arr, options), options)
+    return [faces] if isinstance(faces, Polyface3D) else faces
+
+def _polygons_or_faces_2d(arr: list,
+    options: Options) -> List[Union[Polygon2D, Face3D]]:
+    if options.get('fill_polygon'):
+        return _faces_3d(arr, options)
+    return _polygons_2d(arr, options)
+
+def _polygons_or_merged_faces_2d(arr: list,
+    options: Options) -> List[Union[Polygon2D, Face3D, Polyface3D]]:
+    if options.get('fill_polygon'):
+        return _merged_faces_3d(arr, options)
+    return _polygons_2d(arr, options)
+
+# GeoJSON type > (builder, single). Builders get a list of coordinates
+# and return a list of geometries. Single types are wrapped in a list.
+_COLLECTION_2D = {
+    GeojSONTypes.POINT: (_points_2d, True),
+    GeojSONTypes.MULTIPOINT: (_points_2d, False),
+    GeojSONTypes.LINESTRING: (_polylines_2d, True),
+    GeojSONTypes.MULTILINESTRING: (_polylines_2d, False),
+    GeojSONTypes.POLYGON: (_polygons_or_faces_2d, True),
+    GeojSONTypes.MULTIPOLYGON: (_polygons_or_merged_faces_2d, False)
+}
+
+_COLLECTION_3D = {
+    GeojSONTypes.POINT: (_points_3d, True),
+    GeojSONTypes.MULTIPOINT: (_points_3d, False),
+    GeojSONTypes.LINESTRING: (_polylines_3d, True),
+    GeojSONTypes.MULTILINESTRING: (_polylines_3d, False),
+    GeojSONTypes.POLYGON: (_faces_3d, True),
+    GeojSONTypes.MULTIPOLYGON: (_merged_faces_3d, False)
+}
+
+def _build_collection(geometries: List[dict],
+    options: Options,
+    table: dict) -> list:
+    '''Build the geometries of decoded GeometryCollection members.
+    Members with other types (nested collections too) are skipped.'''
+    res = []
+    for item in geometries:
+        try:
+            tp = GeojSONTypes(item.get('type'))
+        except ValueError:
+            continue
+        entry = table.get(tp)
+        if not entry:
+            continue
+        builder, single = entry
+        arr = item.get(RFC7946.COORDINATES.value)
+        if not arr:
+            continue
+        _count_geometry(tp, arr)
+        res.extend(builder([arr] if single else arr, options))
+    return res
+
 '''____________COLLECTION GEOMETRY TRANSLATORS____________'''
 
+@_instrument('to_collection_2d')
 def to_collection_2d(json_string: str, 
     options: Optional[Options]=Options.options_factory()):
     '''Ladybug Geometry 2D from GEOJSON GeometryCollection.
@@ -42,6 +155,7 @@ def to_collection_2d(json_string: str,
     - MULTILINESTRING > List[LineSegment2D] or List[Polyline2D]
     - POLYGON > Polygon2D or Face3D (on 2D space)
     - MULTIPOLYGON > List[Polygon2D] or List[Face3D]
+    Counts by GeoJSON type are recorded by the instrumentation.
     
     Args:
     - json_string: GEOJSON geometry string to translate.
@@ -50,7 +164,6 @@ def to_collection_2d(json_string: str,
     # preparation
     mapping = [GeojSONTypes.GEOMETRYCOLLECTION]
     validation = options.get('validation')
-    fill_polygon = options.get('fill_polygon')
 
     arr, sel, err = get_data_from_geojson_type(json_string, 
         keyword=RFC7946.GEOMETRY_COLLECTION,
@@ -58,41 +171,10 @@ def to_collection_2d(json_string: str,
         validation=validation)
     if not arr:
         return err
-    
-    res = []
-
-    # skip validation for childs
-    child_options = Options(validation=False)
-    child_options.copy_from_dict(options.settings)
-
-    for item in arr:
-        if item.get('type') == GeojSONTypes.POINT.value:
-            item = json.dumps(item)
-            res.append(to_point2d(item, child_options))
-        elif item.get('type') == GeojSONTypes.MULTIPOINT.value:
-            item = json.dumps(item)
-            res.extend(to_point2d(item, child_options))
-        elif item.get('type') == GeojSONTypes.LINESTRING.value:
-            item = json.dumps(item)
-            res.append(to_polyline2d(item, child_options))
-        elif item.get('type') == GeojSONTypes.MULTILINESTRING.value:
-            item = json.dumps(item)
-            res.extend(to_polyline2d(item, child_options))
-        elif item.get('type') == GeojSONTypes.POLYGON.value:
-            item = json.dumps(item)
-            if fill_polygon:
-                res.append(to_face3d(item, child_options))
-            else:
-                res.append(to_polygon2d(item, options))
-        elif item.get('type') == GeojSONTypes.MULTIPOLYGON.value:
-            item = json.dumps(item)
-            if fill_polygon:
-                res.extend(to_face3d(item, child_options))
-            else:
-                res.extend(to_polygon2d(item, child_options))
 
-    return res
+    return _build_collection(arr, options, _COLLECTION_2D)
 
+@_instrument('to_collection_3d')
 def to_collection_3d(json_string: str, 
     options: Optional[Options]=Options.options_factory()):
     '''Ladybug Geometry 3D from GEOJSON GeometryCollection.
@@ -103,6 +185,7 @@ def to_collection_3d(json_string: str,
     - MULTILINESTRING > List[LineSegment3D] or List[Polyline3D]
     - POLYGON > Face3D
     - MULTIPOLYGON > List[Face3D]
+    Counts by GeoJSON type are recorded by the instrumentation.
     
     Args:
     - json_string: GEOJSON geometry string to translate.
@@ -119,35 +202,11 @@ def to_collection_3d(json_string: str,
     if not arr:
         return err
 
-    # skip validation for childs
-    child_options = Options(validation=False)
-    child_options.copy_from_dict(options.settings)
-    
-    res = []
-    for item in arr:
-        if item.get('type') == GeojSONTypes.POINT.value:
-            item = json.dumps(item)
-            res.append(to_point3d(item, child_options))
-        elif item.get('type') == GeojSONTypes.MULTIPOINT.value:
-            item = json.dumps(item)
-            res.extend(to_point3d(item, child_options))
-        elif item.get('type') == GeojSONTypes.LINESTRING.value:
-            item = json.dumps(item)
-            res.append(to_polyline3d(item, child_options))
-        elif item.get('type') == GeojSONTypes.MULTILINESTRING.value:
-            item = json.dumps(item)
-            res.extend(to_polyline3d(item, child_options))
-        elif item.get('type') == GeojSONTypes.POLYGON.value:
-            item = json.dumps(item)
-            res.append(to_face3d(item, child_options))
-        elif item.get('type') == GeojSONTypes.MULTIPOLYGON.value:
-            item = json.dumps(item)
-            res.extend(to_face3d(item, child_options))
-
-    return res
+    return _build_collection(arr, options, _COLLECTION_3D)
 
 '''____________2D GEOMETRY TRANSLATORS____________'''
 
+@_instrument('to_vector2d')
 def to_vector2d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[Vector2D, List[Vector2D]]:
@@ -174,6 +233,7 @@ def to_vector2d(json_string: str,
         return [Vector2D.from_array(_) for _ in arr]
 
 
+@_instrument('to_point2d')
 def to_point2d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[Point2D, List[Point2D]]:
@@ -200,6 +260,7 @@ def to_point2d(json_string: str,
         return [Point2D.from_array(_) for _ in arr]
 
 
+@_instrument('to_linesegment2d')
 def to_linesegment2d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[LineSegment2D, List[LineSegment2D]]:
@@ -227,6 +288,7 @@ def to_linesegment2d(json_string: str,
         return list(map(_get_line_2d, arr))
 
 
+@_instrument('to_polyline2d')
 def to_polyline2d(json_string: str, 
     options: Optional[Options]=Options.options_factory()) -> \
         Union[Polyline2D, LineSegment2D,
@@ -243,7 +305,6 @@ def to_polyline2d(json_string: str,
     mapping = [GeojSONTypes.LINESTRING,
             GeojSONTypes.MULTILINESTRING]
     validation = options.get('validation')
-    interpolated = options.get('interpolated')
 
     arr, sel, err = get_data_from_geojson_type(json_string,
         keyword=RFC7946.COORDINATES,
@@ -253,13 +314,12 @@ def to_polyline2d(json_string: str,
         return err
 
     if sel == GeojSONTypes.LINESTRING:
-        return _get_line_or_polyline_2d(arr, 
-            interpolated=interpolated)
+        return _polylines_2d([arr], options)[0]
     else:
-        return list(map(lambda _: _get_line_or_polyline_2d(_, 
-            interpolated=interpolated), arr))
+        return _polylines_2d(arr, options)
 
 
+@_instrument('to_polygon2d')
 def to_polygon2d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[Polygon2D, List[Polygon2D]]:
@@ -282,11 +342,12 @@ def to_polygon2d(json_string: str,
         return err
 
     if sel == GeojSONTypes.POLYGON:
-        return _to_polygon_2d(arr)
+        return _polygons_2d([arr], options)[0]
     else:
-        return list(map(_to_polygon_2d, arr))
+        return _polygons_2d(arr, options)
     
 
+@_instrument('to_mesh2d')
 def to_mesh2d(json_string: str,
     options: Optional[Options]=Options.options_factory()) -> \
         Union[Mesh2D, List[Mesh2D]]:
@@ -309,6 +370,7 @@ def to_mesh2d(json_string: str,
 
 '''____________3D GEOMETRY TRANSLATORS____________'''
 
+@_instrument('to_vector3d')
 def to_vector3d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[Vector3D, List[Vector3D]]:
@@ -336,10 +398,11 @@ def to_vector3d(json_string: str,
     else:
         return list(map(lambda _: Vector3D.from_array(
             _add_z_coordinate(_, 
-            z), 
-        arr)))
+            z)), 
+        arr))
 
 
+@_instrument('to_point3d')
 def to_point3d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[Point3D, List[Point3D]]:
@@ -367,10 +430,11 @@ def to_point3d(json_string: str,
     else:
         return list(map(lambda _: Point3D.from_array(
             _add_z_coordinate(_, 
-            z), 
-        arr)))
+            z)), 
+        arr))
 
 
+@_instrument('to_linesegment3d')
 def to_linesegment3d(json_string: str,
         options: Optional[Options]=Options.options_factory()) -> \
         Union[LineSegment3D, List[LineSegment3D]]:
@@ -400,6 +464,7 @@ def to_linesegment3d(json_string: str,
             _get_line_3d(_, z), arr))
 
 
+@_instrument('to_polyline3d')
 def to_polyline3d(json_string: str, 
     options: Optional[Options]=Options.options_factory()) -> \
         Union[Polyline3D, LineSegment3D,
@@ -415,8 +480,6 @@ def to_polyline3d(json_string: str,
     mapping = [GeojSONTypes.LINESTRING, 
             GeojSONTypes.MULTILINESTRING]
     validation = options.get('validation')
-    interpolated = options.get('interpolated')
-    z = options.get('z')
 
     arr, sel, err = get_data_from_geojson_type(json_string,
         keyword=RFC7946.COORDINATES,
@@ -426,17 +489,12 @@ def to_polyline3d(json_string: str,
         return err
 
     if sel == GeojSONTypes.LINESTRING:
-        return _get_line_or_polyline_3d(arr, 
-            interpolated=interpolated, 
-            z=z)
+        return _polylines_3d([arr], options)[0]
     else:
-        return list(map(lambda _ : _get_line_or_polyline_3d(
-            _, interpolated=interpolated, 
-            z=z
-        ), 
-        arr))
+        return _polylines_3d(arr, options)
 
 
+@_instrument('to_face3d')
 def to_face3d(json_string: str,
     options: Optional[Options]=Options.options_factory()) -> \
         Union[Face3D, List[Face3D]]:
@@ -450,9 +508,6 @@ def to_face3d(json_string: str,
     mapping = [GeojSONTypes.POLYGON, 
             GeojSONTypes.MULTIPOLYGON]
     validation = options.get('validation')
-    merge_faces = options.get('merge_faces')
-    tolerance = options.get('tolerance')
-    z = options.get('z')
 
     arr, sel, err = get_data_from_geojson_type(json_string,
         keyword=RFC7946.COORDINATES,
@@ -462,21 +517,12 @@ def to_face3d(json_string: str,
         return err
 
     if sel == GeojSONTypes.POLYGON:
-        return _to_face(arr, z)
+        return _faces_3d([arr], options)[0]
     
-    faces = list(map(lambda _: 
-        _to_face(_, z), 
-        arr))
-
-    # try merge
-    if merge_faces:
-        try:
-            faces = Polyface3D.from_faces(faces, tolerance)
-        except:
-            pass
-    return faces
+    return _merge_faces(_faces_3d(arr, options), options)
     
 
+@_instrument('to_mesh3d')
 def to_mesh3d(json_string: str,
     options: Optional[Options]=Options.options_factory()) -> Mesh2D:
     '''Ladybug Mesh3D from a GEOJSON Polygon or MultiPolygon.
@@ -0,0 +1,500 @@
+# coding=utf-8
+'''Read and write TopoJSON topologies of LadybugFeatures.
+
+The arcs of the topology are decoded once (quantization and delta
+encoding) into a shared list of positions. Lines and rings are assembled
+from the arc references and built into Ladybug geometries with the
+coordinate builders of to_geometry, without creating GeoJSON text.
+The mapping is the same of LadybugFeature.
+
+On export the vertices are quantized and the edges are hashed on the
+quantized vertices. Lines and rings are cut where the lines that share
+an edge change, so a shared edge (like the wall between two buildings)
+is written once and referenced by both polygons.
+
+Usage:
+    features = from_topojson(json_string)
+    parcels = from_topojson(json_string, name='parcels')
+    report = write_topojson(faces, 'parcels.topojson')
+'''
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from .config import Options
+from .._validator import GeojSONTypes
+from ..instrumentation import ( _count,
+    _count_geometry,
+    _instrument,
+    _stage )
+
+'''____________ARCS____________'''
+
+def _transform(topology: dict) -> Optional[tuple]:
+    '''Scale and translate of a quantized topology or None.'''
+    transform = topology.get('transform')
+    if not transform:
+        return None
+    (sx, sy), (tx, ty) = transform['scale'], transform['translate']
+    return sx, sy, tx, ty
+
+def _decode_arcs(arcs: list,
+    transform: Optional[tuple]) -> list:
+    '''Absolute positions of the arcs. Quantized arcs are delta encoded.'''
+    if transform is None:
+        return [[list(_) for _ in arc] for arc in arcs]
+    sx, sy, tx, ty = transform
+    res = []
+    for arc in arcs:
+        x = y = 0
+        positions = []
+        for pos in arc:
+            x += pos[0]
+            y += pos[1]
+            positions.append([x * sx + tx, y * sy + ty, *pos[2:]])
+        res.append(positions)
+    return res
+
+def _position(pos: list,
+    transform: Optional[tuple]) -> list:
+    '''Absolute position of a point. Points are not delta encoded.'''
+    if transform is None:
+        return list(pos)
+    sx, sy, tx, ty = transform
+    return [pos[0] * sx + tx, pos[1] * sy + ty, *pos[2:]]
+
+def _line(indexes: List[int],
+    arcs: list) -> list:
+    '''Positions of a line from arc indexes. A negative index ~i is
+    the arc i reversed. Shared end points of consecutive arcs are
+    added once.'''
+    res = []
+    for i in indexes:
+        arc = arcs[i] if i >= 0 else arcs[~i][::-1]
+        res.extend(arc[1:] if res else arc)
+    return res
+
+'''____________GEOMETRIES____________'''
+
+def _coordinates(geometry: dict,
+    arcs: list,
+    transform: Optional[tuple]) -> tuple:
+    '''GeoJSON type and coordinates of a TopoJSON geometry.
+    Members of a GeometryCollection are tuples of (type, coordinates).'''
+    tp = geometry.get('type')
+    if tp is None:
+        return None, None
+    tp = GeojSONTypes(tp)
+    if tp == GeojSONTypes.POINT:
+        coords = _position(geometry['coordinates'], transform)
+    elif tp == GeojSONTypes.MULTIPOINT:
+        coords = [_position(_, transform) for _ in geometry['coordinates']]
+    elif tp == GeojSONTypes.LINESTRING:
+        coords = _line(geometry['arcs'], arcs)
+    elif tp in (GeojSONTypes.MULTILINESTRING, GeojSONTypes.POLYGON):
+        coords = [_line(_, arcs) for _ in geometry['arcs']]
+    elif tp == GeojSONTypes.MULTIPOLYGON:
+        coords = [[_line(_, arcs) for _ in polygon]
+            for polygon in geometry['arcs']]
+    elif tp == GeojSONTypes.GEOMETRYCOLLECTION:
+        coords = [_coordinates(_, arcs, transform)
+            for _ in geometry.get('geometries') or []]
+        coords = [_ for _ in coords if _[0] is not None]
+    else:
+        raise ValueError(f'{tp.value} is not a TopoJSON geometry.')
+    if tp != GeojSONTypes.GEOMETRYCOLLECTION:
+        _count_geometry(tp, coords)
+    return tp, coords
+
+def _objects(topology: dict,
+    name: Optional[str]) -> list:
+    '''Geometry objects of a topology. The geometries of a
+    GeometryCollection object are features, like topojson.feature.'''
+    objects = topology.get('objects') or {}
+    if name is not None:
+        if name not in objects:
+            raise ValueError(f'{name} is not an object of the topology.')
+        objects = { name: objects[name] }
+    res = []
+    for obj in objects.values():
+        if obj.get('type') == GeojSONTypes.GEOMETRYCOLLECTION.value:
+            res.extend(obj.get('geometries') or [])
+        else:
+            res.append(obj)
+    return res
+
+@_instrument('from_topojson')
+def from_topojson(topology: Union[str, dict],
+    options: Optional[Options]=Options.options_factory(),
+    name: Optional[str]=None) -> List:
+    ''' LadybugFeatures of a TopoJSON Topology.
+    Each geometry of the objects becomes a feature with its properties.
+    Mapping is
+    - POINT > Point3D
+    - MULTIPOINT > List[Point3D]
+    - LINESTRING > LineSegment3D or Polyline3D
+    - MULTILINESTRING > List[LineSegment3D] or List[Polyline3D]
+    - POLYGON > Face3D
+    - MULTIPOLYGON > List[Face3D] or Polyface3D
+    - GEOMETRYCOLLECTION > List of the geometries above
+
+    Args:
+    - topology: TopoJSON string or dictionary.
+    - options: Options object to use for mapping.
+    - name: name of the object to read. Default is all objects.
+
+    Return:
+        a list of LadybugFeature
+    '''
+    # imported here to load ladybug_geometry only when it is used
+    from ..ladybug_feature import LadybugFeature
+    from .wkb import _build
+
+    if isinstance(topology, (str, bytes)):
+        with _stage('json.loads'):
+            topology = json.loads(topology)
+    if not isinstance(topology, dict) or topology.get('type') != 'Topology':
+        raise ValueError('It is not a TopoJSON Topology.')
+
+    transform = _transform(topology)
+    with _stage('topojson.arcs'):
+        arcs = _decode_arcs(topology.get('arcs') or [], transform)
+
+    features = []
+    for obj in _objects(topology, name):
+        tp, coords = _coordinates(obj, arcs, transform)
+        geo = _build(tp, coords, options) if coords else None
+        features.append(LadybugFeature.from_geometry(geo,
+            obj.get('properties') or {}, options))
+        _count('features')
+    return features
+
+def read_topojson(filepath: Union[str, Path],
+    options: Optional[Options]=Options.options_factory(),
+    name: Optional[str]=None) -> List:
+    ''' LadybugFeatures of a TopoJSON file. See from_topojson.
+
+    Args:
+    - filepath: path of the TopoJSON file.
+    - options: Options object to use for mapping.
+    - name: name of the object to read. Default is all objects.
+    '''
+    with open(filepath, 'rb') as f:
+        return from_topojson(f.read(), options, name)
+
+'''____________TOPOLOGY____________'''
+
+class _Topology:
+    '''Quantized lines and rings of GeoJSON geometries and their arcs.'''
+    __slots__ = ('_kx', '_ky', '_x0', '_y0',
+        'lines', 'arcs', '_arc_index')
+
+    def __init__(self,
+        bbox: tuple,
+        quantization: int):
+        x0, y0, x1, y1 = bbox
+        self._x0, self._y0 = x0, y0
+        self._kx = (quantization - 1) / (x1 - x0) if x1 > x0 else 1.0
+        self._ky = (quantization - 1) / (y1 - y0) if y1 > y0 else 1.0
+        self.lines = []
+        self.arcs = []
+        self._arc_index = {}
+
+    @property
+    def transform(self) -> dict:
+        return { 'scale': [1 / self._kx, 1 / self._ky],
+            'translate': [self._x0, self._y0] }
+
+    def point(self,
+        pos: list) -> tuple:
+        return (round((pos[0] - self._x0) * self._kx),
+            round((pos[1] - self._y0) * self._ky))
+
+    def add_line(self,
+        positions: list,
+        ring: bool=False) -> Optional[int]:
+        '''Add a line or a closed ring without repeated vertices.
+        Lines with less than 2 positions and rings with less than
+        3 distinct positions after the quantization are not added.
+
+        Return:
+            the index of the line or None if it is not added
+        '''
+        line = []
+        for pos in positions:
+            pt = self.point(pos)
+            if not line or line[-1] != pt:
+                line.append(pt)
+        if ring:
+            if len(line) < 4 or len(set(line)) < 3:
+                return None
+        elif len(line) < 2:
+            return None
+        self.lines.append(line)
+        return len(self.lines) - 1
+
+    def _arc(self,
+        points: list,
+        ring: bool) -> int:
+        '''Index of an arc, ~index if the arc is stored reversed.'''
+        if ring:
+            # closed rings start at the smallest vertex
+            start = points.index(min(points[:-1]))
+            points = points[start:-1] + points[:start + 1]
+        key = tuple(points)
+        index = self._arc_index.get(key)
+        if index is not None:
+            return index
+        index = self._arc_index.get(key[::-1])
+        if index is not None:
+            return ~index
+        self._arc_index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+    def cut(self) -> List[List[int]]:
+        '''Arc indexes of each line. Lines are cut where the set of
+        lines that share the edges changes.'''
+        owners = {}
+        for i, line in enumerate(self.lines):
+            for a, b in zip(line, line[1:]):
+                owners.setdefault((a, b) if a < b else (b, a), set()).add(i)
+
+        res = []
+        for line in self.lines:
+            own = [owners[(a, b) if a < b else (b, a)]
+                for a, b in zip(line, line[1:])]
+            ring = len(line) > 3 and line[0] == line[-1]
+            if ring:
+                cuts = [i for i in range(len(own)) if own[i - 1] != own[i]]
+                if not cuts:
+                    res.append([self._arc(line, True)])
+                    continue
+                # rotate the ring to start at a cut
+                start = cuts[0]
+                line = line[start:-1] + line[:start + 1]
+                cuts = [_ - start for _ in cuts]
+            else:
+                cuts = [0] + [i for i in range(1, len(own))
+                    if own[i - 1] != own[i]]
+            cuts.append(len(line) - 1)
+            res.append([self._arc(line[a:b + 1], False)
+                for a, b in zip(cuts, cuts[1:])])
+        return res
+
+    def encoded_arcs(self) -> List[list]:
+        '''Delta encoded arcs.'''
+        res = []
+        for arc in self.arcs:
+            encoded = [list(arc[0])]
+            encoded.extend([b[0] - a[0], b[1] - a[1]]
+                for a, b in zip(arc, arc[1:]))
+            res.append(encoded)
+        return res
+
+def _geojson_bbox(geometries: List[Optional[dict]]) -> tuple:
+    # imported here to avoid a circular import
+    from ..slippy.index import feature_bbox
+    boxes = [feature_bbox({ 'type': 'Feature', 'geometry': _ })
+        for _ in geometries if _]
+    boxes = [_ for _ in boxes if _]
+    if not boxes:
+        return (0.0, 0.0, 0.0, 0.0)
+    return (min(_[0] for _ in boxes), min(_[1] for _ in boxes),
+        max(_[2] for _ in boxes), max(_[3] for _ in boxes))
+
+def _topo_polygon(rings: list,
+    topology: _Topology) -> Optional[List[int]]:
+    '''Line indexes of the rings of a polygon. None if the exterior
+    ring is degenerate. Degenerate holes are dropped.'''
+    exterior = topology.add_line(rings[0], True) if rings else None
+    if exterior is None:
+        return None
+    holes = [topology.add_line(_, True) for _ in rings[1:]]
+    return [exterior] + [_ for _ in holes if _ is not None]
+
+def _topo_geometry(geometry: dict,
+    topology: _Topology) -> dict:
+    '''TopoJSON geometry with line indexes in place of the arcs.
+    Degenerate lines and rings are dropped like topojson-server does.
+    The geometry is null if nothing is left.'''
+    tp = GeojSONTypes(geometry['type'])
+    coords = geometry.get('coordinates')
+    if tp == GeojSONTypes.POINT:
+        return { 'type': tp.value, 'coordinates': topology.point(coords) }
+    if tp == GeojSONTypes.MULTIPOINT:
+        return { 'type': tp.value,
+            'coordinates': [topology.point(_) for _ in coords] }
+    if tp == GeojSONTypes.LINESTRING:
+        arcs = topology.add_line(coords)
+    elif tp == GeojSONTypes.MULTILINESTRING:
+        arcs = [topology.add_line(_) for _ in coords]
+        arcs = [_ for _ in arcs if _ is not None]
+    elif tp == GeojSONTypes.POLYGON:
+        arcs = _topo_polygon(coords, topology)
+    elif tp == GeojSONTypes.MULTIPOLYGON:
+        arcs = [_topo_polygon(_, topology) for _ in coords]
+        arcs = [_ for _ in arcs if _ is not None]
+    else:
+        geometries = [_topo_geometry(_, topology)
+            for _ in geometry.get('geometries') or []]
+        geometries = [_ for _ in geometries if _['type'] is not None]
+        if not geometries:
+            return { 'type': None }
+        return { 'type': tp.value, 'geometries': geometries }
+    if arcs is None or arcs == []:
+        return { 'type': None }
+    return { 'type': tp.value, 'arcs': arcs }
+
+def _set_arcs(geometry: dict,
+    lines: List[List[int]]):
+    '''Replace the line indexes of a TopoJSON geometry with arc indexes.'''
+    tp = geometry.get('type')
+    if tp in ('Point', 'MultiPoint', None):
+        return
+    if tp == GeojSONTypes.GEOMETRYCOLLECTION.value:
+        for _ in geometry['geometries']:
+            _set_arcs(_, lines)
+        return
+    arcs = geometry['arcs']
+    if tp == GeojSONTypes.LINESTRING.value:
+        geometry['arcs'] = lines[arcs]
+    elif tp == GeojSONTypes.MULTIPOLYGON.value:
+        geometry['arcs'] = [[lines[_] for _ in polygon] for polygon in arcs]
+    else:
+        geometry['arcs'] = [lines[_] for _ in arcs]
+
+@_instrument('to_topojson')
+def to_topojson(features: List,
+    properties: Optional[List[dict]]=None,
+    quantization: int=1000000,
+    name: str='features') -> dict:
+    ''' TopoJSON Topology of Ladybug geometries or LadybugFeatures.
+    Vertices are quantized on a grid of quantization x quantization
+    positions over the bounding box and arcs are delta encoded.
+    Edges shared by lines and rings are written once. Coordinates are
+    written in 2D. Lines and rings that collapse on the grid are dropped
+    and a geometry with nothing left is written as a null geometry.
+    Mapping is the same of from_features
+    - Point2D, Point3D > Point
+    - LineSegment2D, LineSegment3D, Polyline2D, Polyline3D > LineString
+    - Polygon2D, Face3D > Polygon
+    - Polyface3D, Mesh2D, Mesh3D > MultiPolygon
+    - List of geometries > Multi geometry or GeometryCollection
+
+    Args:
+    - features: list of ladybug geometries or LadybugFeature.
+    - properties: list of property dictionaries. One for each geometry.
+            Properties of LadybugFeature are used if it is None.
+    - quantization: number of quantized positions on each axis.
+    - name: name of the GeometryCollection object of the topology.
+
+    Return:
+        a TopoJSON dictionary
+    '''
+    # imported here to load ladybug_geometry only when it is used
+    from .from_geometry import _geometry_to_dict
+    from ..ladybug_feature import LadybugFeature
+
+    if properties is not None and len(properties) != len(features):
+        raise ValueError('properties must have one item for each feature.')
+    if quantization < 2:
+        raise ValueError('quantization must be greater than 1.')
+
+    geometries, props = [], []
+    for i, ft in enumerate(features):
+        prop = properties[i] if properties is not None else None
+        if isinstance(ft, LadybugFeature):
+            if properties is None:
+                prop = ft.properties
+            ft = ft.geometry
+        geometries.append(_geometry_to_dict(ft) if ft is not None else None)
+        props.append(prop)
+
+    bbox = _geojson_bbox(geometries)
+    topology = _Topology(bbox, quantization)
+    items = []
+    for geo, prop in zip(geometries, props):
+        item = _topo_geometry(geo, topology) if geo else { 'type': None }
+        if prop is not None:
+            item['properties'] = prop
+        items.append(item)
+
+    with _stage('topojson.cut'):
+        lines = topology.cut()
+    for item in items:
+        _set_arcs(item, lines)
+
+    return {
+        'type': 'Topology',
+        'bbox': list(bbox),
+        'transform': topology.transform,
+        'objects': { name: { 'type': 'GeometryCollection',
+            'geometries': items } },
+        'arcs': topology.encoded_arcs()
+    }
+
+def _arc_references(geometry: dict,
+    counts: Dict[int, int]):
+    arcs = geometry.get('arcs')
+    if isinstance(arcs, int):
+        counts[~arcs if arcs < 0 else arcs] = \
+            counts.get(~arcs if arcs < 0 else arcs, 0) + 1
+    elif isinstance(arcs, list):
+        for _ in arcs:
+            _arc_references({ 'arcs': _ }, counts)
+    for _ in geometry.get('geometries') or []:
+        _arc_references(_, counts)
+
+def size_report(features: List,
+    topology: dict,
+    properties: Optional[List[dict]]=None) -> dict:
+    ''' Size of a TopoJSON topology against the GeoJSON FeatureCollection
+    of the same features, as written by from_features.
+
+    Args:
+    - features: list of ladybug geometries or LadybugFeature.
+    - topology: TopoJSON dictionary from to_topojson.
+    - properties: list of property dictionaries. One for each geometry.
+
+    Return:
+        a dictionary with geojson_bytes, topojson_bytes, reduction (0 to 1),
+        arcs and shared_arcs (arcs used more than once)
+    '''
+    # imported here to load ladybug_geometry only when it is used
+    from .from_geometry import from_features
+
+    geojson = len(from_features(features, properties).encode('utf-8'))
+    topojson = len(json.dumps(topology).encode('utf-8'))
+    counts = {}
+    for obj in topology['objects'].values():
+        _arc_references(obj, counts)
+    return {
+        'geojson_bytes': geojson,
+        'topojson_bytes': topojson,
+        'reduction': 1 - topojson / geojson if geojson else 0.0,
+        'arcs': len(topology['arcs']),
+        'shared_arcs': sum(1 for _ in counts.values() if _ > 1)
+    }
+
+def write_topojson(features: List,
+    filepath: Union[str, Path],
+    properties: Optional[List[dict]]=None,
+    quantization: int=1000000,
+    name: str='features') -> dict:
+    ''' Write Ladybug geometries or LadybugFeatures into a TopoJSON file.
+    See to_topojson.
+
+    Args:
+    - features: list of ladybug geometries or LadybugFeature.
+    - filepath: path of the TopoJSON file.
+    - properties: list of property dictionaries. One for each geometry.
+    - quantization: number of quantized positions on each axis.
+    - name: name of the GeometryCollection object of the topology.
+
+    Return:
+        the size report of the file. See size_report.
+    '''
+    topology = to_topojson(features, properties, quantization, name)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(topology, f)
+    return size_report(features, topology, properties)
@@ -0,0 +1,249 @@
+# coding=utf-8
+'''ISO WKB encoding of GeoJSON and Ladybug geometries.
+
+Ladybug geometries are written with Z coordinates (codes 1001 to 1007).
+GeoJSON geometries are written in 2D when none of their positions has
+a z coordinate. The decoder reads 2D, Z and EWKB Z geometries in both
+byte orders, with or without an EWKB SRID, into GeoJSON coordinates,
+which are built into Ladybug geometries with the coordinate builders of
+to_geometry. Geometries with M coordinates raise a ValueError.
+'''
+import struct
+from typing import Optional
+from .config import Options
+from .._validator import GeojSONTypes
+
+# GeoJSON type > ISO WKB code (2D)
+_WKB_CODES = {
+    GeojSONTypes.POINT: 1,
+    GeojSONTypes.LINESTRING: 2,
+    GeojSONTypes.POLYGON: 3,
+    GeojSONTypes.MULTIPOINT: 4,
+    GeojSONTypes.MULTILINESTRING: 5,
+    GeojSONTypes.MULTIPOLYGON: 6,
+    GeojSONTypes.GEOMETRYCOLLECTION: 7
+}
+_WKB_TYPES = { v: k for k, v in _WKB_CODES.items() }
+
+# multi type > type of the parts
+_MULTI_PARTS = {
+    GeojSONTypes.MULTIPOINT: GeojSONTypes.POINT,
+    GeojSONTypes.MULTILINESTRING: GeojSONTypes.LINESTRING,
+    GeojSONTypes.MULTIPOLYGON: GeojSONTypes.POLYGON
+}
+
+'''____________LADYBUG GEOMETRY____________'''
+
+def _vertices(geometry) -> list:
+    return [geometry.p1, geometry.p2] \
+        if not hasattr(geometry, 'vertices') else list(geometry.vertices)
+
+def _rings(face) -> list:
+    '''Closed rings of a Face3D.'''
+    rings = [list(face.boundary)] + [list(_) for _ in face.holes or []]
+    return [_ + _[:1] for _ in rings]
+
+def _geometry_type(geometry) -> Optional[GeojSONTypes]:
+    '''GeoJSON type of a Ladybug geometry. GeometryCollection
+    for a list of geometries with different types.'''
+    # imported here to load ladybug_geometry only when it is used
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.line import LineSegment3D
+    from ladybug_geometry.geometry3d.polyline import Polyline3D
+    from ladybug_geometry.geometry3d.face import Face3D
+    from ladybug_geometry.geometry3d.polyface import Polyface3D
+
+    if geometry is None:
+        return None
+    if isinstance(geometry, Point3D):
+        return GeojSONTypes.POINT
+    if isinstance(geometry, (LineSegment3D, Polyline3D)):
+        return GeojSONTypes.LINESTRING
+    if isinstance(geometry, Face3D):
+        return GeojSONTypes.POLYGON
+    if isinstance(geometry, Polyface3D):
+        return GeojSONTypes.MULTIPOLYGON
+    if isinstance(geometry, (list, tuple)):
+        types = set(map(_geometry_type, geometry))
+        if len(types) == 1:
+            tp = types.pop()
+            if tp == GeojSONTypes.POINT:
+                return GeojSONTypes.MULTIPOINT
+            if tp == GeojSONTypes.LINESTRING:
+                return GeojSONTypes.MULTILINESTRING
+            if tp == GeojSONTypes.POLYGON:
+                return GeojSONTypes.MULTIPOLYGON
+        return GeojSONTypes.GEOMETRYCOLLECTION
+    raise TypeError(f'{type(geometry).__name__} is not supported.')
+
+'''____________WKB____________'''
+
+def _wkb_points(out: bytearray,
+    points: list):
+    out += struct.pack('<I', len(points))
+    coords = []
+    for pt in points:
+        coords.extend((pt.x, pt.y, pt.z))
+    out += struct.pack(f'<{len(coords)}d', *coords)
+
+def _wkb(geometry,
+    out: Optional[bytearray]=None) -> bytearray:
+    '''ISO WKB with Z coordinates of a Ladybug geometry.'''
+    out = bytearray() if out is None else out
+    tp = _geometry_type(geometry)
+    out += struct.pack('<BI', 1, 1000 + _WKB_CODES[tp])
+    if tp == GeojSONTypes.POINT:
+        out += struct.pack('<3d', geometry.x, geometry.y, geometry.z)
+    elif tp == GeojSONTypes.LINESTRING:
+        _wkb_points(out, _vertices(geometry))
+    elif tp == GeojSONTypes.POLYGON:
+        rings = _rings(geometry)
+        out += struct.pack('<I', len(rings))
+        for ring in rings:
+            _wkb_points(out, ring)
+    else:
+        parts = geometry.faces if hasattr(geometry, 'faces') else geometry
+        out += struct.pack('<I', len(parts))
+        for part in parts:
+            _wkb(part, out)
+    return out
+
+def _has_z(coordinates) -> bool:
+    if not coordinates:
+        return False
+    if isinstance(coordinates[0], (int, float)):
+        return len(coordinates) > 2
+    return any(_has_z(_) for _ in coordinates)
+
+def _geojson_positions(out: bytearray,
+    positions: list,
+    dim: int):
+    coords = []
+    for pos in positions:
+        coords.extend(pos[:dim])
+        if len(pos) < dim:
+            coords.append(0.0)
+    out += struct.pack(f'<{len(coords)}d', *coords)
+
+def _geojson_wkb(geometry: dict,
+    out: Optional[bytearray]=None,
+    dim: Optional[int]=None) -> bytearray:
+    '''ISO WKB of a GeoJSON geometry dictionary.
+    Missing z coordinates of 3D geometries are 0.'''
+    out = bytearray() if out is None else out
+    tp = GeojSONTypes(geometry.get('type'))
+    if tp == GeojSONTypes.GEOMETRYCOLLECTION:
+        parts = geometry.get('geometries') or []
+        if dim is None:
+            dim = 3 if any(_has_z(_.get('coordinates')) for _ in parts) \
+                else 2
+    else:
+        coordinates = geometry.get('coordinates') or []
+        if dim is None:
+            dim = 3 if _has_z(coordinates) else 2
+    out += struct.pack('<BI', 1, _WKB_CODES[tp] + (1000 if dim == 3 else 0))
+
+    if tp == GeojSONTypes.POINT:
+        _geojson_positions(out, [coordinates], dim)
+    elif tp == GeojSONTypes.LINESTRING:
+        out += struct.pack('<I', len(coordinates))
+        _geojson_positions(out, coordinates, dim)
+    elif tp == GeojSONTypes.POLYGON:
+        out += struct.pack('<I', len(coordinates))
+        for ring in coordinates:
+            out += struct.pack('<I', len(ring))
+            _geojson_positions(out, ring, dim)
+    elif tp == GeojSONTypes.GEOMETRYCOLLECTION:
+        out += struct.pack('<I', len(parts))
+        for part in parts:
+            _geojson_wkb(part, out, dim)
+    else:
+        part = _MULTI_PARTS[tp].value
+        out += struct.pack('<I', len(coordinates))
+        for coords in coordinates:
+            _geojson_wkb({ 'type': part, 'coordinates': coords }, out, dim)
+    return out
+
+def _from_wkb(data,
+    pos: int=0) -> tuple:
+    '''GeoJSON type and coordinates of a WKB geometry.
+    Geometries of a GeometryCollection are tuples of (type, coordinates).
+
+    Return:
+        a tuple with (type, coordinates, end position)
+    '''
+    order = '<' if data[pos] == 1 else '>'
+    code, = struct.unpack_from(f'{order}I', data, pos + 1)
+    pos += 5
+    # EWKB flags
+    has_z = bool(code & 0x80000000)
+    if code & 0x40000000:
+        raise ValueError('WKB with M coordinates is not supported.')
+    if code & 0x20000000:
+        # the SRID follows the type
+        pos += 4
+    code &= 0x0fffffff
+    # ISO codes: 1000 Z, 2000 M, 3000 ZM
+    if 2000 < code < 4000:
+        raise ValueError('WKB with M coordinates is not supported.')
+    if code > 1000:
+        has_z, code = True, code - 1000
+    if code not in _WKB_TYPES:
+        raise ValueError(f'WKB geometry type {code} is not supported.')
+    dim = 3 if has_z else 2
+    tp = _WKB_TYPES[code]
+
+    def _points(pos):
+        count, = struct.unpack_from(f'{order}I', data, pos)
+        pos += 4
+        flat = struct.unpack_from(f'{order}{count * dim}d', data, pos)
+        pts = [list(flat[i:i + dim]) for i in range(0, len(flat), dim)]
+        return pts, pos + 8 * len(flat)
+
+    if tp == GeojSONTypes.POINT:
+        pt = list(struct.unpack_from(f'{order}{dim}d', data, pos))
+        return tp, pt, pos + 8 * dim
+    if tp == GeojSONTypes.LINESTRING:
+        pts, pos = _points(pos)
+        return tp, pts, pos
+    if tp == GeojSONTypes.POLYGON:
+        count, = struct.unpack_from(f'{order}I', data, pos)
+        pos += 4
+        rings = []
+        for _ in range(count):
+            ring, pos = _points(pos)
+            rings.append(ring)
+        return tp, rings, pos
+
+    count, = struct.unpack_from(f'{order}I', data, pos)
+    pos += 4
+    parts = []
+    for _ in range(count):
+        part_tp, coords, pos = _from_wkb(data, pos)
+        parts.append((part_tp, coords) \
+            if tp == GeojSONTypes.GEOMETRYCOLLECTION else coords)
+    return tp, parts, pos
+'''____________COORDINATES TO LADYBUG GEOMETRY____________'''
+
+def _build(tp: Optional[GeojSONTypes],
+    coordinates,
+    options: Options):
+    '''Ladybug geometry with the same mapping of LadybugFeature.'''
+    # imported here to load ladybug_geometry only when it is used
+    from .to_geometry import ( _COLLECTION_3D,
+        _faces_3d, _merge_faces )
+
+    if tp is None:
+        return None
+    if tp == GeojSONTypes.GEOMETRYCOLLECTION:
+        res = []
+        for part_tp, coords in coordinates:
+            geo = _build(part_tp, coords, options)
+            res.extend(geo if isinstance(geo, list) else [geo])
+        return res
+    if tp == GeojSONTypes.MULTIPOLYGON:
+        return _merge_faces(_faces_3d(coordinates, options), options)
+    builder, single = _COLLECTION_3D[tp]
+    if single:
+        return builder([coordinates], options)[0]
+    return builder(coordinates, options)
@@ -0,0 +1,98 @@
+# coding=utf-8
+'''Writer to stream Ladybug geometries into a GEOJSON FeatureCollection file.'''
+import json
+from pathlib import Path
+from typing import Optional, Union
+from .from_geometry import _feature_to_dict
+
+class FeatureCollectionWriter:
+    '''Write a GEOJSON FeatureCollection feature by feature.
+    Only one feature is kept in memory so the size of the collection
+    does not change the memory used.
+
+    Usage:
+        with FeatureCollectionWriter('out.geojson') as writer:
+            for face in faces:
+                writer.write(face, {'name': 'face'})
+
+    Args:
+    - file: path of the output file or an open text file handle.
+    - precision: number of decimal digits to keep for coordinates.
+            None to keep full precision.
+    Properties:
+        * count
+        * closed
+    '''
+    __slots__ = ('_file', '_own_file', '_precision',
+        '_count', '_closed')
+
+    def __init__(self,
+        file: Union[str, Path, object],
+        precision: Optional[int]=None):
+        self._own_file = isinstance(file, (str, Path))
+        self._file = open(file, 'w') if self._own_file else file
+        self._precision = precision
+        self._count = 0
+        self._closed = False
+
+        self._file.write('{"type": "FeatureCollection", "features": [')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def count(self):
+        ''' Number of features written '''
+        return self._count
+
+    @property
+    def closed(self):
+        ''' True if the collection is closed '''
+        return self._closed
+
+    def write(self,
+        geometry,
+        properties: Optional[dict]=None,
+        id: Optional[Union[str, int]]=None):
+        ''' Write a Ladybug geometry as a GEOJSON Feature.
+
+        Args:
+        - geometry: Ladybug geometry or list of Ladybug geometries.
+        - properties: dictionary with the Feature properties.
+        - id: optional Feature id.
+        '''
+        if self._closed:
+            raise ValueError('FeatureCollection is closed.')
+
+        feature = _feature_to_dict(geometry,
+            properties=properties,
+            id=id,
+            precision=self._precision)
+
+        if self._count:
+            self._file.write(',')
+        self._file.write('\n')
+        self._file.write(json.dumps(feature))
+        self._count += 1
+
+    def write_feature(self,
+        feature):
+        ''' Write a LadybugFeature as a GEOJSON Feature.
+
+        Args:
+        - feature: LadybugFeature to write.
+        '''
+        self.write(feature.geometry,
+            properties=feature.properties)
+
+    def close(self):
+        ''' Close the FeatureCollection '''
+        if self._closed:
+            return
+        self._file.write('\n]}\n')
+        self._closed = True
+        if self._own_file:
+            self._file.close()
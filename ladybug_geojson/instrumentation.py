@@ -0,0 +1,232 @@
+# coding=utf-8
+'''Opt-in instrumentation of the conversion stages.
+
+Stages record wall time and calls, counters record vertices, features,
+geometries by type and validations. Nothing is recorded unless a
+Recorder is active, so the hooks cost only a context variable lookup
+when disabled. The active Recorder is stored in a context variable, so
+each thread and asyncio task records into its own Recorder.
+
+    from ladybug_geojson.instrumentation import record
+
+    with record() as rec:
+        LadybugFeature.from_featurecollection(json_string)
+    print(rec.to_dict())
+    print(rec.to_prometheus())
+'''
+import threading
+import time
+from contextvars import ContextVar
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+
+# active recorder of the current context
+_ACTIVE = ContextVar('ladybug_geojson_recorder', default=None)
+
+class _NullStage:
+    '''Stage used when the instrumentation is disabled.'''
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    '''Context manager to record the wall time of a stage.'''
+    __slots__ = ('_recorder', '_name', '_start')
+
+    def __init__(self,
+        recorder,
+        name: str):
+        self._recorder = recorder
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._recorder.add_time(self._name,
+            time.perf_counter() - self._start)
+        return False
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+class Recorder:
+    '''Recorder of stage times and counters.
+    Stages are inclusive: the time of a nested stage is also part
+    of the time of the outer stage.
+
+    Properties:
+        * times
+        * calls
+        * counters
+    '''
+    __slots__ = ('_times', '_calls',
+        '_counters', '_lock')
+
+    def __init__(self):
+        self._times = {}
+        self._calls = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @property
+    def times(self):
+        ''' Dictionary of stage name > total seconds '''
+        return dict(self._times)
+
+    @property
+    def calls(self):
+        ''' Dictionary of stage name > number of calls '''
+        return dict(self._calls)
+
+    @property
+    def counters(self):
+        ''' Dictionary of counter name > value '''
+        return dict(self._counters)
+
+    def stage(self,
+        name: str) -> _Stage:
+        ''' Context manager to record the wall time of a stage '''
+        return _Stage(self, name)
+
+    def add_time(self,
+        name: str,
+        seconds: float):
+        ''' Add a call of a stage '''
+        with self._lock:
+            self._times[name] = self._times.get(name, 0.0) + seconds
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    def add(self,
+        name: str,
+        value: int=1):
+        ''' Increment a counter '''
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        ''' Remove all the values '''
+        with self._lock:
+            self._times.clear()
+            self._calls.clear()
+            self._counters.clear()
+
+    def to_dict(self) -> dict:
+        ''' Get the values as a dictionary '''
+        with self._lock:
+            stages = { k: { 'calls': self._calls[k],
+                'seconds': self._times[k] } for k in sorted(self._times) }
+            counters = { k: self._counters[k] for k in sorted(self._counters) }
+        return { 'stages': stages, 'counters': counters }
+
+    def to_prometheus(self,
+        prefix: str='ladybug_geojson') -> str:
+        ''' Get the values in Prometheus text format.
+
+        Args:
+        - prefix: prefix of the metric names.
+        '''
+        data = self.to_dict()
+        lines = [
+            f'# HELP {prefix}_stage_seconds_total Wall time of the stage.',
+            f'# TYPE {prefix}_stage_seconds_total counter'
+        ]
+        for k, v in data['stages'].items():
+            lines.append(f'{prefix}_stage_seconds_total'
+                f'{{stage="{_escape(k)}"}} {v["seconds"]!r}')
+
+        lines.extend([
+            f'# HELP {prefix}_stage_calls_total Number of calls of the stage.',
+            f'# TYPE {prefix}_stage_calls_total counter'
+        ])
+        for k, v in data['stages'].items():
+            lines.append(f'{prefix}_stage_calls_total'
+                f'{{stage="{_escape(k)}"}} {v["calls"]}')
+
+        lines.extend([
+            f'# HELP {prefix}_count_total Number of processed items.',
+            f'# TYPE {prefix}_count_total counter'
+        ])
+        for k, v in data['counters'].items():
+            lines.append(f'{prefix}_count_total'
+                f'{{name="{_escape(k)}"}} {v}')
+
+        return '\n'.join(lines) + '\n'
+
+@contextmanager
+def record(recorder: Optional[Recorder]=None):
+    ''' Enable the instrumentation inside a with block.
+    The previous recorder is restored at the end of the block.
+    Only the current thread or task is recorded. New threads do not
+    inherit the recorder, use the same Recorder in each of them.
+
+    Args:
+    - recorder: Recorder to use. A new one is created if it is None.
+
+    Return:
+        the active Recorder
+    '''
+    recorder = recorder or Recorder()
+    token = _ACTIVE.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _ACTIVE.reset(token)
+
+def enabled() -> bool:
+    ''' True if a recorder is active '''
+    return _ACTIVE.get() is not None
+
+'''____________HOOKS____________'''
+
+def _stage(name: str):
+    '''Context manager for a stage of the active recorder.'''
+    recorder = _ACTIVE.get()
+    if recorder is None:
+        return _NULL_STAGE
+    return _Stage(recorder, name)
+
+def _count(name: str,
+    value: int=1):
+    '''Increment a counter of the active recorder.'''
+    recorder = _ACTIVE.get()
+    if recorder is not None:
+        recorder.add(name, value)
+
+def _positions(coordinates) -> int:
+    if not coordinates:
+        return 0
+    if isinstance(coordinates[0], (int, float)):
+        return 1
+    return sum(_positions(_) for _ in coordinates)
+
+def _count_geometry(selection,
+    coordinates):
+    '''Count a geometry by GeoJSON type and its vertices.
+    They are counted only if a recorder is active.'''
+    recorder = _ACTIVE.get()
+    if recorder is not None:
+        recorder.add(f'geometry.{selection.value}')
+        recorder.add('vertices', _positions(coordinates))
+
+def _instrument(name: str):
+    '''Decorator to record a function as a stage.'''
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _ACTIVE.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Stage(recorder, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
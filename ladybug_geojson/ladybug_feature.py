@@ -8,6 +8,9 @@ from .convert.config import Options
 from .convert.to_geometry import to_face3d, to_point3d, to_polyline3d
 from ._geojson_helper import ( get_data_from_geojson_type,
     RFC7946 )
+from .instrumentation import ( _count,
+    _instrument,
+    _stage )
 
 class LadybugFeature:
     '''Ladybug feature
@@ -31,6 +34,7 @@ class LadybugFeature:
     __slots__ = ('_geometry', 
         '_properties', '_options')
 
+    @_instrument('LadybugFeature')
     def __init__(self, 
         json_string: str,
         options: Optional[Options]=Options.options_factory()):
@@ -38,23 +42,28 @@ class LadybugFeature:
         # preparation
         self._options = options
         # geometry set
-        self._set_geometry(json_string)
+        err = self._set_geometry(json_string)
         # property set
-        self._set_properties(json_string)
+        self._set_properties(json_string, err)
+        _count('features')
 
     def _set_properties(self,
-        json_string: str):
+        json_string: str,
+        geometry_error: Optional[str]=None):
         prop, sel, err = get_data_from_geojson_type(json_string, 
             keyword=RFC7946.PROPERTIES,
             target=[GeojSONTypes.FEATURE],
             validation=False)
         
         if not sel:
+            self._properties = None
             return err
 
-        if not self._geometry:
+        # features without geometry keep their properties,
+        # features with an invalid geometry do not
+        if geometry_error:
             self._properties = None
-            return err
+            return geometry_error
         
         self._properties = prop
 
@@ -72,15 +81,22 @@ class LadybugFeature:
         if not sel:
             self._geometry = None
             return err
+
+        # features without geometry are valid
+        if not geo:
+            self._geometry = None
+            return
         
         # get json schema
         geo_schema = GeojSONTypes(geo.get('type'))
 
         # skip validation
-        child_options = Options(validation=False)
+        child_options = Options()
         child_options.copy_from_dict(self._options.settings)
+        child_options.set('validation', False)
 
-        geo = json.dumps(geo)
+        with _stage('json.dumps'):
+            geo = json.dumps(geo)
         if geo_schema in [GeojSONTypes.POINT, 
             GeojSONTypes.MULTIPOINT]:
             self._geometry = to_point3d(geo,
@@ -104,7 +120,39 @@ class LadybugFeature:
         ''' Properties. Dictionary with all GeoJSON property '''
         return self._properties
 
+    def to_dict(self) -> dict:
+        ''' Get the feature as a dictionary.
+        Geometries are serialized with their to_dict method.
+        '''
+        geo = self._geometry
+        if isinstance(geo, (list, tuple)):
+            geo = [_.to_dict() for _ in geo]
+        elif geo is not None:
+            geo = geo.to_dict()
+        return { 'type': 'LadybugFeature',
+            'geometry': geo,
+            'properties': self._properties }
+
+    @classmethod
+    def from_geometry(cls,
+        geometry,
+        properties: Optional[dict]=None,
+        options: Optional[Options]=Options.options_factory()):
+        ''' Create a feature from Ladybug geometries without GeoJSON.
+
+        Args:
+        - geometry: Ladybug geometry, list of Ladybug geometries or None.
+        - properties: dictionary of properties.
+        - options: Options object stored with the feature.
+        '''
+        ft = cls.__new__(cls)
+        ft._options = options
+        ft._geometry = geometry
+        ft._properties = properties
+        return ft
+
     @classmethod
+    @_instrument('LadybugFeature.from_featurecollection')
     def from_featurecollection(cls, 
         json_string: str,
         options: Optional[Options]=Options.options_factory()):
@@ -121,12 +169,14 @@ class LadybugFeature:
             return err
         
         # skip validation
-        child_options = Options(validation=False)
+        child_options = Options()
         child_options.copy_from_dict(options.settings)
+        child_options.set('validation', False)
 
         fts = []
         for ft in features:
-            d = json.dumps(ft)
+            with _stage('json.dumps'):
+                d = json.dumps(ft)
             fts.append(cls(d, child_options))
         
         return fts
@@ -0,0 +1,251 @@
+# coding=utf-8
+'''Caches for slippy map tile math and per-tile results.'''
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from .map import ( tile_from_lat_lon,
+    tile_bounds )
+
+TILE_MATH_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=TILE_MATH_CACHE_SIZE)
+def cached_tile_from_lat_lon(lat: float,
+    lon: float,
+    zoom: int):
+    ''' Cached version of tile_from_lat_lon.
+    Use cached_tile_from_lat_lon.cache_clear() to invalidate it.
+
+    Args:
+    - lat: latitude in deg.
+    - lon: longitude in deg.
+    - zoom: zoom level from 1 to 23.
+    '''
+    return tile_from_lat_lon(lat, lon, zoom)
+
+@lru_cache(maxsize=TILE_MATH_CACHE_SIZE)
+def cached_tile_bounds(x: int,
+    y: int,
+    zoom: int):
+    ''' Cached version of tile_bounds.
+    Use cached_tile_bounds.cache_clear() to invalidate it.
+
+    Args:
+    - x: tile x.
+    - y: tile y.
+    - zoom: zoom level from 1 to 23.
+    '''
+    return tile_bounds(x, y, zoom)
+
+def _options_key(options) -> Any:
+    '''Hashable key from Options, a dictionary or a hashable value.'''
+    if options is None:
+        return None
+    settings = getattr(options, 'settings', options)
+    if isinstance(settings, dict):
+        return tuple(sorted(settings.items()))
+    return settings
+
+def _sizeof(value: Any) -> int:
+    '''Approximate size in bytes of a value. Strings and bytes count
+    their length, lists, tuples and dictionaries the size of their items.'''
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(_) for _ in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v)
+            for k, v in value.items())
+    return sys.getsizeof(value)
+
+class TileCache:
+    '''Bounded and thread-safe LRU cache of per-tile results.
+    Values are stored by (z, x, y, options). The least recently used
+    values are removed when the cache has more than maxsize values or
+    more than maxbytes bytes.
+
+    Args:
+    - maxsize: max number of values in the cache.
+    - maxbytes: max size of the values in bytes. None for no limit.
+    - sizeof: function that returns the size of a value in bytes.
+            Default is an approximate size of strings, bytes, lists,
+            tuples and dictionaries.
+    Properties:
+        * maxsize
+        * maxbytes
+        * nbytes
+        * hits
+        * misses
+    '''
+    __slots__ = ('_maxsize', '_maxbytes', '_sizeof', '_sizes',
+        '_nbytes', '_data', '_lock', '_hits', '_misses')
+
+    def __init__(self,
+        maxsize: int=1024,
+        maxbytes: Optional[int]=None,
+        sizeof: Optional[Callable]=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than 0.')
+        if maxbytes is not None and maxbytes < 1:
+            raise ValueError('maxbytes must be greater than 0.')
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._sizeof = sizeof or _sizeof
+        self._sizes = {}
+        self._nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: tuple):
+        z, x, y = key[:3]
+        options = key[3] if len(key) > 3 else None
+        return (z, x, y, _options_key(options)) in self._data
+
+    @property
+    def maxsize(self):
+        ''' Max number of values in the cache '''
+        return self._maxsize
+
+    @property
+    def maxbytes(self):
+        ''' Max size of the values in bytes or None '''
+        return self._maxbytes
+
+    @property
+    def nbytes(self):
+        ''' Size of the values in the cache in bytes '''
+        return self._nbytes
+
+    @property
+    def hits(self):
+        ''' Number of values found in the cache '''
+        return self._hits
+
+    @property
+    def misses(self):
+        ''' Number of values not found in the cache '''
+        return self._misses
+
+    def get(self,
+        z: int,
+        x: int,
+        y: int,
+        options: Optional[Any]=None,
+        default: Optional[Any]=None):
+        ''' Get the value of a tile. '''
+        key = (z, x, y, _options_key(options))
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+            return default
+
+    def put(self,
+        z: int,
+        x: int,
+        y: int,
+        value: Any,
+        options: Optional[Any]=None):
+        ''' Set the value of a tile.
+        A value larger than maxbytes is not stored.
+        '''
+        key = (z, x, y, _options_key(options))
+        size = self._sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if self._maxbytes is not None and size > self._maxbytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._nbytes += size
+            while len(self._data) > self._maxsize or \
+                (self._maxbytes is not None and
+                self._nbytes > self._maxbytes):
+                self._remove(next(iter(self._data)))
+
+    def _remove(self,
+        key: tuple):
+        if key in self._data:
+            del self._data[key]
+            self._nbytes -= self._sizes.pop(key)
+
+    def get_or_compute(self,
+        z: int,
+        x: int,
+        y: int,
+        func: Callable,
+        options: Optional[Any]=None):
+        ''' Get the value of a tile or compute it with func(z, x, y, options).
+        The function runs outside of the lock so other threads are not
+        blocked. Two threads can compute the same missing value.
+        '''
+        missing = object()
+        value = self.get(z, x, y, options, default=missing)
+        if value is not missing:
+            return value
+        value = func(z, x, y, options)
+        self.put(z, x, y, value, options)
+        return value
+
+    def invalidate(self,
+        z: Optional[int]=None,
+        x: Optional[int]=None,
+        y: Optional[int]=None,
+        children: bool=False) -> int:
+        ''' Remove values from the cache.
+        Without arguments all values are removed. Without x and y all values
+        of the zoom are removed. x and y must be given together.
+
+        Args:
+        - z: zoom of the tile.
+        - x: tile x.
+        - y: tile y.
+        - children: set it to true to remove the values of the children tiles.
+
+        Return:
+            number of values removed
+        '''
+        if (x is None) != (y is None):
+            raise ValueError('x and y must be given together.')
+        if z is None and x is not None:
+            raise ValueError('z is required with x and y.')
+        with self._lock:
+            if z is None:
+                count = len(self._data)
+                self._data.clear()
+                self._sizes.clear()
+                self._nbytes = 0
+                return count
+
+            def _match(key):
+                kz, kx, ky = key[:3]
+                if x is None:
+                    return kz == z or (children and kz > z)
+                if kz == z:
+                    return kx == x and ky == y
+                if children and kz > z:
+                    shift = kz - z
+                    return kx >> shift == x and ky >> shift == y
+                return False
+
+            keys = [_ for _ in self._data if _match(_)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        ''' Remove all values and reset the statistics '''
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
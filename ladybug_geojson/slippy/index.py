@@ -0,0 +1,209 @@
+# coding=utf-8
+'''Index of features by slippy map tiles.'''
+import json
+from bisect import bisect_left, insort
+from typing import List, Optional
+from .cache import cached_tile_from_lat_lon
+from .map import ( MAX_LATITUDE,
+    _check_zoom,
+    quadkey_from_tile )
+
+def _positions(coordinates):
+    '''Yield the positions of nested GeoJSON coordinates.'''
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        yield coordinates
+        return
+    for c in coordinates or []:
+        yield from _positions(c)
+
+def _geojson_positions(obj: dict):
+    '''Yield the positions of a GeoJSON geometry, Feature or collection.'''
+    if not obj:
+        return
+    tp = obj.get('type')
+    if tp == 'Feature':
+        yield from _geojson_positions(obj.get('geometry'))
+    elif tp == 'FeatureCollection':
+        for ft in obj.get('features') or []:
+            yield from _geojson_positions(ft)
+    elif tp == 'GeometryCollection':
+        for geo in obj.get('geometries') or []:
+            yield from _geojson_positions(geo)
+    else:
+        yield from _positions(obj.get('coordinates'))
+
+def _ladybug_bbox(geometry):
+    '''Bounding box (west, south, east, north) of Ladybug geometries.'''
+    if isinstance(geometry, (list, tuple)):
+        boxes = [_ladybug_bbox(_) for _ in geometry]
+        boxes = [_ for _ in boxes if _]
+        if not boxes:
+            return None
+        return (min(_[0] for _ in boxes), min(_[1] for _ in boxes),
+            max(_[2] for _ in boxes), max(_[3] for _ in boxes))
+    if geometry is None:
+        return None
+    pt_min, pt_max = geometry.min, geometry.max
+    return (pt_min.x, pt_min.y, pt_max.x, pt_max.y)
+
+def feature_bbox(feature) -> Optional[tuple]:
+    ''' Get the bounding box of a feature.
+    Ladybug geometries use X as longitude and Y as latitude.
+
+    Args:
+    - feature: LadybugFeature, GeoJSON dictionary or GeoJSON string.
+
+    Return:
+        a tuple with (west, south, east, north) or None if it is empty
+    '''
+    if isinstance(feature, str):
+        feature = json.loads(feature)
+    if not isinstance(feature, dict):
+        return _ladybug_bbox(feature.geometry)
+
+    xs, ys = [], []
+    for pt in _geojson_positions(feature):
+        xs.append(pt[0])
+        ys.append(pt[1])
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+class TileIndex:
+    '''Index of features by quadkey.
+    Each feature is stored in the smallest tile that contains its
+    bounding box, up to the zoom of the index. The features of a tile
+    and of its children share the quadkey prefix, so they are found
+    with a prefix lookup instead of a scan.
+
+    Args:
+    - zoom: zoom level of the index from 1 to 23.
+    Properties:
+        * zoom
+        * quadkeys
+    '''
+    __slots__ = ('_zoom', '_buckets', '_keys')
+
+    def __init__(self,
+        zoom: int):
+        _check_zoom(zoom)
+        self._zoom = zoom
+        self._buckets = {}
+        self._keys = []
+
+    def __len__(self):
+        return sum(len(_) for _ in self._buckets.values())
+
+    @property
+    def zoom(self):
+        ''' Zoom of the index '''
+        return self._zoom
+
+    @property
+    def quadkeys(self):
+        ''' Sorted list of the quadkeys with features '''
+        return list(self._keys)
+
+    def quadkey_from_bbox(self,
+        bbox: tuple) -> str:
+        ''' Get the quadkey of the smallest tile containing a bbox.
+
+        Args:
+        - bbox: tuple with (west, south, east, north) in deg.
+        '''
+        west, south, east, north = bbox
+        n = 2 ** self._zoom
+
+        def _key(lat, lon):
+            lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+            x, y = cached_tile_from_lat_lon(lat, lon, self._zoom)
+            return quadkey_from_tile(min(x, n - 1), min(y, n - 1),
+                self._zoom)
+
+        first, last = _key(north, west), _key(south, east)
+        i = 0
+        while i < len(first) and first[i] == last[i]:
+            i += 1
+        return first[:i]
+
+    def add(self,
+        feature) -> Optional[str]:
+        ''' Add a feature to the index.
+
+        Args:
+        - feature: LadybugFeature, GeoJSON dictionary or GeoJSON string.
+
+        Return:
+            the quadkey used or None if the feature has no geometry
+        '''
+        bbox = feature_bbox(feature)
+        if not bbox:
+            return None
+
+        key = self.quadkey_from_bbox(bbox)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = []
+            insort(self._keys, key)
+        bucket.append(feature)
+        return key
+
+    def extend(self,
+        features: List):
+        ''' Add a list of features to the index '''
+        for ft in features:
+            self.add(ft)
+
+    def get(self,
+        quadkey: str,
+        parents: bool=True,
+        children: bool=True) -> List:
+        ''' Get the features of a tile by quadkey.
+
+        Args:
+        - quadkey: quadkey of the tile.
+        - parents: set it to true to get the features of the parent tiles.
+                They can intersect the tile.
+        - children: set it to true to get the features of the children tiles.
+        '''
+        res = list(self._buckets.get(quadkey, []))
+
+        if parents:
+            for i in range(len(quadkey)):
+                res.extend(self._buckets.get(quadkey[:i], []))
+
+        if children:
+            i = bisect_left(self._keys, quadkey)
+            while i < len(self._keys) and \
+                self._keys[i].startswith(quadkey):
+                if self._keys[i] != quadkey:
+                    res.extend(self._buckets[self._keys[i]])
+                i += 1
+
+        return res
+
+    def get_tile(self,
+        x: int,
+        y: int,
+        zoom: int,
+        parents: bool=True,
+        children: bool=True) -> List:
+        ''' Get the features of a tile.
+
+        Args:
+        - x: tile x.
+        - y: tile y.
+        - zoom: zoom of the tile.
+        - parents: set it to true to get the features of the parent tiles.
+                They can intersect the tile.
+        - children: set it to true to get the features of the children tiles.
+        '''
+        return self.get(quadkey_from_tile(x, y, zoom),
+            parents=parents,
+            children=children)
+
+    def remove(self,
+        quadkey: str):
+        ''' Remove the features of a tile. The children are not removed. '''
+        if self._buckets.pop(quadkey, None) is not None:
+            self._keys.pop(bisect_left(self._keys, quadkey))
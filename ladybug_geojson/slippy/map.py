@@ -1,6 +1,7 @@
 # coding=utf-8
 '''Util to get skippy map tilenames.'''
 import math
+import sys
 
 VALID_RANGE = range(1, 24)
 
@@ -14,8 +15,7 @@ def tile_from_lat_lon(lat: float,
     - lon: longitude in deg.
     - zoom: zoom level from 1 to 23.
     '''
-    if zoom not in VALID_RANGE:
-        raise Exception('valid zoom is from 1 to 23.')
+    _check_zoom(zoom)
     
     if lat > 90 or lat < -90:
         raise Exception('valid latitude is from -90 to 90.')
@@ -30,6 +30,232 @@ def tile_from_lat_lon(lat: float,
         / math.pi) / 2.0 * n)
     return (xtile, ytile)
 
+def _is_ndarray(arr) -> bool:
+    '''True if arr is a NumPy array. NumPy is never imported here.'''
+    np = sys.modules.get('numpy')
+    return np is not None and isinstance(arr, np.ndarray)
+
+def _check_zoom(zoom: int):
+    if zoom not in VALID_RANGE:
+        raise Exception('valid zoom is from 1 to 23.')
+
+def tiles_from_lat_lon(lats, 
+    lons, 
+    zoom: int):
+    ''' Get tiles from arrays of lat lon and a zoom.
+    The ranges are checked once for the whole arrays. NumPy arrays are 
+    computed in one vectorized pass and NumPy arrays are returned.
+    
+    Args:
+    - lats: list or NumPy array of latitudes in deg.
+    - lons: list or NumPy array of longitudes in deg.
+    - zoom: zoom level from 1 to 23.
+
+    Return:
+        a tuple with the tile x array and the tile y array
+    '''
+    _check_zoom(zoom)
+
+    if len(lats) != len(lons):
+        raise Exception('lats and lons must have the same length.')
+
+    n = 2.0 ** zoom
+    if _is_ndarray(lats) or _is_ndarray(lons):
+        np = sys.modules['numpy']
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        if not len(lats):
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        if lats.max() > 90 or lats.min() < -90:
+            raise Exception('valid latitude is from -90 to 90.')
+        if lons.max() > 180 or lons.min() < -180:
+            raise Exception('valid longitude is from -180 to 180.')
+        lat_rad = np.radians(lats)
+        xtiles = ((lons + 180.0) / 360.0 * n).astype(np.int64)
+        ytiles = ((1.0 - np.arcsinh(np.tan(lat_rad)) 
+            / math.pi) / 2.0 * n).astype(np.int64)
+        return xtiles, ytiles
+
+    if not len(lats):
+        return [], []
+
+    if max(lats) > 90 or min(lats) < -90:
+        raise Exception('valid latitude is from -90 to 90.')
+
+    if max(lons) > 180 or min(lons) < -180:
+        raise Exception('valid longitude is from -180 to 180.')
+
+    radians, asinh, tan, pi = math.radians, math.asinh, math.tan, math.pi
+    xtiles = [int((lon + 180.0) / 360.0 * n) for lon in lons]
+    ytiles = [int((1.0 - asinh(tan(radians(lat))) / pi) / 2.0 * n) 
+        for lat in lats]
+    return xtiles, ytiles
+
+def lat_lon_from_tile(x: int, 
+    y: int, 
+    zoom: int):
+    ''' Get lat lon of the north-west corner of a tile
+    
+    Args:
+    - x: tile x.
+    - y: tile y.
+    - zoom: zoom level from 1 to 23.
+    '''
+    _check_zoom(zoom)
+
+    n = 2 ** zoom
+    if x < 0 or x > n or y < 0 or y > n:
+        raise Exception(f'valid tile is from 0 to {n - 1}.')
+
+    lon = x / n * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return (lat, lon)
+
+def tile_bounds(x: int, 
+    y: int, 
+    zoom: int):
+    ''' Get lat lon bounds of a tile
+    
+    Args:
+    - x: tile x.
+    - y: tile y.
+    - zoom: zoom level from 1 to 23.
+
+    Return:
+        a tuple with (south, west, north, east) in deg
+    '''
+    north, west = lat_lon_from_tile(x, y, zoom)
+    south, east = lat_lon_from_tile(x + 1, y + 1, zoom)
+    return (south, west, north, east)
+
+def tiles_bounds(xs, 
+    ys, 
+    zoom: int):
+    ''' Get lat lon bounds from arrays of tiles and a zoom.
+    The ranges are checked once for the whole arrays. NumPy arrays are 
+    computed in one vectorized pass and NumPy arrays are returned.
+    
+    Args:
+    - xs: list or NumPy array of tile x.
+    - ys: list or NumPy array of tile y.
+    - zoom: zoom level from 1 to 23.
+
+    Return:
+        a tuple with the south, west, north and east arrays in deg
+    '''
+    _check_zoom(zoom)
+
+    if len(xs) != len(ys):
+        raise Exception('xs and ys must have the same length.')
+
+    n = 2 ** zoom
+    if _is_ndarray(xs) or _is_ndarray(ys):
+        np = sys.modules['numpy']
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        if not len(xs):
+            return tuple(np.empty(0) for _ in range(4))
+        if xs.min() < 0 or xs.max() >= n or ys.min() < 0 or ys.max() >= n:
+            raise Exception(f'valid tile is from 0 to {n - 1}.')
+        west = xs / n * 360.0 - 180.0
+        east = (xs + 1) / n * 360.0 - 180.0
+        north = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * ys / n))))
+        south = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (ys + 1) / n))))
+        return south, west, north, east
+
+    if not len(xs):
+        return [], [], [], []
+
+    if min(xs) < 0 or max(xs) >= n or min(ys) < 0 or max(ys) >= n:
+        raise Exception(f'valid tile is from 0 to {n - 1}.')
+
+    degrees, atan, sinh, pi = math.degrees, math.atan, math.sinh, math.pi
+    west = [x / n * 360.0 - 180.0 for x in xs]
+    east = [(x + 1) / n * 360.0 - 180.0 for x in xs]
+    north = [degrees(atan(sinh(pi * (1 - 2 * y / n)))) for y in ys]
+    south = [degrees(atan(sinh(pi * (1 - 2 * (y + 1) / n)))) for y in ys]
+    return south, west, north, east
+
+# even bits of all 8 bits numbers compacted to 4 bits
+_COMPACT_BITS = [sum(((i >> (2 * b)) & 1) << b for b in range(4)) 
+    for i in range(1 << 8)]
+
+def _deinterleave(value: int) -> int:
+    '''Take the even bits of value. Used to decode Z-order indices.'''
+    res, shift = 0, 0
+    while value:
+        res |= _COMPACT_BITS[value & 0xFF] << shift
+        value >>= 8
+        shift += 4
+    return res
+
+def _check_recurrent_zoom(curr_zoom: int, 
+    target_zoom: int):
+    if curr_zoom > target_zoom:
+        raise Exception('current zoom must be'+\
+          ' smaller than target zoom.')
+
+    if curr_zoom not in VALID_RANGE or \
+        target_zoom not in VALID_RANGE:
+        raise Exception('valid zoom is from 1 to 23.')
+
+def get_recurrent_tile_range(
+    x: int,
+    y: int, 
+    curr_zoom: int, 
+    target_zoom: int):
+    ''' Get the ranges of tile x and y covered by the initial tile.
+    Children of a tile are a contiguous block of tiles.
+    
+    Args:
+    - x: initial tile x.
+    - y: initial tile y.
+    - curr_zoom: zoom of the initial tile. Eg. 15.
+    - target_zoom: zoom of target tiles. Eg. 16.
+
+    Return:
+        a tuple with the range of x and the range of y
+    '''
+    _check_recurrent_zoom(curr_zoom, target_zoom)
+
+    size = 2 ** (target_zoom - curr_zoom)
+    x, y = int(x) * size, int(y) * size
+    return range(x, x + size), range(y, y + size)
+
+def iter_recurrent_tiles(
+    x: int,
+    y: int, 
+    curr_zoom: int, 
+    target_zoom: int,
+    start: int=0,
+    stop: int=None):
+    ''' Get a generator of tile coordinates from initial tile.
+    Tiles are not stored in memory and they follow the order of 
+    get_recurrent_tiles, so a slice of the tiles can be computed 
+    by each worker using start and stop.
+    
+    Args:
+    - x: initial tile x.
+    - y: initial tile y.
+    - curr_zoom: zoom of the initial tile. Eg. 15.
+    - target_zoom: zoom of target tiles. Eg. 16.
+    - start: index of the first tile to get.
+    - stop: index after the last tile to get. None to get all tiles.
+    '''
+    _check_recurrent_zoom(curr_zoom, target_zoom)
+
+    depth = target_zoom - curr_zoom
+    count = 4 ** depth
+    stop = count if stop is None else min(stop, count)
+    x0, y0 = int(x) << depth, int(y) << depth
+
+    def tiles():
+        # the index of a child tile is the Z-order of its offsets
+        for i in range(start, stop):
+            yield (x0 + _deinterleave(i), y0 + _deinterleave(i >> 1))
+
+    return tiles()
+
 def get_recurrent_tiles(
     x: float,
     y: float, 
@@ -43,42 +269,262 @@ def get_recurrent_tiles(
     - curr_zoom: zoom of the initial tile. Eg. 15.
     - target_zoom: zoom of target tiles. Eg. 16.
     '''
-    def recurrent_tiles(
-        x,
-        y, 
+    return list(iter_recurrent_tiles(x, y, 
         curr_zoom, 
-        target_zoom):
+        target_zoom))
+
+'''____________QUADKEY AND MORTON CODES____________'''
+
+# bits of all 8 bits numbers spread on the even bits of 16 bits
+_SPREAD_BITS = [sum(((i >> b) & 1) << (2 * b) for b in range(8)) 
+    for i in range(1 << 8)]
+
+def _interleave(value: int) -> int:
+    '''Spread the bits of value on the even bits. Used for Z-order.'''
+    res, shift = 0, 0
+    while value:
+        res |= _SPREAD_BITS[value & 0xFF] << shift
+        value >>= 8
+        shift += 16
+    return res
+
+def morton_from_tile(x: int, 
+    y: int) -> int:
+    ''' Get Morton code (Z-order) of a tile.
+    Tiles with close codes are close in space and the children of a tile
+    at a zoom have contiguous codes.
     
-        diff = target_zoom - curr_zoom
+    Args:
+    - x: tile x.
+    - y: tile y.
+    '''
+    if x < 0 or y < 0:
+        raise Exception('valid tile must be positive.')
+    return _interleave(int(x)) | (_interleave(int(y)) << 1)
+
+def tile_from_morton(code: int):
+    ''' Get tile from Morton code (Z-order).
+    
+    Args:
+    - code: Morton code of the tile.
+    '''
+    if code < 0:
+        raise Exception('valid Morton code must be positive.')
+    return (_deinterleave(code), _deinterleave(code >> 1))
+
+def quadkey_from_tile(x: int, 
+    y: int, 
+    zoom: int) -> str:
+    ''' Get quadkey of a tile.
+    The quadkey of a tile starts with the quadkeys of all its parents.
     
-        if diff == 0:
-            return x, y
+    Args:
+    - x: tile x.
+    - y: tile y.
+    - zoom: zoom level from 1 to 23.
+    '''
+    _check_zoom(zoom)
+
+    n = 2 ** zoom
+    if x < 0 or x >= n or y < 0 or y >= n:
+        raise Exception(f'valid tile is from 0 to {n - 1}.')
+
+    # a quadkey digit is a pair of bits of the Morton code
+    code = morton_from_tile(x, y)
+    return ''.join(str((code >> (2 * i)) & 3) 
+        for i in reversed(range(zoom)))
+
+def tile_from_quadkey(quadkey: str):
+    ''' Get tile from quadkey.
+    
+    Args:
+    - quadkey: quadkey of the tile. Eg. '1202'.
+
+    Return:
+        a tuple with (x, y, zoom)
+    '''
+    zoom = len(quadkey)
+    _check_zoom(zoom)
+
+    try:
+        code = int(quadkey, 4)
+    except ValueError:
+        raise Exception(f'{quadkey} is not a valid quadkey.')
+    x, y = tile_from_morton(code)
+    return (x, y, zoom)
+
+'''____________TILE COVER____________'''
+
+MAX_LATITUDE = 85.0511287798
+
+def _to_tile_coordinates(coordinates, 
+    n: float):
+    '''Fractional tile coordinates from GeoJSON positions at a zoom.'''
+    out = []
+    for pt in coordinates:
+        lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, pt[1]))
+        x = (pt[0] + 180.0) / 360.0 * n
+        y = (1.0 - math.asinh(math.tan(math.radians(lat))) 
+            / math.pi) / 2.0 * n
+        out.append((min(max(x, 0.0), n), min(max(y, 0.0), n)))
+    return out
+
+def _collect_parts(obj: dict, 
+    polygons: list, 
+    lines: list, 
+    points: list):
+    '''Walk a GeoJSON object and collect polygons, lines and points.'''
+    tp = obj.get('type')
+    coords = obj.get('coordinates')
+    if tp == 'Point':
+        points.append(coords)
+    elif tp == 'MultiPoint':
+        points.extend(coords)
+    elif tp == 'LineString':
+        lines.append(coords)
+    elif tp == 'MultiLineString':
+        lines.extend(coords)
+    elif tp == 'Polygon':
+        polygons.append(coords)
+    elif tp == 'MultiPolygon':
+        polygons.extend(coords)
+    elif tp == 'GeometryCollection':
+        for geo in obj.get('geometries') or []:
+            _collect_parts(geo, polygons, lines, points)
+    elif tp == 'Feature':
+        if obj.get('geometry'):
+            _collect_parts(obj.get('geometry'), polygons, lines, points)
+    elif tp == 'FeatureCollection':
+        for ft in obj.get('features') or []:
+            _collect_parts(ft, polygons, lines, points)
+
+def _segment_in_box(segment: tuple, 
+    x0: float, y0: float, 
+    x1: float, y1: float) -> bool:
+    '''Liang-Barsky test of a segment against a closed box.'''
+    (ax, ay), (bx, by) = segment
+    dx, dy = bx - ax, by - ay
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, ax - x0), (dx, x1 - ax), 
+        (-dy, ay - y0), (dy, y1 - ay)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
         else:
-            out = []
-            first_tile = (x*2, y*2)
-            second_tile = (x*2+1, y*2)
-            third_tile = (x*2, y*2+1)
-            fourth_tile = (x*2+1, y*2+1)
-            tiles = [first_tile, second_tile, 
-                third_tile, fourth_tile]
-            for t in tiles:
-                res = recurrent_tiles(t[0], 
-                  t[1], 
-                  curr_zoom+1, 
-                  target_zoom)
-                out.extend(res)
-            return out
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return True
+
+def _point_in_rings(x: float, 
+    y: float, 
+    rings: list) -> bool:
+    '''Even-odd test of a point against polygon rings (holes included).'''
+    inside = False
+    for ring in rings:
+        for (ax, ay), (bx, by) in zip(ring, ring[1:]):
+            if (ay > y) != (by > y) and \
+                x < (bx - ax) * (y - ay) / (by - ay) + ax:
+                inside = not inside
+    return inside
+
+def tiles_for_geometry(json_string: str, 
+    zoom: int,
+    compact: bool=False,
+    validation: bool=False):
+    ''' Get the tiles that intersect a GeoJSON geometry.
+    Polygons (with holes), lines and points are supported, also inside 
+    Feature, FeatureCollection and GeometryCollection. Tiles are found with
+    a quadtree descent: empty tiles are skipped and tiles fully covered by a
+    polygon are accepted without checking their children.
     
-    if curr_zoom > target_zoom:
-        raise Exception('current zoom must be'+\
-          ' smaller than target zoom.')
+    Args:
+    - json_string: GeoJSON string.
+    - zoom: zoom level from 1 to 23.
+    - compact: set it to true to get fully covered parent tiles instead 
+            of all their children. Parent tiles have zoom 1 or more.
+    - validation: enable the validation using GeoJSON schema.
 
-    if curr_zoom not in VALID_RANGE or \
-        target_zoom not in VALID_RANGE:
-        raise Exception('valid zoom is from 1 to 23.')
+    Return:
+        a set of (x, y) tiles. If compact a set of (x, y, zoom) tiles.
+    '''
+    _check_zoom(zoom)
 
-    tiles = recurrent_tiles(x, y, 
-        curr_zoom, 
-        target_zoom)
-    return [tuple(tiles[i:i + 2]) for i \
-      in range(0, len(tiles), 2)]
\ No newline at end of file
+    # imported here to keep the slippy map module light
+    from .._geojson_helper import _run_validation
+    from .._validator import GeojSONTypes
+    obj, sel, err = _run_validation(json_string, 
+        target=list(GeojSONTypes), 
+        validation=validation)
+    if not sel:
+        raise Exception(err)
+
+    polygons, lines, points = [], [], []
+    _collect_parts(obj, polygons, lines, points)
+
+    n = 2 ** zoom
+    tiles = set()
+
+    for x, y in _to_tile_coordinates(points, n):
+        tile = (min(int(x), n - 1), min(int(y), n - 1))
+        tiles.add(tile + (zoom,) if compact else tile)
+
+    polygons = [[_to_tile_coordinates(r, n) for r in p] for p in polygons]
+    lines = [_to_tile_coordinates(l, n) for l in lines]
+
+    # edges are tagged with the polygon index, lines with None
+    edges = [(i, seg) for i, p in enumerate(polygons) 
+        for r in p for seg in zip(r, r[1:])]
+    edges.extend((None, seg) for l in lines for seg in zip(l, l[1:]))
+    if not edges:
+        return tiles
+
+    # node: (level, x, y, edges of the parent, polygons crossing the parent)
+    stack = [(0, 0, 0, edges, set(range(len(polygons))))]
+    while stack:
+        level, tx, ty, parent_edges, crossing = stack.pop()
+        size = 2 ** (zoom - level)
+        x0, y0 = tx * size, ty * size
+        x1, y1 = x0 + size, y0 + size
+
+        node_edges = [e for e in parent_edges 
+            if _segment_in_box(e[1], x0, y0, x1, y1)]
+
+        # polygons that do not cross the tile cover it or not at all
+        node_crossing = set(i for i, _ in node_edges if i is not None)
+        cx, cy = x0 + size / 2.0, y0 + size / 2.0
+        covered = any(_point_in_rings(cx, cy, polygons[i]) 
+            for i in crossing - node_crossing)
+
+        if covered:
+            if compact:
+                # the world tile is split into the tiles of zoom 1, 
+                # so all tiles can be expanded with the recurrent helpers
+                tiles.update(((tx, ty, level),) if level else 
+                    ((x, y, 1) for x in range(2) for y in range(2)))
+            elif level == zoom:
+                tiles.add((tx, ty))
+            else:
+                tiles.update(iter_recurrent_tiles(tx, ty, level, zoom) 
+                    if level else ((x, y) for x in range(n) 
+                    for y in range(n)))
+            continue
+
+        if not node_edges:
+            continue
+
+        if level == zoom:
+            tiles.add((tx, ty, zoom) if compact else (tx, ty))
+            continue
+
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            stack.append((level + 1, tx * 2 + dx, ty * 2 + dy, 
+                node_edges, node_crossing))
+
+    return tiles
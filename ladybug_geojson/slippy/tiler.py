@@ -0,0 +1,386 @@
+# coding=utf-8
+'''Vector tiles from GeoJSON FeatureCollections.
+
+Each tile is a GeoJSON FeatureCollection with integer coordinates local to
+the tile, from 0 to extent. Features are clipped to the tile (plus a buffer)
+and simplified for the zoom of the tile.
+
+The tiles of each subtree at min_zoom can be kept in a TileCache, keyed by
+the hash of the features of the subtree and of the tile parameters, so a
+new run only clips the subtrees whose features changed.
+'''
+import hashlib
+import json
+import math
+import zipfile
+from pathlib import Path
+from typing import List, Optional
+from .cache import TileCache
+from .map import ( MAX_LATITUDE,
+    _check_zoom )
+
+POINT = 'Point'
+LINE = 'LineString'
+POLYGON = 'Polygon'
+
+'''____________PROJECTION____________'''
+
+def _project(pt) -> tuple:
+    '''Web Mercator position from 0 to 1 of a GeoJSON position.'''
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, pt[1]))
+    x = (pt[0] + 180.0) / 360.0
+    y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0
+    return (x, y)
+
+def _project_geometry(geometry: dict):
+    '''List of (kind, parts) from a GeoJSON geometry in Web Mercator.'''
+    if not geometry:
+        return []
+    tp = geometry.get('type')
+    coords = geometry.get('coordinates')
+    if tp == 'Point':
+        return [(POINT, [_project(coords)])]
+    if tp == 'MultiPoint':
+        return [(POINT, [_project(_) for _ in coords])]
+    if tp == 'LineString':
+        return [(LINE, [[_project(_) for _ in coords]])]
+    if tp == 'MultiLineString':
+        return [(LINE, [[_project(_) for _ in l] for l in coords])]
+    if tp == 'Polygon':
+        return [(POLYGON, [[[_project(_) for _ in r[:-1]] for r in coords]])]
+    if tp == 'MultiPolygon':
+        return [(POLYGON, [[[_project(_) for _ in r[:-1]] for r in p]
+            for p in coords])]
+    if tp == 'GeometryCollection':
+        return [_ for geo in geometry.get('geometries') or []
+            for _ in _project_geometry(geo)]
+    return []
+
+def _bbox(kind: str,
+    parts: list) -> tuple:
+    if kind == POINT:
+        pts = parts
+    elif kind == LINE:
+        pts = [pt for l in parts for pt in l]
+    else:
+        pts = [pt for p in parts for pt in p[0]]
+    xs, ys = [_[0] for _ in pts], [_[1] for _ in pts]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+'''____________CLIPPING____________'''
+
+def _clip_points(points: list,
+    box: tuple) -> list:
+    x0, y0, x1, y1 = box
+    return [p for p in points if x0 <= p[0] <= x1 and y0 <= p[1] <= y1]
+
+def _clip_line(line: list,
+    box: tuple) -> List[list]:
+    '''Clip a polyline with a box. A line can be split in many lines.'''
+    x0, y0, x1, y1 = box
+    res, current = [], []
+    for a, b in zip(line, line[1:]):
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        t0, t1 = 0.0, 1.0
+        for p, q in ((-dx, a[0] - x0), (dx, x1 - a[0]),
+            (-dy, a[1] - y0), (dy, y1 - a[1])):
+            if p == 0:
+                if q < 0:
+                    t0, t1 = 1.0, 0.0
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+        if t0 > t1:
+            if len(current) > 1:
+                res.append(current)
+            current = []
+            continue
+        start = a if t0 == 0.0 else (a[0] + t0 * dx, a[1] + t0 * dy)
+        end = b if t1 == 1.0 else (a[0] + t1 * dx, a[1] + t1 * dy)
+        if not current or current[-1] != start:
+            if len(current) > 1:
+                res.append(current)
+            current = [start]
+        current.append(end)
+    if len(current) > 1:
+        res.append(current)
+    return res
+
+def _clip_ring(ring: list,
+    box: tuple) -> list:
+    '''Sutherland-Hodgman clipping of an open ring with a box.'''
+    x0, y0, x1, y1 = box
+    for axis, value, keep_greater in ((0, x0, True), (0, x1, False),
+        (1, y0, True), (1, y1, False)):
+        if not ring:
+            break
+        inside = (lambda p: p[axis] >= value) if keep_greater \
+            else (lambda p: p[axis] <= value)
+        out, prev = [], ring[-1]
+        prev_in = inside(prev)
+        for cur in ring:
+            cur_in = inside(cur)
+            if cur_in != prev_in:
+                t = (value - prev[axis]) / (cur[axis] - prev[axis])
+                pt = (prev[0] + t * (cur[0] - prev[0]),
+                    prev[1] + t * (cur[1] - prev[1]))
+                out.append(pt)
+            if cur_in:
+                out.append(cur)
+            prev, prev_in = cur, cur_in
+        ring = out
+    return ring
+
+def _clip_feature(feature: tuple,
+    box: tuple) -> Optional[tuple]:
+    '''Clip a projected feature with a box. None if it is outside.'''
+    kind, parts, properties, bbox = feature
+    x0, y0, x1, y1 = box
+    if bbox[0] > x1 or bbox[2] < x0 or bbox[1] > y1 or bbox[3] < y0:
+        return None
+    if bbox[0] >= x0 and bbox[2] <= x1 and bbox[1] >= y0 and bbox[3] <= y1:
+        return feature
+
+    if kind == POINT:
+        parts = _clip_points(parts, box)
+    elif kind == LINE:
+        parts = [c for l in parts for c in _clip_line(l, box)]
+    else:
+        polygons = []
+        for p in parts:
+            boundary = _clip_ring(p[0], box)
+            if len(boundary) < 3:
+                continue
+            holes = [_clip_ring(_, box) for _ in p[1:]]
+            polygons.append([boundary] + [_ for _ in holes if len(_) > 2])
+        parts = polygons
+
+    if not parts:
+        return None
+    return (kind, parts, properties, _bbox(kind, parts))
+
+'''____________TILE ENCODING____________'''
+
+def _encode_feature(feature: tuple,
+    z: int, x: int, y: int,
+    extent: int,
+    tolerance: float) -> Optional[dict]:
+    '''GeoJSON Feature with tile-local integer coordinates.'''
+    # imported here to not load ladybug_geometry with the tiler
+    from .._geometry_helper import ( _simplify_line,
+        _simplify_polygons )
+
+    kind, parts, properties, _ = feature
+    scale = extent * 2 ** z
+    simplify = tolerance / scale
+
+    def _local(pt):
+        return [int(round(pt[0] * scale - x * extent)),
+            int(round(pt[1] * scale - y * extent))]
+
+    def _dedupe(pts):
+        out = []
+        for pt in pts:
+            if not out or out[-1] != pt:
+                out.append(pt)
+        return out
+
+    if kind == POINT:
+        coords = [_local(_) for _ in parts]
+        if len(coords) == 1:
+            return { 'type': 'Feature', 'properties': properties,
+                'geometry': { 'type': 'Point', 'coordinates': coords[0] } }
+        return { 'type': 'Feature', 'properties': properties,
+            'geometry': { 'type': 'MultiPoint', 'coordinates': coords } }
+
+    if kind == LINE:
+        lines = [_dedupe([_local(pt) for pt in _simplify_line(l, simplify)])
+            for l in parts]
+        lines = [_ for _ in lines if len(_) > 1]
+        if not lines:
+            return None
+        if len(lines) == 1:
+            return { 'type': 'Feature', 'properties': properties,
+                'geometry': { 'type': 'LineString',
+                'coordinates': lines[0] } }
+        return { 'type': 'Feature', 'properties': properties,
+            'geometry': { 'type': 'MultiLineString', 'coordinates': lines } }
+
+    closed = [[r + [r[0]] for r in p] for p in parts]
+    polygons = []
+    for p in _simplify_polygons(closed, simplify):
+        rings = [_dedupe([_local(pt) for pt in r]) for r in p]
+        # skip polygons smaller than the tile resolution
+        if len(rings[0]) < 4:
+            continue
+        polygons.append([rings[0]] + [r for r in rings[1:] if len(r) > 3])
+    if not polygons:
+        return None
+    if len(polygons) == 1:
+        return { 'type': 'Feature', 'properties': properties,
+            'geometry': { 'type': 'Polygon', 'coordinates': polygons[0] } }
+    return { 'type': 'Feature', 'properties': properties,
+        'geometry': { 'type': 'MultiPolygon', 'coordinates': polygons } }
+
+def _build_subtree(args: tuple) -> List[tuple]:
+    '''Tiles of a subtree. It returns a list of ((z, x, y), tile string).'''
+    z, x, y, features, max_zoom, extent, buffer, tolerance = args
+    res = []
+    stack = [(z, x, y, features)]
+    while stack:
+        z, x, y, features = stack.pop()
+        size = 1.0 / 2 ** z
+        pad = size * buffer / extent
+        box = (x * size - pad, y * size - pad,
+            (x + 1) * size + pad, (y + 1) * size + pad)
+
+        clipped = [_ for _ in (_clip_feature(ft, box) for ft in features)
+            if _ is not None]
+        if not clipped:
+            continue
+
+        encoded = [_ for _ in (_encode_feature(ft, z, x, y, extent, tolerance)
+            for ft in clipped) if _ is not None]
+        if encoded:
+            tile = { 'type': 'FeatureCollection', 'extent': extent,
+                'features': encoded }
+            res.append(((z, x, y), json.dumps(tile, separators=(',', ':'))))
+
+        if z < max_zoom:
+            for dx, dy in ((1, 1), (0, 1), (1, 0), (0, 0)):
+                stack.append((z + 1, x * 2 + dx, y * 2 + dy, clipped))
+    return res
+
+def _subtree_key(job: tuple) -> str:
+    '''Hash of the features and of the parameters of a subtree job.'''
+    _, _, _, features, max_zoom, extent, buffer, tolerance = job
+    data = json.dumps([features, max_zoom, extent, buffer, tolerance],
+        sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+def create_vector_tiles(json_string: str,
+    output: str,
+    min_zoom: int=1,
+    max_zoom: int=14,
+    extent: int=4096,
+    buffer: int=64,
+    tolerance: float=1.0,
+    archive: bool=False,
+    workers: int=1,
+    validation: bool=False,
+    cache: Optional[TileCache]=None) -> List[tuple]:
+    ''' Create vector tiles from a GeoJSON FeatureCollection.
+    Tiles are written as z/x/y.json files with integer coordinates local to
+    the tile. The pyramid of each tile at min_zoom is computed by a worker
+    process.
+
+    Args:
+    - json_string: GeoJSON FeatureCollection string.
+    - output: output folder or zip file path if archive.
+    - min_zoom: first zoom level from 1 to 23.
+    - max_zoom: last zoom level from 1 to 23.
+    - extent: size of the tile in integer coordinates.
+    - buffer: size of the buffer around the tile in integer coordinates.
+    - tolerance: simplification tolerance in integer coordinates.
+    - archive: set it to true to write a single zip file.
+    - workers: number of processes to use.
+    - validation: enable the validation using GeoJSON schema.
+    - cache: TileCache of the tiles of each subtree at min_zoom. Subtrees
+            with the same features and parameters are not built again.
+
+    Return:
+        a sorted list of (z, x, y) tiles written
+    '''
+    _check_zoom(min_zoom)
+    _check_zoom(max_zoom)
+    if min_zoom > max_zoom:
+        raise Exception('min zoom must be smaller than max zoom.')
+
+    # imported here to keep the slippy map module light
+    from .._geojson_helper import _run_validation
+    from .._validator import GeojSONTypes
+    obj, sel, err = _run_validation(json_string,
+        target=[GeojSONTypes.FEATURE_COLLECTION],
+        validation=validation)
+    if sel != GeojSONTypes.FEATURE_COLLECTION:
+        raise Exception(err or 'Geojson is not a FeatureCollection.')
+
+    features = []
+    for ft in obj.get('features') or []:
+        for kind, parts in _project_geometry(ft.get('geometry')):
+            if parts:
+                features.append((kind, parts, ft.get('properties'),
+                    _bbox(kind, parts)))
+
+    # tiles at min zoom with features. Boxes are expanded by the buffer,
+    # so features close to a tile are also in the buffer of its tiles
+    n = 2 ** min_zoom
+    pad = buffer / extent / n
+    roots = {}
+    for ft in features:
+        west, north, east, south = ft[3]
+        x0, x1 = max(int((west - pad) * n), 0), \
+            min(int((east + pad) * n), n - 1)
+        y0, y1 = max(int((north - pad) * n), 0), \
+            min(int((south + pad) * n), n - 1)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                roots.setdefault((x, y), []).append(ft)
+
+    jobs = [(min_zoom, x, y, fts, max_zoom, extent, buffer, tolerance)
+        for (x, y), fts in sorted(roots.items())]
+    keys, cached = [None] * len(jobs), []
+    if cache is not None:
+        missing = object()
+        todo, keys = [], []
+        for job in jobs:
+            key = _subtree_key(job)
+            tiles = cache.get(*job[:3], key, default=missing)
+            if tiles is missing:
+                todo.append(job)
+                keys.append(key)
+            else:
+                cached.append(tiles)
+        jobs = todo
+
+    if archive:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        zf = zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED)
+    else:
+        Path(output).mkdir(parents=True, exist_ok=True)
+
+    written = []
+    def _write(tiles, job=None, key=None):
+        if key is not None:
+            cache.put(*job[:3], tiles, key)
+        for (z, x, y), text in tiles:
+            name = f'{z}/{x}/{y}.json'
+            if archive:
+                zf.writestr(name, text)
+            else:
+                fp = Path(output, str(z), str(x))
+                fp.mkdir(parents=True, exist_ok=True)
+                fp.joinpath(f'{y}.json').write_text(text)
+            written.append((z, x, y))
+
+    try:
+        for tiles in cached:
+            _write(tiles)
+        if workers > 1 and len(jobs) > 1:
+            # imported here because multiprocessing is slow to import
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for job, key, tiles in zip(jobs, keys,
+                    executor.map(_build_subtree, jobs)):
+                    _write(tiles, job, key)
+        else:
+            for job, key in zip(jobs, keys):
+                _write(_build_subtree(job), job, key)
+    finally:
+        if archive:
+            zf.close()
+
+    return sorted(written)
@@ -14,10 +14,16 @@ setuptools.setup(
     long_description="Convert geojson types into ladybug geometry types.",
     long_description_content_type="text/plain",
     url="https://github.com/pollination/ladybug-geojson",
-    packages=setuptools.find_packages(exclude=["tests*"]),
+    packages=setuptools.find_packages(exclude=["tests*", "benchmarks*"]),
     include_package_data=True,
     python_requires=">=3.7",
     install_requires=requirements,
+    extras_require={
+        'arrow': ['pyarrow']
+    },
+    entry_points={
+        'console_scripts': ['ladybug-geojson = ladybug_geojson.cli:main']
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python :: 3.7",
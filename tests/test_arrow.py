@@ -0,0 +1,171 @@
+# coding=utf-8
+import json
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.convert.arrow import ( to_arrow_table,
+    from_arrow_table, write_arrow, read_arrow,
+    write_geoparquet, read_geoparquet )
+from ladybug_geojson.convert.wkb import _wkb, _from_wkb
+
+pa = pytest.importorskip('pyarrow')
+
+GEOMETRIES = [
+    { 'type': 'Point', 'coordinates': [1, 2] },
+    { 'type': 'MultiPoint', 'coordinates': [[1, 2], [3, 4, 5]] },
+    { 'type': 'LineString', 'coordinates': [[0, 0], [1, 1], [2, 0]] },
+    { 'type': 'MultiLineString', 'coordinates': [[[0, 0], [1, 1], [2, 0]],
+        [[0, 0], [1, 1]]] },
+    { 'type': 'Polygon', 'coordinates': [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[2, 2], [2, 4], [4, 4], [4, 2], [2, 2]]] },
+    { 'type': 'MultiPolygon', 'coordinates': [
+        [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+        [[[1, 0], [2, 0], [1, 1], [1, 0]]]] },
+    None
+]
+
+
+def _features(geometries, options=Options(validation=False)):
+    return [LadybugFeature(json.dumps({ 'type': 'Feature',
+        'properties': { 'n': i, 'tags': [i, 'a'] if i % 2 else 'b' },
+        'geometry': geo }), options)
+        for i, geo in enumerate(geometries)]
+
+
+def _same(a, b):
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(map(_same, a, b))
+    return a == b
+
+
+@pytest.mark.parametrize('encoding', [None, 'wkb'])
+def test_arrow_table(encoding):
+    features = _features(GEOMETRIES)
+    table = to_arrow_table(features, encoding)
+    field = table.schema.field('geometry')
+    assert field.metadata[b'ARROW:extension:name'] == b'geoarrow.wkb'
+
+    res = from_arrow_table(table)
+    assert len(res) == len(features)
+    for a, b in zip(features, res):
+        assert _same(a.geometry, b.geometry)
+    assert res[0].properties == { 'n': 0, 'tags': 'b' }
+    assert res[1].properties == { 'n': 1, 'tags': [1, 'a'] }
+
+
+@pytest.mark.parametrize('geo, name', [
+    (GEOMETRIES[0], 'point'),
+    (GEOMETRIES[1], 'multipoint'),
+    (GEOMETRIES[2], 'linestring'),
+    (GEOMETRIES[3], 'multilinestring'),
+    (GEOMETRIES[4], 'polygon'),
+    (GEOMETRIES[5], 'multipolygon')])
+def test_arrow_native(geo, name):
+    features = _features([geo, geo, None, geo])
+    table = to_arrow_table(features, 'native')
+    field = table.schema.field('geometry')
+    assert field.metadata[b'ARROW:extension:name'] == \
+        f'geoarrow.{name}'.encode()
+    assert table.column('geometry').null_count == 1
+
+    res = from_arrow_table(table)
+    for a, b in zip(features, res):
+        assert _same(a.geometry, b.geometry)
+
+    # offsets of sliced arrays
+    res = from_arrow_table(table.slice(2))
+    assert res[0].geometry is None
+    assert _same(res[1].geometry, features[3].geometry)
+
+
+def test_arrow_native_mixed():
+    with pytest.raises(ValueError):
+        to_arrow_table(_features(GEOMETRIES[:2]), 'native')
+
+
+def test_wkb_2d_big_endian():
+    # big endian 2D LineString
+    data = bytes.fromhex('000000000200000002') + \
+        bytes.fromhex('3ff0000000000000' '4000000000000000'
+        '4008000000000000' '4010000000000000')
+    tp, coords, end = _from_wkb(data)
+    assert tp.value == 'LineString'
+    assert coords == [[1, 2], [3, 4]]
+    assert end == len(data)
+
+    feature = _features([GEOMETRIES[4]])[0]
+    tp, coords, _ = _from_wkb(_wkb(feature.geometry))
+    assert tp.value == 'Polygon'
+    assert len(coords) == 2 and coords[0][0] == coords[0][-1]
+
+
+def test_arrow_file(tmp_path):
+    features = _features(GEOMETRIES[4:6] * 3)
+    fp = write_arrow(features, tmp_path / 'features.arrow')
+    res = read_arrow(fp)
+    assert len(res) == len(features)
+    for a, b in zip(features, res):
+        assert _same(a.geometry, b.geometry)
+
+
+def test_geoparquet(tmp_path):
+    pytest.importorskip('pyarrow.parquet')
+    import pyarrow.parquet as pq
+
+    features = _features(GEOMETRIES)
+    fp = write_geoparquet(features, tmp_path / 'features.parquet')
+    geo = json.loads(pq.read_schema(fp).metadata[b'geo'])
+    assert geo['primary_column'] == 'geometry'
+    column = geo['columns']['geometry']
+    assert column['encoding'] == 'WKB'
+    assert 'Polygon Z' in column['geometry_types']
+    assert column['bbox'] == [0, 0, 10, 10]
+
+    res = read_geoparquet(fp)
+    for a, b in zip(features, res):
+        assert _same(a.geometry, b.geometry)
+
+
+def test_wkb_ewkb_and_m():
+    # EWKB Point with SRID 4326
+    data = bytes.fromhex('0101000020E6100000') + \
+        bytes.fromhex('000000000000F03F' '0000000000000040')
+    tp, coords, end = _from_wkb(data)
+    assert tp.value == 'Point'
+    assert coords == [1, 2]
+    assert end == len(data)
+
+    # EWKB Point Z with SRID
+    data = bytes.fromhex('01010000A0E6100000') + \
+        bytes.fromhex('000000000000F03F' '0000000000000040' '0000000000000840')
+    assert _from_wkb(data)[1] == [1, 2, 3]
+
+    point = bytes.fromhex('000000000000F03F' '0000000000000040' '0000000000000840')
+    for code in ('D1070000', 'B90B0000', '01000040'):
+        # ISO XYM, ISO XYZM and EWKB M
+        with pytest.raises(ValueError):
+            _from_wkb(bytes.fromhex('01' + code) + point)
+    with pytest.raises(ValueError):
+        _from_wkb(bytes.fromhex('0108000000') + point)
+
+
+def test_arrow_properties(tmp_path):
+    pytest.importorskip('pyarrow.parquet')
+
+    properties = [
+        { 'a': { 'x': 1 }, 'b': 1, 'c': None, 'big': 2 ** 70 },
+        { 'a': { 'x': 2, 'y': [1, 2.5] }, 'c': 'x', 'd': None },
+        {},
+        None,
+        { 'b': 2, 'c': None, 'd': [] }
+    ]
+    features = [LadybugFeature.from_geometry(None, _) for _ in properties]
+    table = to_arrow_table(features)
+    assert table.schema.field('a').type == pa.string()
+
+    assert [_.properties for _ in from_arrow_table(table)] == properties
+    assert [_.properties for _ in from_arrow_table(table.slice(3))] == \
+        properties[3:]
+    fp = write_geoparquet(features, tmp_path / 'properties.parquet')
+    assert [_.properties for _ in read_geoparquet(fp)] == properties
@@ -0,0 +1,23 @@
+# coding=utf-8
+import json
+from benchmarks import generators
+from benchmarks.run import run
+
+
+def test_generators():
+    for func in (generators.points, generators.linestring,
+        generators.polygon_with_holes, generators.multipolygon,
+        generators.geometry_collection, generators.feature_collection):
+        assert func(5) == func(5)
+        assert func(5, seed=1) != func(5, seed=2)
+        assert 'type' in json.loads(func(5))
+
+
+def test_run():
+    results = run(sizes=[5], repeat=1, filter='to_point2d')
+    assert [_['name'] for _ in results] == \
+        ['to_point2d[validation]', 'to_point2d[no_validation]']
+    for res in results:
+        assert res['size'] == 5
+        assert res['seconds'] >= 0
+        assert res['peak_bytes'] > 0
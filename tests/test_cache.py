@@ -0,0 +1,97 @@
+# coding=utf-8
+import pytest
+import threading
+
+from ladybug_geojson.slippy.cache import ( TileCache,
+    cached_tile_from_lat_lon,
+    cached_tile_bounds )
+from ladybug_geojson.slippy.map import ( tile_from_lat_lon,
+    tile_bounds )
+from ladybug_geojson.convert.config import Options
+
+def test_cached_tile_math():
+    cached_tile_from_lat_lon.cache_clear()
+    coord = (41.894599, 12.483092)
+    assert cached_tile_from_lat_lon(*coord, 15) == tile_from_lat_lon(*coord, 15)
+    assert cached_tile_from_lat_lon(*coord, 15) == tile_from_lat_lon(*coord, 15)
+    assert cached_tile_from_lat_lon.cache_info().hits == 1
+
+    assert cached_tile_bounds(17520, 12173, 15) == tile_bounds(17520, 12173, 15)
+
+def test_tile_cache():
+    cache = TileCache(maxsize=2)
+    cache.put(15, 1, 1, 'a')
+    cache.put(15, 1, 2, 'b')
+    assert cache.get(15, 1, 1) == 'a'
+
+    # least recently used is removed
+    cache.put(15, 1, 3, 'c')
+    assert len(cache) == 2
+    assert cache.get(15, 1, 2) is None
+    assert (15, 1, 1) in cache
+    assert cache.hits == 1 and cache.misses == 1
+
+    # options are part of the key
+    cache.put(15, 1, 1, 'z', Options(z=5))
+    assert cache.get(15, 1, 1, Options(z=5)) == 'z'
+    assert cache.get(15, 1, 1, Options(z=4)) is None
+
+def test_tile_cache_compute_and_invalidate():
+    cache = TileCache()
+    calls = []
+    def func(z, x, y, options):
+        calls.append((z, x, y))
+        return (z, x, y)
+
+    def worker():
+        for x in range(10):
+            cache.get_or_compute(10, x, 0, func)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    [_.start() for _ in threads]
+    [_.join() for _ in threads]
+    assert len(cache) == 10
+    assert cache.get_or_compute(10, 3, 0, func) == (10, 3, 0)
+
+    cache.put(11, 6, 1, 'child')
+    cache.put(11, 8, 1, 'other')
+    assert cache.invalidate(10, 3, 0, children=True) == 2
+    assert cache.get(11, 8, 1) == 'other'
+    for args in ((10, 3), (10, None, 0), (None, 3, 0)):
+        with pytest.raises(ValueError):
+            cache.invalidate(*args)
+    assert len(cache) == 10
+    assert cache.invalidate(10) == 9
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        TileCache(0)
+
+
+def test_tile_cache_maxbytes():
+    cache = TileCache(maxbytes=10)
+    cache.put(15, 1, 1, 'aaaa')
+    cache.put(15, 1, 2, 'bbbb')
+    assert cache.nbytes == 8
+    assert cache.get(15, 1, 1) == 'aaaa'
+    cache.put(15, 1, 3, 'cccc')
+    assert cache.nbytes == 8
+    assert cache.get(15, 1, 2) is None
+    assert cache.get(15, 1, 1) == 'aaaa'
+
+    # replaced and too large values
+    cache.put(15, 1, 1, 'a')
+    assert cache.nbytes == 5
+    cache.put(15, 1, 4, 'x' * 11)
+    assert (15, 1, 4) not in cache and len(cache) == 2
+    assert cache.invalidate(15, 1, 1) == 1
+    assert cache.nbytes == 4
+
+    cache = TileCache(maxbytes=3, sizeof=lambda _: 1)
+    for x in range(5):
+        cache.put(15, x, 0, [x] * 100)
+    assert len(cache) == 3 and cache.nbytes == 3
+
+    with pytest.raises(ValueError):
+        TileCache(maxbytes=0)
@@ -0,0 +1,126 @@
+# coding=utf-8
+import json
+import pickle
+import pytest
+from ladybug_geojson.cli import ( main,
+    convert, _read_features )
+from ladybug_geojson.convert.conditions import _parse_where, _match
+from ladybug_geojson.ladybug_feature import LadybugFeature
+
+
+def _feature(i):
+    return { 'type': 'Feature', 'properties': { 'id': i,
+        'kind': 'road' if i % 2 else 'building', 'info': { 'lanes': i } },
+        'geometry': { 'type': 'Point', 'coordinates': [i, i] } }
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    folder = tmp_path.joinpath('data')
+    folder.mkdir()
+    folder.joinpath('a.geojson').write_text(json.dumps({
+        'type': 'FeatureCollection',
+        'features': [_feature(i) for i in range(5)] }))
+    lines = [json.dumps(_feature(i)) for i in range(5, 10)]
+    lines.append(json.dumps({ 'type': 'Feature', 'properties': {},
+        'geometry': { 'type': 'Unknown' } }))
+    folder.joinpath('b.geojsonl').write_text('\n'.join(lines) + '\n')
+    return folder
+
+
+def _records(path):
+    return [json.loads(_) for _ in path.read_text().splitlines()]
+
+
+def test_convert_json(inputs, tmp_path):
+    out = tmp_path.joinpath('out.jsonl')
+    assert main([str(inputs), '-o', str(out), '--chunk-size', '2', '-q']) == 0
+    records = _records(out)
+    assert [_['properties']['id'] for _ in records] == list(range(10))
+    assert records[0]['type'] == 'LadybugFeature'
+    assert records[0]['geometry']['type'] == 'Point3D'
+
+
+def test_convert_filters(inputs, tmp_path):
+    out = tmp_path.joinpath('out.jsonl')
+    main([str(inputs), '-o', str(out), '-q', '--bbox', '1', '1', '7', '7',
+        '--where', 'kind=road', '--where', 'info.lanes>=3'])
+    assert [_['properties']['id'] for _ in _records(out)] == [3, 5, 7]
+
+
+def test_convert_pickle_workers(inputs, tmp_path):
+    out = tmp_path.joinpath('out.pickle')
+    with open(out, 'wb') as f:
+        summary = convert([str(inputs)], f, fmt='pickle',
+            workers=2, chunk_size=3)
+    assert summary['read'] == 11
+    assert summary['written'] == 10
+    assert summary['invalid'] == 1
+    assert summary['features_per_second'] > 0
+
+    features = []
+    with open(out, 'rb') as f:
+        while True:
+            try:
+                features.append(pickle.load(f))
+            except EOFError:
+                break
+    assert all(isinstance(_, LadybugFeature) for _ in features)
+    assert [_.properties['id'] for _ in features] == list(range(10))
+
+
+def test_where():
+    props = { 'a': 1, 'b': { 'c': 'x' } }
+    assert _match(props, [_parse_where('a=1')])
+    assert _match(props, [_parse_where('b.c != y')])
+    assert not _match(props, [_parse_where('a>x')])
+    assert not _match(props, [_parse_where('d=1')])
+    with pytest.raises(ValueError):
+        _parse_where('nothing')
+
+
+def test_read_features(tmp_path):
+    fc = tmp_path.joinpath('fc.geojson')
+    fc.write_text(json.dumps({ 'type': 'FeatureCollection',
+        'name': '{ not a feature }',
+        'features': [_feature(i) for i in range(3)] }))
+    items = list(_read_features(fc))
+    assert all(isinstance(_, str) for _ in items)
+    assert [json.loads(_) for _ in items] == [_feature(i) for i in range(3)]
+
+    bare = tmp_path.joinpath('feature.geojson')
+    bare.write_text(json.dumps(_feature(0)))
+    assert list(_read_features(bare)) == [_feature(0)]
+
+    geo = tmp_path.joinpath('geometry.json')
+    geo.write_text(json.dumps(_feature(1)['geometry']))
+    assert list(_read_features(geo)) == [{ 'type': 'Feature',
+        'geometry': _feature(1)['geometry'], 'properties': {} }]
+
+    empty = tmp_path.joinpath('empty.geojson')
+    empty.write_text('')
+    assert list(_read_features(empty)) == []
+
+
+def test_validate_modes(tmp_path):
+    geometries = [
+        { 'type': 'Point', 'coordinates': [1, 2] },
+        { 'type': 'Point', 'coordinates': [True, False] },
+        { 'type': 'Polygon', 'coordinates': [[[0, 0], [1, 0], [1, 1]]] },
+        { 'type': 'MultiLineString', 'coordinates': [[0, 0], [1, 1]] },
+        { 'type': 'LineString', 'coordinates': [[0, 0], [1, 1, 1]] },
+        None
+    ]
+    fp = tmp_path.joinpath('a.geojsonl')
+    fp.write_text('\n'.join(json.dumps({ 'type': 'Feature',
+        'properties': { 'id': i }, 'geometry': geo })
+        for i, geo in enumerate(geometries)))
+
+    written = {}
+    for mode in ('full', 'fast', 'off'):
+        out = tmp_path.joinpath(f'{mode}.jsonl')
+        main([str(fp), '-o', str(out), '-q', '--validate', mode])
+        written[mode] = [_['properties']['id'] for _ in _records(out)]
+    assert written['fast'] == written['full'] == [0, 4]
+    # booleans are numbers for the conversion
+    assert written['off'] == [0, 1, 4, 5]
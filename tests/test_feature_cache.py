@@ -0,0 +1,96 @@
+# coding=utf-8
+import json
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.convert.feature_cache import ( write_feature_cache,
+    FeatureCache )
+try:
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.polyline import Polyline3D
+    from ladybug_geometry.geometry3d.face import Face3D
+    from ladybug_geometry.geometry3d.polyface import Polyface3D
+except ImportError as e:
+    raise ImportError(
+        f'Failed to import ladybug_geometry.\n{e}')
+
+GEOMETRIES = [
+    { 'type': 'Point', 'coordinates': [1, 2] },
+    { 'type': 'MultiPoint', 'coordinates': [[1, 2], [3, 4, 5]] },
+    { 'type': 'LineString', 'coordinates': [[0, 0], [1, 1]] },
+    { 'type': 'MultiLineString', 'coordinates': [[[0, 0], [1, 1], [2, 0]],
+        [[0, 0], [1, 1]]] },
+    { 'type': 'Polygon', 'coordinates': [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[2, 2], [2, 4], [4, 4], [4, 2], [2, 2]]] },
+    { 'type': 'MultiPolygon', 'coordinates': [
+        [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+        [[[1, 0], [2, 0], [1, 1], [1, 0]]]] },
+    None
+]
+
+
+def _features(options):
+    return [LadybugFeature(json.dumps({ 'type': 'Feature',
+        'properties': { 'n': i, 'name': f'é{i}' }, 'geometry': geo }), options)
+        for i, geo in enumerate(GEOMETRIES)]
+
+
+@pytest.mark.parametrize('merge_faces', [False, True])
+def test_feature_cache(tmp_path, merge_faces):
+    options = Options(validation=False, merge_faces=merge_faces)
+    features = _features(options)
+    fp = write_feature_cache(features, tmp_path.joinpath('cache.lbgj'))
+
+    with FeatureCache(fp) as cache:
+        assert len(cache) == len(features)
+        for expected, ft in zip(features, cache):
+            assert ft.properties == expected.properties
+            assert ft.geometry == expected.geometry
+            assert type(ft.geometry) == type(expected.geometry)
+
+        face = cache.geometry(4)
+        assert isinstance(face, Face3D)
+        assert face.holes == features[4].geometry.holes
+        assert face.vertices == features[4].geometry.vertices
+        assert cache[-1].geometry is None
+        assert cache.properties(1) == { 'n': 1, 'name': 'é1' }
+        assert type(cache.geometry(5)) == \
+            (Polyface3D if merge_faces else list)
+
+        with pytest.raises(IndexError):
+            cache.get(len(features))
+
+
+def test_feature_cache_polyface(tmp_path):
+    # vertices are not in the order of Polyface3D.from_faces
+    vertices = [Point3D(2, 2), Point3D(2, 0), Point3D(1, 1), Point3D(0, 0),
+        Point3D(2, 1), Point3D(1, 0), Point3D(1, 2), Point3D(0, 2)]
+    face_indices = [[(3, 5, 2)], [(5, 1, 4, 2)], [(2, 4, 0, 6, 7)]]
+    polyface = Polyface3D(vertices, face_indices)
+    fp = write_feature_cache([LadybugFeature.from_geometry(polyface)],
+        tmp_path.joinpath('cache.lbgj'))
+    with FeatureCache(fp) as cache:
+        geo = cache.geometry(0)
+    assert geo == polyface
+    assert geo.vertices == polyface.vertices
+    assert geo.face_indices == polyface.face_indices
+    assert geo.edge_indices == polyface.edge_indices
+    assert geo.edge_types == polyface.edge_types
+
+
+def test_feature_cache_interpolated(tmp_path):
+    pl = Polyline3D([Point3D(0, 0), Point3D(1, 1), Point3D(2, 0)],
+        interpolated=True)
+    fp = write_feature_cache([LadybugFeature.from_geometry(pl)],
+        tmp_path.joinpath('cache.lbgj'))
+    with FeatureCache(fp) as cache:
+        assert cache[0].geometry.interpolated
+        assert cache[0].properties is None
+
+
+def test_invalid_cache(tmp_path):
+    fp = tmp_path.joinpath('cache.lbgj')
+    fp.write_bytes(b'not a cache' * 10)
+    with pytest.raises(ValueError):
+        FeatureCache(fp)
@@ -0,0 +1,102 @@
+# coding=utf-8
+import json
+import os
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.convert.feature_index import ( index_features,
+    FeatureFile, iter_feature_spans )
+
+
+def _feature(i):
+    return { 'type': 'Feature', 'id': f'f{i}',
+        'properties': { 'code': i, 'text': 'braces {[ in "strings" ]}' },
+        'geometry': { 'type': 'Point', 'coordinates': [i, -i] } }
+
+
+@pytest.fixture
+def geojson(tmp_path):
+    fc = { 'type': 'FeatureCollection', 'name': 'features',
+        'bbox': [0, -9, 9, 0],
+        'features': [_feature(i) for i in range(10)] }
+    fc['features'].append({ 'type': 'Feature', 'properties': { 'code': 10 },
+        'geometry': None })
+    fp = tmp_path.joinpath('data.geojson')
+    fp.write_text(json.dumps(fc, indent=2))
+    return fp
+
+
+def test_spans(geojson):
+    data = geojson.read_bytes()
+    features = [json.loads(data[a:b]) for a, b in iter_feature_spans(data)]
+    assert features == json.loads(data)['features']
+
+    # raised before the iteration
+    with pytest.raises(ValueError):
+        iter_feature_spans(b'{"type": "Feature"}')
+    with pytest.raises(ValueError):
+        list(iter_feature_spans(b'{"features": [{"type": "Feature"'))
+
+
+def test_feature_file(geojson):
+    index = index_features(geojson)
+    assert index.name == 'data.geojson.idx'
+
+    with FeatureFile(geojson, options=Options(validation=False)) as ff:
+        assert len(ff) == 11
+        assert ff.ids[:2] == ['f0', 'f1']
+        assert ff.ids[10] is None
+        assert json.loads(ff.get_json(3)) == _feature(3)
+
+        ft = ff.get(-2)
+        assert ft.properties['code'] == 9
+        assert ft.geometry.x == 9
+
+        assert ff.get_by_id('f5').properties['code'] == 5
+        assert ff.get_by_id('missing') is None
+        assert ff.bbox(2) == (2, -2, 2, -2)
+        assert ff.bbox(10) is None
+        assert ff.query((1.5, -4.5, 4.5, 0)) == [2, 3, 4]
+
+        with pytest.raises(IndexError):
+            ff.get(11)
+
+
+def test_id_property(geojson, tmp_path):
+    index = index_features(geojson, tmp_path.joinpath('codes.idx'),
+        id_property='code')
+    with FeatureFile(geojson, index) as ff:
+        assert ff.ids == list(range(11))
+        assert ff.position(7) == 7
+
+
+def test_stale_index(geojson):
+    index_features(geojson)
+    geojson.write_text(geojson.read_text() + '\n')
+    with pytest.raises(ValueError):
+        FeatureFile(geojson)
+    os.remove(str(geojson) + '.idx')
+    with FeatureFile(geojson) as ff:
+        assert len(ff) == 11
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_read_features_parallel(geojson, indexed):
+    from ladybug_geojson.ladybug_feature import LadybugFeature
+    from ladybug_geojson.convert.feature_index import ( _ranges,
+        read_features_parallel )
+
+    if indexed:
+        index_features(geojson)
+    options = Options(validation=False)
+    expected = LadybugFeature.from_featurecollection(geojson.read_text(),
+        options)
+    # more ranges than the 4 pending ranges of 2 workers
+    assert len(list(_ranges(geojson, 200))) > 4
+    features = read_features_parallel(geojson, options,
+        workers=2, chunk_bytes=200)
+    assert [_.properties for _ in features] == \
+        [_.properties for _ in expected]
+    assert [_.geometry for _ in features] == [_.geometry for _ in expected]
+
+    features = read_features_parallel(geojson, options, workers=1)
+    assert len(features) == 11
@@ -0,0 +1,115 @@
+# coding=utf-8
+import json
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.convert.feature_store import FeatureStore
+from ladybug_geojson.convert.wkb import _geojson_wkb, _from_wkb
+
+
+def _square(x, y, size=1):
+    return [[[x, y], [x + size, y], [x + size, y + size],
+        [x, y + size], [x, y]]]
+
+
+FEATURES = [
+    { 'type': 'Feature', 'id': f'b{i}',
+        'properties': { 'height': i * 5, 'use': 'house' if i % 2 else 'shop',
+            'meta': { 'floors': i } },
+        'geometry': { 'type': 'Polygon', 'coordinates': _square(i * 2, 0) } }
+    for i in range(10)
+] + [
+    { 'type': 'Feature', 'id': 'road', 'properties': { 'name': None },
+        'geometry': { 'type': 'LineString',
+            'coordinates': [[0, 5, 1], [20, 5, 2]] } },
+    { 'type': 'Feature', 'id': 'empty', 'properties': {}, 'geometry': None },
+    { 'type': 'Feature', 'id': 'bad', 'properties': {},
+        'geometry': { 'type': 'Circle', 'coordinates': [0, 0] } }
+]
+
+
+@pytest.mark.parametrize('geo', [
+    { 'type': 'Point', 'coordinates': [1, 2] },
+    { 'type': 'MultiPoint', 'coordinates': [[1, 2], [3, 4, 5]] },
+    { 'type': 'MultiLineString', 'coordinates': [[[0, 0], [1, 1]]] },
+    { 'type': 'MultiPolygon', 'coordinates': [_square(0, 0)] },
+    { 'type': 'GeometryCollection', 'geometries': [
+        { 'type': 'Point', 'coordinates': [1, 2] },
+        { 'type': 'LineString', 'coordinates': [[0, 0], [1, 1, 1]] }] }])
+def test_geojson_wkb(geo):
+    blob = _geojson_wkb(geo)
+    tp, coords, end = _from_wkb(blob)
+    assert tp.value == geo['type']
+    assert end == len(blob)
+    if tp.value == 'MultiPoint':
+        assert coords == [[1, 2, 0], [3, 4, 5]]
+    elif tp.value == 'GeometryCollection':
+        assert [_[0].value for _ in coords] == ['Point', 'LineString']
+        # missing z of 3D collections is 0
+        assert coords[0][1] == [1, 2, 0]
+    else:
+        assert coords == geo['coordinates']
+
+
+def test_feature_store(tmp_path):
+    fp = tmp_path / 'city.geojson'
+    fp.write_text(json.dumps({ 'type': 'FeatureCollection',
+        'features': FEATURES }))
+    db = tmp_path / 'city.sqlite'
+    options = Options(validation=False)
+
+    with FeatureStore(db, options) as store:
+        assert store.load(fp, batch_size=3) == 12
+        assert len(store) == 12
+
+    # features are stored in the file
+    with FeatureStore(db, options) as store:
+        assert len(store) == 12
+        assert store.ids(bbox=(3.5, 0.5, 6.2, 0.6)) == ['b2', 'b3']
+        # exact boxes: b3 ends at 7
+        assert store.ids(bbox=(7.0000001, 0, 7.5, 1)) == []
+        assert store.count(bbox=(0, 4, 100, 6)) == 1
+        assert store.ids(where=['height>=35', 'use=house']) == ['b7', 'b9']
+        assert store.ids(where=['meta.floors<2']) == ['b0', 'b1']
+        assert store.ids(where=['name=null']) == ['road']
+        assert store.ids(bbox=(0, -1, 100, 10), where=['use!=house'],
+            ) == ['b0', 'b2', 'b4', 'b6', 'b8']
+
+        features = store.query(bbox=(0, 0, 3, 1))
+        assert not isinstance(features, list)
+        features = list(features)
+        assert len(features) == 2
+        assert features[0].properties['use'] == 'shop'
+        assert len(list(store.query(limit=2))) == 2
+
+        for ft in FEATURES[:-1]:
+            res = store.get(ft['id'])
+            expected = LadybugFeature(json.dumps(ft), options)
+            assert res.geometry == expected.geometry
+        assert store.get('empty').geometry is None
+        assert store.get('bad') is None
+
+
+def test_feature_store_memory():
+    with FeatureStore(':memory:') as store:
+        assert store.load(iter(FEATURES[:4]), id_property='height') == 4
+        assert store.load(FEATURES[4:6], id_property='height') == 2
+        assert store.ids() == [0, 5, 10, 15, 20, 25]
+        assert store.get(10).properties['meta'] == { 'floors': 2 }
+        with pytest.raises(ValueError):
+            store.load(FEATURES, batch_size=0)
+
+
+def test_feature_store_empty_file(tmp_path):
+    from ladybug_geojson.convert.incremental import IncrementalConverter
+    fp = tmp_path / 'empty.geojson'
+    fp.write_bytes(b'')
+    with FeatureStore(':memory:') as store:
+        with pytest.raises(ValueError):
+            store.load(fp)
+        assert len(store) == 0
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        converter.update(FEATURES[:2])
+        with pytest.raises(ValueError):
+            converter.update(fp)
+        assert len(converter) == 2
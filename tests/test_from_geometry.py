@@ -7,12 +7,34 @@ try:
     from ladybug_geometry.geometry2d.pointvector import Vector2D, Point2D
     from ladybug_geometry.geometry2d.arc import Arc2D
     from ladybug_geometry.geometry2d.polyline import Polyline2D
+    from ladybug_geometry.geometry2d.polygon import Polygon2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.polyline import Polyline3D
+    from ladybug_geometry.geometry3d.mesh import Mesh3D
+    from ladybug_geometry.geometry3d.face import Face3D
+    from ladybug_geometry.geometry3d.polyface import Polyface3D
 except ImportError as e:
     raise ImportError(
         f'Failed to import ladybug_geometry.\n{e}')
 
 from ladybug_geojson.convert.from_geometry import (
-  from_arc_2d
+  from_arc_2d,
+  from_point2d,
+  from_point3d,
+  from_polyline2d,
+  from_polyline3d,
+  from_polygon2d,
+  from_face3d,
+  from_polyface3d,
+  from_mesh3d,
+  from_geometries,
+  from_features
+)
+from ladybug_geojson.convert.geojson import from_geojson
+from ladybug_geojson.convert.to_geometry import (
+  to_point3d,
+  to_polyline3d,
+  to_face3d
 )
 
 def test_from_arc():
@@ -24,4 +46,130 @@ def test_from_arc():
 
     obj = json.loads(geojson_string)
     assert isinstance(obj, dict)
-    assert obj.get('coordinates')[0][0] == first_pt
\ No newline at end of file
+    assert obj.get('coordinates')[0][0] == first_pt
+
+def test_from_arc_precision():
+    arc = Arc2D(Point2D(0,0), 10)
+
+    geojson_string = from_arc_2d(arc=arc, 
+        divisions=4,
+        precision=2)
+
+    obj = json.loads(geojson_string)
+    assert obj.get('coordinates')[0][1] == [0.0, 10.0]
+    assert '-0.0' not in geojson_string
+
+
+def test_from_point():
+    geojson_string = from_point2d(Point2D(1, 2), validation=True)
+    assert json.loads(geojson_string) == {
+        'type': 'Point', 'coordinates': [1.0, 2.0] }
+
+    pts = [Point3D(1, 2, 3), Point3D(4, 5, 6)]
+    geojson_string = from_point3d(pts, validation=True)
+    assert json.loads(geojson_string).get('type') == 'MultiPoint'
+    assert to_point3d(geojson_string) == pts
+
+
+def test_from_polyline():
+    pl = Polyline2D([Point2D(0, 0), Point2D(1, 0), Point2D(1, 1)])
+    obj = json.loads(from_polyline2d(pl))
+    assert obj == { 'type': 'LineString', 
+        'coordinates': [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]] }
+
+    pl = Polyline3D([Point3D(0, 0, 1), Point3D(1, 0, 1), Point3D(1, 1, 1)])
+    geojson_string = from_polyline3d([pl, pl], validation=True)
+    assert json.loads(geojson_string).get('type') == 'MultiLineString'
+    assert to_polyline3d(geojson_string) == [pl, pl]
+
+
+def test_from_polygon():
+    polygon = Polygon2D([Point2D(0, 0), Point2D(1, 0), Point2D(1, 1)])
+    obj = json.loads(from_polygon2d(polygon, validation=True))
+    assert obj.get('coordinates') == [[[0.0, 0.0], [1.0, 0.0], 
+        [1.0, 1.0], [0.0, 0.0]]]
+
+    boundary = [Point3D(0, 0), Point3D(10, 0), Point3D(10, 10), Point3D(0, 10)]
+    hole = [Point3D(2, 2), Point3D(4, 2), Point3D(4, 4)]
+    face = Face3D(boundary, holes=[hole])
+    geojson_string = from_face3d(face, validation=True)
+    obj = json.loads(geojson_string)
+    assert obj.get('type') == 'Polygon'
+    assert len(obj.get('coordinates')) == 2
+    assert to_face3d(geojson_string).vertices == face.vertices
+
+    polyface = Polyface3D.from_faces([Face3D(boundary)], 0.01)
+    obj = json.loads(from_polyface3d(polyface, validation=True))
+    assert obj.get('type') == 'MultiPolygon'
+
+    mesh = Mesh3D(boundary, [(0, 1, 2), (0, 2, 3)])
+    obj = json.loads(from_mesh3d(mesh, validation=True))
+    assert obj.get('type') == 'MultiPolygon'
+    assert len(obj.get('coordinates')) == 2
+    assert obj.get('coordinates')[0][0][-1] == [0.0, 0.0, 0.0]
+
+
+def test_from_geometries():
+    arcs = [Arc2D(Point2D(0, 0), 10), 
+        Arc2D(Point2D(0, 0), 5, 0, math.pi)]
+    geojson_string = from_geometries(arcs + [Point2D(1, 1)], 
+        validation=True,
+        divisions=4)
+
+    obj = json.loads(geojson_string)
+    assert obj.get('type') == 'GeometryCollection'
+    assert [_.get('type') for _ in obj.get('geometries')] == \
+        ['Polygon', 'LineString', 'Point']
+
+    # a list inside the collection is a multi geometry
+    obj = json.loads(from_geometries([[Point2D(1, 1), Point2D(2, 2)]]))
+    assert obj.get('geometries')[0].get('type') == 'MultiPoint'
+
+
+def test_from_features():
+    pts = [Point3D(1, 2, 3), Point3D(4, 5, 6)]
+    geojson_string = from_features(pts, 
+        properties=[{'id': 1}, {'id': 2}],
+        validation=True)
+    
+    features = from_geojson(geojson_string)
+    assert [_.geometry for _ in features] == pts
+    assert features[1].properties == {'id': 2}
+
+    # LadybugFeature keeps its properties
+    obj = json.loads(from_features(features))
+    assert obj.get('features')[0].get('properties') == {'id': 1}
+
+    with pytest.raises(ValueError):
+        from_features(pts, properties=[{}])
+
+
+def test_from_arc_tolerance():
+    tolerance = 0.01
+    for radius in [0.05, 1, 100]:
+        arc = Arc2D(Point2D(0, 0), radius)
+        obj = json.loads(from_arc_2d(arc, tolerance=tolerance))
+        ring = obj.get('coordinates')[0]
+        assert ring[0] == ring[-1]
+        assert len(ring) >= 4
+
+        # the middle of each chord is within tolerance
+        for p1, p2 in zip(ring[:-1], ring[1:]):
+            mid = ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
+            assert radius - math.hypot(*mid) <= tolerance + 1e-9
+
+    small = json.loads(from_arc_2d(Arc2D(Point2D(0, 0), 0.05), 
+        tolerance=tolerance))
+    large = json.loads(from_arc_2d(Arc2D(Point2D(0, 0), 100), 
+        tolerance=tolerance))
+    assert len(small.get('coordinates')[0]) < 20
+    assert len(large.get('coordinates')[0]) > 20
+
+    arc = Arc2D(Point2D(0, 0), 10, 0, math.pi / 2)
+    obj = json.loads(from_arc_2d(arc, divisions=4))
+    assert obj.get('type') == 'LineString'
+    assert len(obj.get('coordinates')) == 5
+    assert obj.get('coordinates')[-1] == pytest.approx([0, 10])
+
+    with pytest.raises(ValueError):
+        from_arc_2d(arc, tolerance=0)
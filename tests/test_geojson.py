@@ -85,4 +85,14 @@ def test_from_file():
     objs = from_file(full_path)
     print(len(objs))
     assert type(objs[0].geometry) == Face3D
-    assert objs[30].properties['name'] == 'Larino'
\ No newline at end of file
+    assert objs[30].properties['name'] == 'Larino'
+
+def test_options_to_children():
+    geojson = '''
+    { "type": "Feature",
+    "geometry": {"type": "Point", "coordinates": [102.0, 0.5]},
+    "properties": {"prop0": "value0"}
+    }'''
+
+    obj = from_geojson(geojson, Options(z=5.0))
+    assert obj.geometry == Point3D(102.0, 0.5, 5.0)
@@ -0,0 +1,36 @@
+# coding=utf-8
+import subprocess
+import sys
+import pytest
+import ladybug_geojson
+from ladybug_geojson.convert.to_geometry import to_face3d
+
+HEAVY = ['jsonschema', 'ladybug_geometry']
+
+
+def _loaded(module):
+    script = (f'import sys\nimport {module}\n'
+        f'print(",".join(_ for _ in {HEAVY!r} if _ in sys.modules))')
+    out = subprocess.run([sys.executable, '-c', script],
+        capture_output=True, text=True, check=True)
+    return [_ for _ in out.stdout.strip().split(',') if _]
+
+
+@pytest.mark.parametrize('module', ['ladybug_geojson',
+    'ladybug_geojson.slippy.map',
+    'ladybug_geojson.slippy.index',
+    'ladybug_geojson.slippy.tiler'])
+def test_light_modules(module):
+    assert _loaded(module) == []
+
+
+def test_converters_skip_jsonschema():
+    assert _loaded('ladybug_geojson.convert.geojson') == ['ladybug_geometry']
+
+
+def test_lazy_api():
+    assert ladybug_geojson.to_face3d is to_face3d
+    assert 'from_geojson' in dir(ladybug_geojson)
+    assert 'LadybugFeature' in ladybug_geojson.__all__
+    with pytest.raises(AttributeError):
+        ladybug_geojson.not_a_function
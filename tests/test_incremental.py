@@ -0,0 +1,176 @@
+# coding=utf-8
+import json
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.convert import incremental
+from ladybug_geojson.convert.incremental import ( IncrementalConverter,
+    HASH_KEY_PREFIX )
+from ladybug_geojson import instrumentation
+
+
+def _feature(i, x=0, **properties):
+    return { 'type': 'Feature', 'id': f'p{i}',
+        'properties': { 'n': i, **properties },
+        'geometry': { 'type': 'Polygon', 'coordinates': [[[x + i, 0],
+            [x + i + 1, 0], [x + i + 1, 1], [x + i, 1], [x + i, 0]]] } }
+
+
+def test_incremental(tmp_path):
+    manifest = tmp_path / 'parcels.manifest'
+    features = [_feature(i) for i in range(20)]
+    fp = tmp_path / 'parcels.geojson'
+    fp.write_text(json.dumps({ 'type': 'FeatureCollection',
+        'features': features }))
+
+    with IncrementalConverter(manifest) as converter:
+        report = converter.update(fp, batch_size=7)
+        assert report['added'] == [f'p{i}' for i in range(20)]
+        assert report['changed'] == report['removed'] == []
+        assert report['unchanged'] == 0
+        assert len(converter) == 20
+
+    # next day: one changed, one removed, one added, property order changed
+    features[3] = _feature(3, x=100)
+    del features[5]
+    features.append(_feature(20))
+    features[0] = { k: features[0][k] for k in reversed(list(features[0])) }
+
+    with IncrementalConverter(manifest) as converter:
+        with instrumentation.record() as rec:
+            report = converter.update(features)
+        assert report['added'] == ['p20']
+        assert report['changed'] == ['p3']
+        assert report['removed'] == ['p5']
+        assert report['unchanged'] == 18
+        assert rec.calls['incremental.convert'] == 2
+        assert converter.get('p5') is None
+        assert converter.get('p3').geometry.min.x == 103
+        assert len(list(converter)) == len(converter) == 20
+
+        # nothing changed
+        report = converter.update(features)
+        assert report['unchanged'] == 20
+        assert not report['added'] + report['changed'] + report['removed']
+
+    # other options change all features
+    with IncrementalConverter(manifest, Options(z=5)) as converter:
+        report = converter.update(features)
+        assert len(report['changed']) == 20
+        assert converter.get('p1').geometry.min.z == 5
+
+
+def test_incremental_keys(tmp_path):
+    features = [_feature(i, key=f'k{i}') for i in range(3)]
+    with IncrementalConverter(tmp_path / 'm', id_property='key') as converter:
+        assert converter.update(features)['added'] == ['k0', 'k1', 'k2']
+        # repeated ids: the last one is kept
+        report = converter.update(features + [_feature(9, key='k0')])
+        assert report['changed'] == ['k0']
+        assert converter.get('k0').properties['n'] == 9
+        with pytest.raises(ValueError):
+            converter.update(features, batch_size=0)
+
+    for ft in features:
+        del ft['id']
+    with IncrementalConverter(tmp_path / 'n') as converter:
+        report = converter.update(features)
+        assert all(_.startswith(HASH_KEY_PREFIX) for _ in report['added'])
+        features[0]['properties']['n'] = 10
+        report = converter.update(features)
+        assert len(report['added']) == len(report['removed']) == 1
+        assert report['unchanged'] == 2
+
+
+def test_incremental_versions(tmp_path, monkeypatch):
+    features = [_feature(i) for i in range(3)]
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        converter.update(features)
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        assert converter.update(features)['unchanged'] == 3
+
+    # a new manifest version is emptied and converts all features again
+    monkeypatch.setattr(incremental, 'VERSION', incremental.VERSION + 1)
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        assert len(converter) == 0
+        report = converter.update(features)
+        assert report['added'] == ['p0', 'p1', 'p2']
+
+
+def test_incremental_package_versions(tmp_path, monkeypatch):
+    versions = incremental._versions()
+    # ladybug-geometry is installed with the package
+    assert versions['ladybug-geometry']
+    assert 'ladybug-geojson' in versions
+
+    features = [_feature(i) for i in range(3)]
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        converter.update(features)
+
+    # an upgrade of ladybug-geometry converts all features again
+    package_version = incremental._package_version
+    monkeypatch.setattr(incremental, '_package_version',
+        lambda name: 'upgraded' if name == 'ladybug-geometry'
+        else package_version(name))
+    with IncrementalConverter(tmp_path / 'm') as converter:
+        report = converter.update(features)
+        assert report['changed'] == ['p0', 'p1', 'p2']
+
+
+@pytest.mark.parametrize('merge_faces', [False, True])
+def test_incremental_geometries(tmp_path, merge_faces):
+    from ladybug_geojson.ladybug_feature import LadybugFeature
+    geometries = [
+        { 'type': 'Point', 'coordinates': [1, 2] },
+        { 'type': 'MultiLineString', 'coordinates': [[[0, 0], [1, 1]],
+            [[0, 0], [1, 1], [2, 0]]] },
+        { 'type': 'MultiPolygon', 'coordinates': [
+            [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+            [[[1, 0], [2, 0], [1, 1], [1, 0]]]] },
+        None
+    ]
+    features = [{ 'type': 'Feature', 'id': i, 'geometry': geo,
+        'properties': { 'n': i, 'nested': { 'a': [i] } } }
+        for i, geo in enumerate(geometries)]
+    options = Options(merge_faces=merge_faces)
+    with IncrementalConverter(tmp_path / 'm', options) as converter:
+        converter.update(features)
+    with IncrementalConverter(tmp_path / 'm', options) as converter:
+        for ft in features:
+            expected = LadybugFeature(json.dumps(ft), options)
+            stored = converter.get(ft['id'])
+            assert stored.geometry == expected.geometry
+            assert type(stored.geometry) == type(expected.geometry)
+            assert stored.properties == expected.properties
+
+
+def test_incremental_old_manifest(tmp_path):
+    import sqlite3
+    manifest = tmp_path / 'm'
+    con = sqlite3.connect(str(manifest))
+    con.execute('CREATE TABLE manifest (fid PRIMARY KEY, '
+        'hash TEXT NOT NULL, feature BLOB NOT NULL)')
+    con.execute("INSERT INTO manifest VALUES ('p0', 'x', x'00')")
+    con.commit()
+    con.close()
+    # features of other manifest versions are converted again
+    with IncrementalConverter(manifest) as converter:
+        assert len(converter) == 0
+        assert converter.update([_feature(0)])['added'] == ['p0']
+        assert converter.get('p0').properties == { 'n': 0 }
+
+
+def test_incremental_transaction(tmp_path):
+    features = [_feature(i) for i in range(4)]
+    with IncrementalConverter(tmp_path / 'm',
+        Options(validation=False)) as converter:
+        converter.update(features[:2])
+        invalid = _feature(9)
+        invalid['geometry']['coordinates'] = [[[0]]]
+        # a failed update does not change the manifest
+        with pytest.raises(IndexError):
+            converter.update(features[2:] + [invalid], batch_size=1)
+        assert converter.ids() == ['p0', 'p1']
+
+        report = converter.update(features[2:])
+        assert report['added'] == ['p2', 'p3']
+        assert report['removed'] == ['p0', 'p1']
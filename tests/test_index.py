@@ -0,0 +1,69 @@
+# coding=utf-8
+import pytest
+import json
+
+from ladybug_geojson.slippy.index import TileIndex, feature_bbox
+from ladybug_geojson.slippy.map import ( quadkey_from_tile,
+    tile_from_quadkey,
+    morton_from_tile,
+    tile_from_morton,
+    tile_from_lat_lon,
+    iter_recurrent_tiles )
+from ladybug_geojson.ladybug_feature import LadybugFeature
+
+def _feature(geometry, name):
+    return json.dumps({'type': 'Feature', 
+        'geometry': geometry, 
+        'properties': {'name': name}})
+
+def test_quadkey():
+    assert quadkey_from_tile(3, 5, 3) == '213'
+    assert tile_from_quadkey('213') == (3, 5, 3)
+
+    x, y = tile_from_lat_lon(41.894599, 12.483092, 15)
+    qk = quadkey_from_tile(x, y, 15)
+    assert len(qk) == 15
+    assert tile_from_quadkey(qk) == (x, y, 15)
+    # the parent quadkey is a prefix
+    assert qk.startswith(quadkey_from_tile(x // 2, y // 2, 14))
+
+    with pytest.raises(Exception):
+        tile_from_quadkey('215')
+
+def test_morton():
+    assert morton_from_tile(3, 5) == 39
+    assert tile_from_morton(39) == (3, 5)
+
+    # children of a tile have contiguous codes
+    codes = sorted(morton_from_tile(x, y) 
+        for x, y in iter_recurrent_tiles(17515, 12173, 15, 17))
+    assert codes == list(range(codes[0], codes[0] + 16))
+
+def test_tile_index():
+    small = _feature({'type': 'Point', 
+        'coordinates': [12.483092, 41.894599]}, 'rome')
+    line = _feature({'type': 'LineString', 
+        'coordinates': [[12.48, 41.89], [12.49, 41.90]]}, 'street')
+    far = _feature({'type': 'Point', 
+        'coordinates': [11.1214686, 46.0677385]}, 'trento')
+
+    assert feature_bbox(line) == (12.48, 41.89, 12.49, 41.90)
+
+    index = TileIndex(16)
+    index.extend([small, line, LadybugFeature(far)])
+    assert len(index) == 3
+
+    x, y = tile_from_lat_lon(41.894599, 12.483092, 16)
+    names = lambda fts: sorted(json.loads(_)['properties']['name'] 
+        if isinstance(_, str) else _.properties['name'] for _ in fts)
+
+    # the line is stored in a parent tile
+    assert names(index.get_tile(x, y, 16)) == ['rome', 'street']
+    assert names(index.get_tile(x, y, 16, parents=False)) == ['rome']
+    # children of a parent tile
+    assert names(index.get_tile(x // 256, y // 256, 8)) == ['rome', 'street']
+    assert names(index.get_tile(1, 0, 1)) == ['rome', 'street', 'trento']
+    assert index.get_tile(0, 0, 1) == []
+    # tile deeper than the index
+    x, y = tile_from_lat_lon(46.0677385, 11.1214686, 20)
+    assert names(index.get_tile(x, y, 20)) == ['trento']
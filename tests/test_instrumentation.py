@@ -0,0 +1,91 @@
+# coding=utf-8
+import json
+import threading
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.convert.to_geometry import to_face3d
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.instrumentation import ( Recorder,
+    enabled, record )
+
+POLYGON = json.dumps({ 'type': 'Polygon',
+    'coordinates': [[[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]]] })
+
+COLLECTION = json.dumps({ 'type': 'FeatureCollection',
+    'features': [{ 'type': 'Feature', 'properties': { 'id': 1 },
+        'geometry': json.loads(POLYGON) },
+        { 'type': 'Feature', 'properties': { 'id': 2 },
+        'geometry': { 'type': 'Point', 'coordinates': [1, 2] } }] })
+
+
+def test_disabled():
+    assert not enabled()
+    to_face3d(POLYGON)
+    rec = Recorder()
+    assert rec.to_dict() == { 'stages': {}, 'counters': {} }
+
+
+def test_record_features():
+    with record() as rec:
+        assert enabled()
+        fts = LadybugFeature.from_featurecollection(COLLECTION,
+            Options(validation=True))
+    assert not enabled()
+    assert len(fts) == 2
+
+    data = rec.to_dict()
+    stages, counters = data['stages'], data['counters']
+    assert counters['features'] == 2
+    assert counters['vertices'] == 6
+    assert counters['geometry.Polygon'] == 1
+    assert counters['geometry.Point'] == 1
+    assert counters['validation.schema'] == 1
+    assert stages['LadybugFeature.from_featurecollection']['calls'] == 1
+    assert stages['LadybugFeature']['calls'] == 2
+    assert stages['to_face3d']['calls'] == 1
+    assert stages['Face3D']['calls'] == 1
+    assert stages['validator.jsonschema']['calls'] == 1
+    assert stages['LadybugFeature']['seconds'] <= \
+        stages['LadybugFeature.from_featurecollection']['seconds']
+
+
+def test_nested_record():
+    outer = Recorder()
+    with record(outer):
+        with record() as inner:
+            to_face3d(POLYGON)
+        to_face3d(POLYGON)
+    assert inner.calls['to_face3d'] == 1
+    assert outer.calls['to_face3d'] == 1
+
+
+def test_record_threads():
+    recorders = [Recorder() for _ in range(4)]
+    barrier = threading.Barrier(len(recorders))
+
+    def _run(rec, count):
+        with record(rec):
+            # all threads are recording at the same time
+            barrier.wait()
+            for _ in range(count):
+                to_face3d(POLYGON)
+            barrier.wait()
+
+    threads = [threading.Thread(target=_run, args=(rec, i + 1))
+        for i, rec in enumerate(recorders)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not enabled()
+    assert [_.calls['to_face3d'] for _ in recorders] == [1, 2, 3, 4]
+
+
+def test_prometheus():
+    with record() as rec:
+        to_face3d(POLYGON)
+    text = rec.to_prometheus()
+    assert '# TYPE ladybug_geojson_stage_seconds_total counter' in text
+    assert 'ladybug_geojson_stage_calls_total{stage="to_face3d"} 1' in text
+    assert 'ladybug_geojson_count_total{name="vertices"} 5' in text
+    rec.reset()
+    assert rec.counters == {}
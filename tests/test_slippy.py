@@ -1,7 +1,15 @@
 # coding=utf-8
 import pytest
+import json
 from ladybug_geojson.slippy.map import ( tile_from_lat_lon,
-    get_recurrent_tiles )
+    get_recurrent_tiles,
+    get_recurrent_tile_range,
+    iter_recurrent_tiles,
+    tiles_from_lat_lon,
+    lat_lon_from_tile,
+    tile_bounds,
+    tiles_bounds,
+    tiles_for_geometry )
 
 
 def test_tile_from_lat_lon():
@@ -15,3 +23,147 @@ def test_get_recurrent_tiles():
     tiles = get_recurrent_tiles(17515, 12173, 15, 16)
     assert (35031, 24346) in tiles
     assert len(tiles) == 4
+
+def test_iter_recurrent_tiles():
+    # Z-order of the recursive implementation: each tile is followed by
+    # its right, bottom and bottom right neighbours
+    expected = [
+        (70060, 48692), (70061, 48692), (70060, 48693), (70061, 48693),
+        (70062, 48692), (70063, 48692), (70062, 48693), (70063, 48693),
+        (70060, 48694), (70061, 48694), (70060, 48695), (70061, 48695),
+        (70062, 48694), (70063, 48694), (70062, 48695), (70063, 48695)]
+    assert list(iter_recurrent_tiles(17515, 12173, 15, 17)) == expected
+    assert get_recurrent_tiles(17515, 12173, 15, 17) == expected
+
+    tiles = iter_recurrent_tiles(17515, 12173, 15, 18)
+    assert not isinstance(tiles, list)
+    tiles = list(tiles)
+    assert tiles[28:36] == [
+        (140126, 97386), (140127, 97386), (140126, 97387), (140127, 97387),
+        (140120, 97388), (140121, 97388), (140120, 97389), (140121, 97389)]
+    assert len(tiles) == 64
+    assert len(set(tiles)) == 64
+
+    # slices for workers
+    first = list(iter_recurrent_tiles(17515, 12173, 15, 18, stop=30))
+    second = list(iter_recurrent_tiles(17515, 12173, 15, 18, start=30))
+    assert first + second == tiles
+
+    x_range, y_range = get_recurrent_tile_range(17515, 12173, 15, 18)
+    assert len(x_range) == len(y_range) == 8
+    assert all(x in x_range and y in y_range for x, y in tiles)
+
+    with pytest.raises(Exception):
+        iter_recurrent_tiles(17515, 12173, 16, 15)
+
+def test_tiles_from_lat_lon():
+    lats = [41.894599, 46.0677385, -33.8688]
+    lons = [12.483092, 11.1214686, 151.2093]
+    xs, ys = tiles_from_lat_lon(lats, lons, 15)
+    assert list(zip(xs, ys)) == [tile_from_lat_lon(lat, lon, 15) 
+        for lat, lon in zip(lats, lons)]
+
+    assert tiles_from_lat_lon([], [], 15) == ([], [])
+    with pytest.raises(Exception):
+        tiles_from_lat_lon([91, 0], [0, 0], 15)
+
+def test_tiles_from_lat_lon_numpy():
+    np = pytest.importorskip('numpy')
+    lats = np.array([41.894599, 46.0677385, -33.8688])
+    lons = np.array([12.483092, 11.1214686, 151.2093])
+    xs, ys = tiles_from_lat_lon(lats, lons, 15)
+    assert isinstance(xs, np.ndarray)
+    assert list(zip(xs.tolist(), ys.tolist())) == [tile_from_lat_lon(lat, lon, 15) 
+        for lat, lon in zip(lats, lons)]
+
+    south, west, north, east = tiles_bounds(xs, ys, 15)
+    assert np.all(south <= lats) and np.all(lats <= north)
+    assert np.all(west <= lons) and np.all(lons <= east)
+
+    xs, ys = tiles_from_lat_lon(np.empty(0), np.empty(0), 15)
+    assert isinstance(xs, np.ndarray) and xs.size == 0 and ys.size == 0
+    bounds = tiles_bounds(xs, ys, 15)
+    assert all(isinstance(_, np.ndarray) and _.size == 0 for _ in bounds)
+    with pytest.raises(Exception):
+        tiles_from_lat_lon(np.array([91.0]), np.array([0.0]), 15)
+    with pytest.raises(Exception):
+        tiles_bounds(np.array([2 ** 15]), np.array([0]), 15)
+
+def test_tile_bounds():
+    lat, lon = 41.894599, 12.483092
+    x, y = tile_from_lat_lon(lat, lon, 15)
+    south, west, north, east = tile_bounds(x, y, 15)
+    assert south <= lat <= north
+    assert west <= lon <= east
+    assert lat_lon_from_tile(x, y, 15) == (north, west)
+
+    bounds = tiles_bounds([x, x + 1], [y, y], 15)
+    assert [_[0] for _ in bounds] == list(tile_bounds(x, y, 15))
+    assert bounds[1][1] == east
+
+    with pytest.raises(Exception):
+        tile_bounds(2 ** 15, 0, 15)
+
+def test_tiles_for_geometry():
+    # polygon with a hole
+    polygon = json.dumps({
+        'type': 'Polygon',
+        'coordinates': [
+            [[10, 40], [14, 40], [14, 44], [10, 44], [10, 40]],
+            [[11, 41], [13, 41], [13, 43], [11, 43], [11, 41]]
+        ]
+    })
+    tiles = tiles_for_geometry(polygon, 10)
+    x0, y1 = tile_from_lat_lon(40, 10, 10)
+    x1, y0 = tile_from_lat_lon(44, 14, 10)
+    bbox_count = (x1 - x0 + 1) * (y1 - y0 + 1)
+    assert tile_from_lat_lon(40.5, 10.5, 10) in tiles
+    assert tile_from_lat_lon(42, 12, 10) not in tiles
+    assert len(tiles) < bbox_count
+    assert all(x0 <= x <= x1 and y0 <= y <= y1 for x, y in tiles)
+
+    # compact tiles cover the same tiles
+    compact = tiles_for_geometry(polygon, 10, compact=True)
+    assert len(compact) < len(tiles)
+    expanded = set()
+    for x, y, z in compact:
+        expanded.update(iter_recurrent_tiles(x, y, z, 10) if z < 10 
+            else [(x, y)])
+    assert expanded == tiles
+
+    # compact tiles of the world have zoom 1 or more
+    world = json.dumps({ 'type': 'Polygon', 'coordinates': [[[-180, -90],
+        [180, -90], [180, 90], [-180, 90], [-180, -90]]] })
+    for zoom in (1, 3):
+        compact = tiles_for_geometry(world, zoom, compact=True)
+        assert min(z for _, _, z in compact) >= 1
+        expanded = set()
+        for x, y, z in compact:
+            expanded.update(iter_recurrent_tiles(x, y, z, zoom))
+        assert expanded == tiles_for_geometry(world, zoom)
+        assert len(expanded) == 4 ** zoom
+
+def test_tiles_for_line_and_points():
+    line = json.dumps({
+        'type': 'Feature',
+        'properties': {},
+        'geometry': {
+            'type': 'LineString',
+            'coordinates': [[10, 40], [14, 44]]
+        }
+    })
+    tiles = tiles_for_geometry(line, 8)
+    assert tile_from_lat_lon(40, 10, 8) in tiles
+    assert tile_from_lat_lon(44, 14, 8) in tiles
+    assert tile_from_lat_lon(44, 10, 8) not in tiles
+
+    points = json.dumps({
+        'type': 'MultiPoint',
+        'coordinates': [[12.483092, 41.894599], [11.1214686, 46.0677385]]
+    })
+    tiles = tiles_for_geometry(points, 15)
+    assert tiles == {tile_from_lat_lon(41.894599, 12.483092, 15),
+        tile_from_lat_lon(46.0677385, 11.1214686, 15)}
+
+    with pytest.raises(Exception):
+        tiles_for_geometry('{"coordinates": []}', 15)
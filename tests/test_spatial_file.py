@@ -0,0 +1,92 @@
+# coding=utf-8
+import json
+import random
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.convert.spatial_file import ( SpatialFile,
+    SpatialFileWriter, write_spatial_file, _hilbert, _level_bounds )
+
+
+def _features(count, seed=0):
+    rnd = random.Random(seed)
+    options = Options(validation=False)
+    features = []
+    for i in range(count):
+        x, y = rnd.uniform(0, 100), rnd.uniform(0, 100)
+        geo = { 'type': 'Polygon', 'coordinates': [[[x, y], [x + 1, y],
+            [x + 1, y + 1], [x, y + 1], [x, y]]] }
+        features.append(LadybugFeature(json.dumps({ 'type': 'Feature',
+            'properties': { 'n': i }, 'geometry': geo }), options))
+    return features
+
+
+def _intersects(feature, bbox):
+    geo = feature.geometry
+    return geo.min.x <= bbox[2] and geo.max.x >= bbox[0] and \
+        geo.min.y <= bbox[3] and geo.max.y >= bbox[1]
+
+
+def test_hilbert():
+    assert _hilbert(0, 0) == 0
+    values = set(_hilbert(x, y) for x in range(16) for y in range(16))
+    assert len(values) == 256
+    # the curve ends at the bottom right corner
+    assert _hilbert(0xFFFF, 0) == 0xFFFFFFFF
+    assert _level_bounds(100, 16) == [(8, 108), (1, 8), (0, 1)]
+
+
+@pytest.mark.parametrize('node_size', [2, 16])
+def test_spatial_file(tmp_path, node_size):
+    features = _features(500)
+    null = LadybugFeature.from_geometry(None, { 'n': 'null' })
+    fp = write_spatial_file(features + [null], tmp_path / 'layer.lbsf',
+        node_size)
+
+    with SpatialFile(fp) as sf:
+        assert len(sf) == 501
+        assert sf.extent[0] >= 0 and sf.extent[2] <= 101
+        res = list(sf)
+        assert len(res) == 501
+        # features are sorted along the Hilbert curve
+        assert [_.properties['n'] for _ in res[:-1]] != list(range(500))
+        by_n = { _.properties['n']: _ for _ in res }
+        assert by_n['null'].geometry is None
+        assert by_n[10].geometry == features[10].geometry
+
+        for bbox in [(10, 10, 20, 30), (50, 50, 50.5, 50.5),
+            (-10, -10, -5, -5), (-1000, -1000, 1000, 1000)]:
+            expected = sorted(_.properties['n'] for _ in features
+                if _intersects(_, bbox))
+            found = list(sf.query(bbox))
+            assert sorted(_.properties['n'] for _ in found) == expected
+            assert len(sf.search(bbox)) == len(expected)
+
+
+def test_spatial_file_writer(tmp_path):
+    fp = tmp_path / 'layer.lbsf'
+    with SpatialFileWriter(fp) as writer:
+        for ft in _features(3):
+            writer.write_feature(ft)
+        writer.write([ft.geometry, ft.geometry], { 'list': True })
+        assert writer.count == 4
+    assert writer.closed
+    with pytest.raises(ValueError):
+        writer.write(None)
+    # the temporary file is removed
+    assert [_.name for _ in tmp_path.iterdir()] == ['layer.lbsf']
+
+    with SpatialFile(fp) as sf:
+        assert len(sf) == 4
+        assert any(isinstance(_.geometry, list) for _ in sf)
+
+    # header, root node and a feature with its WKB and JSON sizes
+    with SpatialFileWriter(fp) as writer:
+        writer.write(None, {})
+    assert fp.stat().st_size == 56 + 40 + 8 + len(b'{}')
+
+    with SpatialFileWriter(fp):
+        pass
+    with SpatialFile(fp) as sf:
+        assert len(sf) == 0
+        assert sf.search((0, 0, 1, 1)) == []
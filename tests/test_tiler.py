@@ -0,0 +1,123 @@
+# coding=utf-8
+import pytest
+import json
+import zipfile
+from pathlib import Path
+
+from ladybug_geojson.slippy import tiler
+from ladybug_geojson.slippy.tiler import create_vector_tiles
+from ladybug_geojson.slippy.cache import TileCache
+from ladybug_geojson.slippy.map import tile_from_lat_lon
+
+def _molise():
+    fp = Path(__file__).parent.joinpath('./files/molise.json')
+    return fp.read_text()
+
+def test_create_vector_tiles(tmp_path):
+    extent, buffer = 4096, 64
+    tiles = create_vector_tiles(_molise(), tmp_path, 
+        min_zoom=6, max_zoom=9, 
+        extent=extent, buffer=buffer)
+
+    assert tiles
+    assert set(z for z, _, _ in tiles) == {6, 7, 8, 9}
+
+    x, y = tile_from_lat_lon(41.56, 14.66, 9)
+    assert (9, x, y) in tiles
+
+    tile = json.loads(tmp_path.joinpath(f'9/{x}/{y}.json').read_text())
+    assert tile.get('extent') == extent
+    assert tile.get('features')
+    for ft in tile.get('features'):
+        assert ft.get('properties').get('name')
+        assert ft.get('geometry').get('type') in ['Polygon', 'MultiPolygon']
+        coords = json.dumps(ft.get('geometry').get('coordinates'))
+        values = json.loads(coords.replace('[', '').replace(']', '')
+            .join('[]'))
+        assert all(isinstance(_, int) for _ in values)
+        assert all(-buffer - 1 <= _ <= extent + buffer + 1 for _ in values)
+
+def test_create_vector_tiles_archive(tmp_path):
+    geojson = json.dumps({
+        'type': 'FeatureCollection',
+        'features': [
+            { 'type': 'Feature', 'properties': {'name': 'point'},
+            'geometry': {'type': 'Point', 'coordinates': [11.12, 46.06]} },
+            { 'type': 'Feature', 'properties': {'name': 'line'},
+            'geometry': {'type': 'LineString', 
+                'coordinates': [[11.0, 46.0], [12.0, 47.0]]} },
+            { 'type': 'Feature', 'properties': {'name': 'far'},
+            'geometry': {'type': 'Point', 'coordinates': [-70.0, -30.0]} }
+        ]
+    })
+    fp = tmp_path.joinpath('tiles.zip')
+    tiles = create_vector_tiles(geojson, fp, 
+        min_zoom=2, max_zoom=6, archive=True, workers=2)
+    
+    serial = create_vector_tiles(geojson, tmp_path.joinpath('folder'), 
+        min_zoom=2, max_zoom=6)
+    assert tiles == serial
+
+    with zipfile.ZipFile(fp) as zf:
+        assert sorted(zf.namelist()) == sorted(f'{z}/{x}/{y}.json' 
+            for z, x, y in tiles)
+        x, y = tile_from_lat_lon(46.06, 11.12, 6)
+        tile = json.loads(zf.read(f'6/{x}/{y}.json'))
+        names = [_.get('properties').get('name') for _ in tile.get('features')]
+        assert sorted(names) == ['line', 'point']
+
+    with pytest.raises(Exception):
+        create_vector_tiles(geojson, fp, min_zoom=6, max_zoom=2)
+
+def test_create_vector_tiles_buffer(tmp_path):
+    # a point east of the east edge of tile 0, inside its buffer
+    geojson = json.dumps({ 'type': 'FeatureCollection', 'features': [
+        { 'type': 'Feature', 'properties': {'name': 'point'},
+        'geometry': {'type': 'Point', 'coordinates': [0.5, 45.0]} }] })
+    extent, buffer = 4096, 64
+    tiles = create_vector_tiles(geojson, tmp_path, min_zoom=1, max_zoom=2,
+        extent=extent, buffer=buffer)
+    assert (1, 0, 0) in tiles and (1, 1, 0) in tiles
+    assert (2, 1, 1) in tiles and (2, 2, 1) in tiles
+
+    tile = json.loads(tmp_path.joinpath('1/0/0.json').read_text())
+    x, y = tile['features'][0]['geometry']['coordinates']
+    assert extent < x <= extent + buffer
+
+def test_create_vector_tiles_cache(tmp_path, monkeypatch):
+    def _collection(lon):
+        return json.dumps({ 'type': 'FeatureCollection', 'features': [
+            { 'type': 'Feature', 'properties': {'name': 'a'},
+            'geometry': {'type': 'Point', 'coordinates': [11.12, 46.06]} },
+            { 'type': 'Feature', 'properties': {'name': 'b'},
+            'geometry': {'type': 'Point', 'coordinates': [lon, -30.0]} }]})
+
+    built = []
+    build = tiler._build_subtree
+    def _build(job):
+        built.append(job[1:3])
+        return build(job)
+    monkeypatch.setattr(tiler, '_build_subtree', _build)
+
+    cache = TileCache()
+    first = create_vector_tiles(_collection(-70.0), tmp_path / 'a',
+        min_zoom=2, max_zoom=4, cache=cache)
+    assert len(built) == 2 and len(cache) == 2
+
+    built.clear()
+    again = create_vector_tiles(_collection(-70.0), tmp_path / 'b',
+        min_zoom=2, max_zoom=4, cache=cache)
+    assert again == first and built == []
+    assert sorted(_.name for _ in tmp_path.joinpath('b').rglob('*.json')) \
+        == sorted(_.name for _ in tmp_path.joinpath('a').rglob('*.json'))
+
+    # only the subtree of the moved point is built again
+    create_vector_tiles(_collection(-70.5), tmp_path / 'c',
+        min_zoom=2, max_zoom=4, cache=cache)
+    assert len(built) == 1 and len(cache) == 3
+
+    # other parameters do not use the cached tiles
+    built.clear()
+    create_vector_tiles(_collection(-70.0), tmp_path / 'd',
+        min_zoom=2, max_zoom=4, extent=512, cache=cache)
+    assert built and len(cache) == 3 + len(built)
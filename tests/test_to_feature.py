@@ -69,6 +69,15 @@ def test_geojson_to_feature():
     
     print(feature.geometry)
     assert feature.geometry is None
+    assert feature.properties is None
+
+@pytest.mark.parametrize('validation', [True, False])
+def test_geojson_to_feature_null_geometry(validation):
+    feature = LadybugFeature('''{ "type": "Feature", "id": 7,
+        "geometry": null, "properties": { "a": 1 } }''',
+        Options(validation=validation))
+    assert feature.geometry is None
+    assert feature.properties == { 'a': 1 }
 
 def test_geojson_to_featurecollection():
     valid_feature = '''
@@ -182,4 +191,14 @@ def test_geojson_to_featurecollection():
     }'''
 
     feature = LadybugFeature.from_featurecollection(invalid_feature)
-    assert type(feature) == str 
\ No newline at end of file
+    assert type(feature) == str 
+
+def test_feature_to_dict():
+    ft = LadybugFeature('''{ "type": "Feature",
+        "properties": { "name": "a" },
+        "geometry": { "type": "MultiPoint", "coordinates": [[1, 2], [3, 4]] } }''',
+        Options(validation=False))
+    data = ft.to_dict()
+    assert data['type'] == 'LadybugFeature'
+    assert data['properties'] == { 'name': 'a' }
+    assert [Point3D.from_dict(_) for _ in data['geometry']] == ft.geometry
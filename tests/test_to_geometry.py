@@ -642,4 +642,95 @@ def test_geojson_to_collection():
         Face3D(boundary=first_boundary),
         Face3D(boundary=second_boundary, 
         holes=holes)
-    ]
\ No newline at end of file
+    ]
+
+def test_geojson_to_collection_merge_faces():
+    coll = ''' {
+    "type": "GeometryCollection",
+    "geometries": [{
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]
+    }]
+    }'''
+    options = Options(fill_polygon=True, merge_faces=True)
+    face = Face3D(boundary=[
+        Point3D(0, 0, 0),
+        Point3D(1, 0, 0),
+        Point3D(1, 1, 0)
+    ])
+    # a single Polygon is never merged into a Polyface3D
+    assert to_collection_2d(coll, options) == [face]
+    assert to_collection_3d(coll, options) == [face]
+
+def test_geojson_simplify():
+    line = '''{
+        "type": "LineString", 
+        "coordinates": [
+            [0, 0], [1, 0.01], [2, -0.01], [3, 0.01], [4, 0], [4, 4]
+        ]
+    }'''
+
+    options = Options(simplify=0.1)
+    pl_3d = to_polyline3d(line, options)
+    assert pl_3d == Polyline3D(vertices=[
+        Point3D(0, 0, 0),
+        Point3D(4, 0, 0),
+        Point3D(4, 4, 0)
+    ])
+
+    # the vertices on the shared edge are kept by both faces
+    shared = '''{
+        "type": "MultiPolygon", 
+        "coordinates": [
+            [
+                [[0, 0], [1, 0.01], [2, 0], [2, 2], [1, 2.01], [0, 2], [0, 0]]
+            ], 
+            [
+                [[2, 0], [4, 0], [4, 2], [2, 2], [2, 1], [2, 0]]
+            ]
+        ]
+    }'''
+    faces = to_face3d(shared, options)
+    assert len(faces) == 2
+    assert faces[0].vertices == (
+        Point3D(0, 0, 0),
+        Point3D(2, 0, 0),
+        Point3D(2, 2, 0),
+        Point3D(0, 2, 0)
+    )
+    assert len(faces[1].vertices) == 4
+    assert Point3D(2, 1, 0) not in faces[1].vertices
+
+def test_geojson_collection_dispatch():
+    from ladybug_geojson.instrumentation import record
+
+    members = [
+        { 'type': 'Point', 'coordinates': [1, 2] },
+        { 'type': 'MultiPoint', 'coordinates': [[1, 2], [3, 4]] },
+        { 'type': 'LineString', 'coordinates': [[0, 0], [1, 1], [2, 0]] },
+        { 'type': 'Polygon', 'coordinates': [[[0, 0], [2, 0], [2, 2], [0, 0]]] },
+        { 'type': 'MultiPolygon', 'coordinates': [
+            [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+            [[[1, 0], [2, 0], [1, 1], [1, 0]]]
+        ] },
+        { 'type': 'GeometryCollection', 'geometries': [] }
+    ]
+    collection = json.dumps({ 'type': 'GeometryCollection',
+        'geometries': members })
+
+    with record() as rec:
+        coll = to_collection_2d(collection, Options(validation=False))
+    assert [type(_) for _ in coll] == [Point2D, Point2D, Point2D,
+        Polyline2D, Polygon2D, Polygon2D, Polygon2D]
+    assert rec.counters['geometry.Point'] == 1
+    assert rec.counters['geometry.MultiPoint'] == 1
+    assert rec.counters['geometry.MultiPolygon'] == 1
+    assert 'geometry.GeometryCollection' not in rec.counters
+
+    # the same geometries of the single converters
+    options = Options(validation=False, merge_faces=True)
+    coll = to_collection_3d(collection, options)
+    assert coll[3] == to_polyline3d(json.dumps(members[2]), options)
+    assert coll[4] == to_face3d(json.dumps(members[3]), options)
+    assert coll[5:] == [to_face3d(json.dumps(members[4]), options)]
+    assert type(coll[5]) == Polyface3D
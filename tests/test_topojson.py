@@ -0,0 +1,192 @@
+# coding=utf-8
+import json
+import pytest
+from ladybug_geojson.convert.config import Options
+from ladybug_geojson.ladybug_feature import LadybugFeature
+from ladybug_geojson.convert.topojson import from_topojson, read_topojson
+
+# two squares with a shared edge, a road and a point
+ARCS = [
+    [[1, 0], [1, 1]],
+    [[1, 1], [0, 1], [0, 0], [1, 0]],
+    [[1, 0], [2, 0], [2, 1], [1, 1]],
+    [[0, 2], [1, 2], [2, 3]]
+]
+GEOMETRIES = [
+    { 'type': 'Polygon', 'arcs': [[1, 0]], 'properties': { 'n': 'a' } },
+    { 'type': 'Polygon', 'arcs': [[2, ~0]], 'properties': { 'n': 'b' } },
+    { 'type': 'MultiPolygon', 'arcs': [[[1, 0]], [[2, ~0]]] },
+    { 'type': 'LineString', 'arcs': [3], 'properties': { 'n': 'road' } },
+    { 'type': 'MultiLineString', 'arcs': [[3], [0]] },
+    { 'type': 'Point', 'coordinates': [2, 2] },
+    { 'type': 'MultiPoint', 'coordinates': [[2, 2], [0, 4]] },
+    { 'type': None, 'properties': { 'n': 'empty' } }
+]
+GEOJSON = [
+    { 'type': 'Polygon', 'coordinates': [
+        [[1, 1], [0, 1], [0, 0], [1, 0], [1, 1]]] },
+    { 'type': 'Polygon', 'coordinates': [
+        [[1, 0], [2, 0], [2, 1], [1, 1], [1, 0]]] },
+    { 'type': 'MultiPolygon', 'coordinates': [
+        [[[1, 1], [0, 1], [0, 0], [1, 0], [1, 1]]],
+        [[[1, 0], [2, 0], [2, 1], [1, 1], [1, 0]]]] },
+    { 'type': 'LineString', 'coordinates': [[0, 2], [1, 2], [2, 3]] },
+    { 'type': 'MultiLineString', 'coordinates': [
+        [[0, 2], [1, 2], [2, 3]], [[1, 0], [1, 1]]] },
+    { 'type': 'Point', 'coordinates': [2, 2] },
+    { 'type': 'MultiPoint', 'coordinates': [[2, 2], [0, 4]] },
+    None
+]
+
+
+def _topology(quantized=False):
+    topology = { 'type': 'Topology', 'arcs': ARCS,
+        'objects': { 'layer': { 'type': 'GeometryCollection',
+            'geometries': GEOMETRIES } } }
+    if not quantized:
+        return topology
+
+    # positions are (q * 0.5 + 10, q * 0.25 - 5)
+    def _q(pos):
+        return [round((pos[0] - 10) / 0.5), round((pos[1] + 5) / 0.25)]
+
+    arcs = []
+    for arc in ARCS:
+        arc = [_q([x + 10, y - 5]) for x, y in arc]
+        arcs.append([arc[0]] + [[b[0] - a[0], b[1] - a[1]]
+            for a, b in zip(arc, arc[1:])])
+    geometries = json.loads(json.dumps(GEOMETRIES))
+    for geo in geometries:
+        if geo['type'] == 'Point':
+            geo['coordinates'] = _q([2 + 10, 2 - 5])
+        elif geo['type'] == 'MultiPoint':
+            geo['coordinates'] = [_q([x + 10, y - 5])
+                for x, y in geo['coordinates']]
+    topology.update({ 'arcs': arcs,
+        'transform': { 'scale': [0.5, 0.25], 'translate': [10, -5] } })
+    topology['objects']['layer']['geometries'] = geometries
+    return topology
+
+
+def _moved(geo, dx, dy):
+    if geo is None:
+        return None
+    if isinstance(geo['coordinates'][0], (int, float)):
+        x, y = geo['coordinates']
+        return dict(geo, coordinates=[x + dx, y + dy])
+
+    def _move(arr):
+        if isinstance(arr[0], (int, float)):
+            return [arr[0] + dx, arr[1] + dy]
+        return [_move(_) for _ in arr]
+    return dict(geo, coordinates=_move(geo['coordinates']))
+
+
+@pytest.mark.parametrize('quantized', [False, True])
+@pytest.mark.parametrize('merge_faces', [False, True])
+def test_from_topojson(quantized, merge_faces):
+    options = Options(validation=False, merge_faces=merge_faces)
+    features = from_topojson(json.dumps(_topology(quantized)), options)
+    assert len(features) == len(GEOMETRIES)
+
+    dx, dy = (10, -5) if quantized else (0, 0)
+    for ft, geo, topo in zip(features, GEOJSON, GEOMETRIES):
+        expected = LadybugFeature(json.dumps({ 'type': 'Feature',
+            'properties': {}, 'geometry': _moved(geo, dx, dy) }), options)
+        if isinstance(expected.geometry, list):
+            assert list(ft.geometry) == list(expected.geometry)
+        else:
+            assert ft.geometry == expected.geometry
+        assert ft.properties == topo.get('properties', {})
+
+
+def test_topojson_objects(tmp_path):
+    topology = _topology()
+    topology['objects']['point'] = { 'type': 'Point',
+        'coordinates': [5, 5], 'properties': { 'n': 'p' } }
+    fp = tmp_path / 'layer.topojson'
+    fp.write_text(json.dumps(topology))
+
+    assert len(read_topojson(fp)) == len(GEOMETRIES) + 1
+    features = read_topojson(fp, name='point')
+    assert len(features) == 1
+    assert features[0].properties == { 'n': 'p' }
+    with pytest.raises(ValueError):
+        read_topojson(fp, name='missing')
+    with pytest.raises(ValueError):
+        from_topojson({ 'type': 'FeatureCollection', 'features': [] })
+
+
+def test_to_topojson(tmp_path):
+    from ladybug_geojson.convert.topojson import ( to_topojson,
+        write_topojson )
+    from ladybug_geometry.geometry2d.pointvector import Point2D
+    from ladybug_geometry.geometry2d.polygon import Polygon2D
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.face import Face3D
+
+    # 3 x 3 grid of adjacent squares
+    faces = [Face3D([Point3D(x, y), Point3D(x + 1, y),
+        Point3D(x + 1, y + 1), Point3D(x, y + 1)])
+        for x in range(3) for y in range(3)]
+    properties = [{ 'n': i } for i in range(len(faces))]
+    topology = to_topojson(faces, properties, quantization=3001)
+    geometries = topology['objects']['features']['geometries']
+    assert [_['properties'] for _ in geometries] == properties
+    assert topology['transform']['scale'] == [0.001, 0.001]
+    # the 24 edges of the grid are written once
+    edges = sum(len(_) - 1 for _ in topology['arcs'])
+    assert edges == 24
+
+    features = from_topojson(topology)
+    for face, ft in zip(faces, features):
+        assert ft.properties == { 'n': faces.index(face) }
+        assert len(ft.geometry.boundary) == 4
+        assert ft.geometry.center.distance_to_point(face.center) < 1e-9
+        assert abs(ft.geometry.area - face.area) < 1e-9
+
+    polygons = [Polygon2D([Point2D(0, 0), Point2D(1, 0), Point2D(1, 1)]),
+        Polygon2D([Point2D(1, 1), Point2D(1, 0), Point2D(2, 0)]), None]
+    report = write_topojson(polygons, tmp_path / 'polygons.topojson')
+    assert report['arcs'] == 3 and report['shared_arcs'] == 1
+    features = read_topojson(tmp_path / 'polygons.topojson')
+    assert features[2].geometry is None
+    assert abs(features[1].geometry.area - 0.5) < 1e-5
+
+    report = write_topojson(faces, tmp_path / 'faces.topojson')
+    assert report['shared_arcs'] > 0
+    assert report['topojson_bytes'] < report['geojson_bytes']
+    assert 0 < report['reduction'] < 1
+
+    with pytest.raises(ValueError):
+        to_topojson(faces, quantization=1)
+
+
+def test_to_topojson_degenerate():
+    from ladybug_geojson.convert.topojson import to_topojson
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.face import Face3D
+    from ladybug_geometry.geometry3d.polyline import Polyline3D
+
+    def _square(x, size):
+        return Face3D([Point3D(x, 0), Point3D(x + size, 0),
+            Point3D(x + size, size), Point3D(x, size)])
+
+    tiny, large = _square(0, 1e-6), _square(1, 1000)
+    line = Polyline3D([Point3D(0, 0), Point3D(1e-7, 0), Point3D(0, 1e-7)])
+    topology = to_topojson([tiny, large, [tiny, large], line],
+        [{ 'n': i } for i in range(4)], quantization=1000)
+    geometries = topology['objects']['features']['geometries']
+    assert geometries[0] == { 'type': None, 'properties': { 'n': 0 } }
+    assert geometries[1]['type'] == 'Polygon'
+    # the tiny square is dropped from the MultiPolygon
+    assert len(geometries[2]['arcs']) == 1
+    assert geometries[3] == { 'type': None, 'properties': { 'n': 3 } }
+    assert all(len(_) > 1 for _ in topology['arcs'])
+
+    features = from_topojson(json.dumps(topology))
+    assert [_.properties for _ in features] == \
+        [{ 'n': i } for i in range(4)]
+    assert features[0].geometry is None
+    assert abs(features[1].geometry.area - large.area) < 0.01 * large.area
+    assert features[3].geometry is None
@@ -0,0 +1,54 @@
+# coding=utf-8
+import pytest
+import io
+import json
+
+from ladybug_geojson.convert.writer import FeatureCollectionWriter
+from ladybug_geojson.convert.geojson import from_file, from_geojson
+
+try:
+    from ladybug_geometry.geometry3d.pointvector import Point3D
+    from ladybug_geometry.geometry3d.face import Face3D
+except ImportError as e:
+    raise ImportError(
+        f'Failed to import ladybug_geometry.\n{e}')
+
+def test_feature_collection_writer():
+    stream = io.StringIO()
+    face = Face3D([Point3D(0, 0), Point3D(1, 0), Point3D(1, 1)])
+
+    with FeatureCollectionWriter(stream, precision=3) as writer:
+        writer.write(Point3D(1, 2, 3), {'name': 'point'})
+        writer.write(face, {'name': 'face'}, id=1)
+        assert writer.count == 2
+    
+    assert writer.closed
+    obj = json.loads(stream.getvalue())
+    assert obj.get('type') == 'FeatureCollection'
+    assert len(obj.get('features')) == 2
+    assert obj.get('features')[1].get('id') == 1
+
+    features = from_geojson(stream.getvalue())
+    assert features[0].geometry == Point3D(1, 2, 3)
+    assert features[1].geometry == face
+    assert features[1].properties == {'name': 'face'}
+
+def test_feature_collection_writer_file(tmp_path):
+    fp = tmp_path.joinpath('out.geojson')
+
+    with FeatureCollectionWriter(fp) as writer:
+        pass
+    assert json.loads(fp.read_text()).get('features') == []
+
+    face = Face3D([Point3D(0, 0), Point3D(1, 0), Point3D(1, 1)])
+    features = from_geojson(json.dumps({'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'properties': {'a': 1},
+        'geometry': json.loads(
+            '{"type": "Polygon", "coordinates": [[[0,0],[1,0],[1,1],[0,0]]]}')}]}))
+    with FeatureCollectionWriter(fp) as writer:
+        for ft in features:
+            writer.write_feature(ft)
+    
+    res = from_file(fp)
+    assert res[0].geometry == face
+    assert res[0].properties == {'a': 1}